@@ -0,0 +1,60 @@
+"""Benchmark the bitmask engine against the original set based search.
+
+Run from the repository root::
+
+    python benchmarks/bench_solve.py
+"""
+import argparse
+import time
+from pathlib import Path
+
+from lbsolver import Gameboard, LBSolver
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SETTINGS = [(2, 5), (3, 10), (3, 25), (4, 20)]
+
+
+def time_solve(solver, max_num_words, minimum_answers, engine):
+    """Time a single solve call and return the elapsed seconds and the answers"""
+    start = time.perf_counter()
+    answers = list(solver.solve(max_num_words, minimum_answers, engine=engine))
+    return time.perf_counter() - start, answers
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-d", "--dictionary", type=Path, default=ROOT / "test_dictionary")
+    parser.add_argument("-b", "--boards", type=Path, default=ROOT / "gameboards.txt")
+    args = parser.parse_args()
+
+    with open(args.dictionary, "r", encoding="utf-8") as dictionary_file:
+        dictionary = dictionary_file.readlines()
+    with open(args.boards, "r", encoding="utf-8") as boards_file:
+        boards = [line.strip() for line in boards_file if line.strip()]
+
+    print(
+        f"{'board':<14}{'a/t':>7}{'answers':>8}"
+        f"{'simple':>10}{'bitmask':>10}{'speedup':>9}"
+    )
+    for board in boards:
+        solver = LBSolver(Gameboard(board), dictionary)
+        for max_num_words, minimum_answers in SETTINGS:
+            simple_time, simple = time_solve(
+                solver, max_num_words, minimum_answers, "simple"
+            )
+            bitmask_time, bitmask = time_solve(
+                solver, max_num_words, minimum_answers, "bitmask"
+            )
+            if simple != bitmask:
+                raise AssertionError(f"Engines disagree on {board}")
+            print(
+                f"{board:<14}{max_num_words:>3}/{minimum_answers:<3}{len(bitmask):>8}"
+                f"{simple_time:>10.3f}{bitmask_time:>10.3f}"
+                f"{simple_time / bitmask_time:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""The batchfilter module filters a dictionary for many boards at once.
+
+The dictionary is encoded once as bitsets over word ids, stored as Python integers:
+one bitset per letter for the words that use it, and one per pair of letters for
+the words where the two letters are next to each other. A word can be played on a
+board when it uses no letter missing from the board and no pair of letters from the
+same side. The words that cannot be played are the union of one bitset per letter
+not on the board and one per pair of letters on the same side, e.g. 14 letter and
+12 pair bitsets for a board of four sides of three letters. Filtering a board is a
+few dozen bitwise operations that each process the whole dictionary at C speed,
+whatever its size.
+
+Encoding the dictionary costs about as much as filtering it once. Each further board
+costs a fraction of a single board filter, so screening thousands of boards is
+dominated by the encoding.
+"""
+import hashlib
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import combinations
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+from lbsolver.wordindex import ALPHABET, normalize_word
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lbsolver.lbsolver import Gameboard
+
+NONZERO = re.compile(b"[^\x00]")
+BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def _bitset(word_ids: List[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for word_id in word_ids:
+        bits[word_id >> 3] |= 1 << (word_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _pair(first: str, second: str) -> str:
+    return first + second if first < second else second + first
+
+
+class BoardFilter(Sequence):
+    """A dictionary encoded for filtering many boards at once.
+
+    A board filter is a ``Sequence[str]`` of the normalized words in dictionary
+    order, so it can be passed anywhere a dictionary is expected.
+
+    :param lines: Lines from a words file
+    :type lines: Iterable[str]
+    """
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        """Constructor method"""
+        words: Dict[str, None] = {}
+        for line in lines:
+            word = normalize_word(line)
+            if word is not None:
+                words[word] = None
+        self._words: List[str] = list(words)
+        self._fingerprint: Optional[str] = None
+
+        letter_ids: Dict[str, List[int]] = {letter: [] for letter in ALPHABET}
+        pair_ids: Dict[str, List[int]] = {}
+        for word_id, word in enumerate(self._words):
+            for letter in set(word):
+                letter_ids[letter].append(word_id)
+            for pair in {_pair(*pair) for pair in zip(word, word[1:])}:
+                pair_ids.setdefault(pair, []).append(word_id)
+
+        size = len(self._words)
+        self._all = (1 << size) - 1
+        self._letters = {
+            letter: _bitset(ids, size) for letter, ids in letter_ids.items()
+        }
+        self._pairs = {pair: _bitset(ids, size) for pair, ids in pair_ids.items()}
+
+    @property
+    def fingerprint(self) -> str:
+        """A SHA-256 hex digest of the words"""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(
+                "\n".join(self._words).encode("utf-8")
+            ).hexdigest()
+        return self._fingerprint
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __getitem__(self, word_id):
+        return self._words[word_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._words)
+
+    def word_ids(self, sides: Iterable[str]) -> List[int]:
+        """Get the ids of the words that can be played on a board.
+
+        :param sides: The letters of each side of the board
+        :type sides: Iterable[str]
+        :return: Word ids in dictionary order
+        :rtype: List[int]
+        """
+        sides = list(sides)
+        board = set("".join(sides))
+        unplayable = 0
+        for letter, bitset in self._letters.items():
+            if letter not in board:
+                unplayable |= bitset
+        for side in sides:
+            for pair in combinations(side, 2):
+                unplayable |= self._pairs.get(_pair(*pair), 0)
+        playable = self._all & ~unplayable
+
+        data = playable.to_bytes((len(self._words) + 7) // 8, "little")
+        return [
+            (match.start() << 3) + bit
+            for match in NONZERO.finditer(data)
+            for bit in BITS[data[match.start()]]
+        ]
+
+    def board_words(self, sides: Iterable[str]) -> List[str]:
+        """Get the words that can be played on a board.
+
+        :param sides: The letters of each side of the board
+        :type sides: Iterable[str]
+        :return: Words in dictionary order
+        :rtype: List[str]
+        """
+        words = self._words
+        return [words[word_id] for word_id in self.word_ids(sides)]
+
+    def filter_many(
+        self, boards: Iterable[Union[str, "Gameboard"]]
+    ) -> Iterator[Tuple["Gameboard", List[str]]]:
+        """Get the words that can be played on each of many boards.
+
+        :param boards: Gameboards or strings accepted by :class:`lbsolver.Gameboard`
+        :type boards: Iterable[str or :class:`lbsolver.Gameboard`]
+        :raise ValueError: If a board is invalid
+        :return: An iterator of gameboards paired with their words in dictionary
+            order
+        :rtype: Iterator[Tuple[:class:`lbsolver.Gameboard`, List[str]]]
+        """
+        from lbsolver.lbsolver import Gameboard
+
+        for board in boards:
+            gameboard = board if isinstance(board, Gameboard) else Gameboard(board)
+            yield gameboard, self.board_words(gameboard.sides)
@@ -0,0 +1,398 @@
+"""The bench module provides ``lbsolver bench``, a benchmark of the solver phases.
+
+Each board of a corpus is timed through the phases of a solve:
+
+``load``
+    Reading the dictionary, once per run.
+``filter``
+    :meth:`lbsolver.LBSolver.generate_valid_words` for the board.
+``rank``
+    Building the :class:`lbsolver.engine.BitmaskEngine` ranking of the valid words.
+``solve``
+    :meth:`lbsolver.engine.BitmaskEngine.search`, once per setting.
+
+The corpus is the boards of a file, ``gameboards.txt`` by default, plus random valid
+boards from a seeded generator, so runs on different commits time the same work.
+Results are written as JSON and can be compared against an earlier run to flag
+regressions.
+
+:func:`run_size_benchmark` times random boards of several geometries instead, e.g.
+five sides of three letters, to show how the solve time grows with the board.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from lbsolver.engine import BitmaskEngine
+from lbsolver.wordindex import ALPHABET, load_dictionary
+
+SETTINGS: List[Tuple[int, int]] = [(2, 5), (3, 10), (3, 25), (4, 20)]
+GEOMETRIES: List[Tuple[int, int]] = [(4, 3), (5, 3), (4, 4), (6, 3), (5, 4)]
+SIZE_SETTINGS: List[Tuple[int, int]] = [(2, 5), (3, 10)]
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_BOARDS = "gameboards.txt"
+
+
+def default_boards() -> Optional[Path]:
+    """Find the default board file, :data:`DEFAULT_BOARDS`, in the current directory
+    or else in the source tree the package runs from.
+
+    :return: The path of the board file, or None if there is none
+    :rtype: Path
+    """
+    for directory in (Path.cwd(), Path(__file__).resolve().parents[2]):
+        path = directory / DEFAULT_BOARDS
+        if path.is_file():
+            return path
+    return None
+
+
+def random_boards(
+    count: int, seed: int = 0, sides: int = 4, side_length: int = 3
+) -> List[str]:
+    """Generate random valid boards. The same seed always gives the same boards.
+
+    :param count: The number of boards
+    :type count: int
+    :param seed: The seed of the generator
+    :type seed: int
+    :param sides: The number of sides of each board
+    :type sides: int
+    :param side_length: The number of letters of each side
+    :type side_length: int
+    :return: Boards of distinct lowercase letters. Sides of other than 3 letters
+        are separated by ':'.
+    :rtype: List[str]
+    """
+    generator = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        letters = "".join(generator.sample(ALPHABET, sides * side_length))
+        if side_length != 3:
+            letters = ":".join(
+                letters[start : start + side_length]
+                for start in range(0, len(letters), side_length)
+            )
+        boards.append(letters)
+    return boards
+
+
+def _time(function: Callable, repeat: int) -> Tuple[float, object]:
+    """Call a function repeat times, returning the median time and the last result"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def _summarize(times: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(times),
+        "total": sum(times),
+        "mean": statistics.mean(times) if times else 0.0,
+        "max": max(times, default=0.0),
+    }
+
+
+def run_benchmark(
+    dictionary_path: str,
+    boards: Iterable[str],
+    settings: Iterable[Tuple[int, int]] = SETTINGS,
+    repeat: int = 3,
+) -> dict:
+    """Time each phase of a solve across a corpus of boards.
+
+    :param dictionary_path: The path of a words file or compiled index
+    :type dictionary_path: str
+    :param boards: The boards of the corpus
+    :type boards: Iterable[str]
+    :param settings: Pairs of max_num_words and minimum_answers to solve with
+    :type settings: Iterable[Tuple[int, int]]
+    :param repeat: The number of times each phase is timed. The median is kept.
+    :type repeat: int
+    :raise ValueError: If a board is invalid or repeat is less than one
+    :return: The run's metadata and, for each phase, the count, total, mean and
+        max of the per board times in seconds
+    :rtype: dict
+    """
+    if repeat <= 0:
+        raise ValueError("repeat must be greater than zero")
+
+    boards = list(boards)
+    load_time, dictionary = _time(lambda: load_dictionary(dictionary_path), repeat)
+    phases, answers = _time_boards(dictionary, boards, settings, repeat)
+
+    return {
+        "meta": _meta(dictionary_path, dictionary, len(boards), answers, repeat),
+        "phases": {
+            "load": _summarize([load_time]),
+            **{name: _summarize(times) for name, times in phases.items()},
+        },
+    }
+
+
+def run_size_benchmark(
+    dictionary_path: str,
+    geometries: Iterable[Tuple[int, int]] = GEOMETRIES,
+    count: int = 5,
+    seed: int = 0,
+    settings: Iterable[Tuple[int, int]] = SIZE_SETTINGS,
+    repeat: int = 1,
+) -> dict:
+    """Time each phase of a solve across random boards of several sizes. Phases are
+    named after the geometry, e.g. ``5x3 solve 3/10`` for five sides of three
+    letters, so the results can be compared like those of :func:`run_benchmark`.
+
+    :param dictionary_path: The path of a words file or compiled index
+    :type dictionary_path: str
+    :param geometries: Pairs of the number of sides and letters per side
+    :type geometries: Iterable[Tuple[int, int]]
+    :param count: The number of random boards of each geometry
+    :type count: int
+    :param seed: The seed of the random boards
+    :type seed: int
+    :param settings: Pairs of max_num_words and minimum_answers to solve with
+    :type settings: Iterable[Tuple[int, int]]
+    :param repeat: The number of times each phase is timed. The median is kept.
+    :type repeat: int
+    :raise ValueError: If a geometry is invalid or repeat is less than one
+    :return: The run's metadata and, for each geometry and phase, the count, total,
+        mean and max of the per board times in seconds
+    :rtype: dict
+    """
+    if repeat <= 0:
+        raise ValueError("repeat must be greater than zero")
+
+    load_time, dictionary = _time(lambda: load_dictionary(dictionary_path), repeat)
+    results = {"load": _summarize([load_time])}
+    boards = answers = 0
+    for sides, side_length in geometries:
+        phases, found = _time_boards(
+            dictionary,
+            random_boards(count, seed, sides, side_length),
+            settings,
+            repeat,
+        )
+        for name, times in phases.items():
+            results[f"{sides}x{side_length} {name}"] = _summarize(times)
+        boards += count
+        answers += found
+
+    return {
+        "meta": _meta(dictionary_path, dictionary, boards, answers, repeat),
+        "phases": results,
+    }
+
+
+def _time_boards(
+    dictionary: List[str],
+    boards: List[str],
+    settings: Iterable[Tuple[int, int]],
+    repeat: int,
+) -> Tuple[Dict[str, List[float]], int]:
+    """Time the filter, rank and solve phases of each board, returning the times of
+    each phase and the number of answers found"""
+    from lbsolver.lbsolver import Gameboard, LBSolver
+
+    settings = list(settings)
+    phases: Dict[str, List[float]] = {"filter": [], "rank": []}
+    for max_num_words, minimum_answers in settings:
+        phases[f"solve {max_num_words}/{minimum_answers}"] = []
+    answers = 0
+    for board in boards:
+        solver = LBSolver(Gameboard(board), dictionary)
+        filter_time, words = _time(
+            lambda: list(dict.fromkeys(solver.generate_valid_words())), repeat
+        )
+        rank_time, engine = _time(
+            lambda: BitmaskEngine(solver.gameboard.board, words), repeat
+        )
+        phases["filter"].append(filter_time)
+        phases["rank"].append(rank_time)
+        for max_num_words, minimum_answers in settings:
+            solve_time, found = _time(
+                lambda: engine.search(max_num_words, minimum_answers), repeat
+            )
+            phases[f"solve {max_num_words}/{minimum_answers}"].append(solve_time)
+            answers += len(found)
+    return phases, answers
+
+
+def _meta(
+    dictionary_path: str, dictionary: List[str], boards: int, answers: int, repeat: int
+) -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dictionary": str(dictionary_path),
+        "words": len(dictionary),
+        "boards": boards,
+        "answers": answers,
+        "repeat": repeat,
+    }
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD
+) -> List[str]:
+    """Find the phases that got slower than a baseline run.
+
+    :param results: The results of :func:`run_benchmark`
+    :type results: dict
+    :param baseline: Earlier results of :func:`run_benchmark`
+    :type baseline: dict
+    :param threshold: The allowed slowdown, e.g. 0.25 for 25% slower
+    :type threshold: float
+    :raise ValueError: If the runs did not time the same corpus
+    :return: A description of each regression, empty if there are none
+    :rtype: List[str]
+    """
+    for field in ("words", "boards"):
+        if results["meta"][field] != baseline.get("meta", {}).get(field):
+            raise ValueError(f"the baseline has a different number of {field}")
+
+    regressions = []
+    for name, phase in results["phases"].items():
+        before = baseline.get("phases", {}).get(name)
+        if not before or not before["total"]:
+            continue
+        change = phase["total"] / before["total"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: {before['total']:.4f}s -> {phase['total']:.4f}s "
+                f"({change:+.0%})"
+            )
+    return regressions
+
+
+def geometry(value: str) -> Tuple[int, int]:
+    """Parse a board geometry written as sides x letters, e.g. ``5x3``.
+
+    :param value: The geometry
+    :type value: str
+    :raise ValueError: If the geometry is not two positive numbers separated by x
+    :return: The number of sides and the number of letters per side
+    :rtype: Tuple[int, int]
+    """
+    sides, _, side_length = value.lower().partition("x")
+    if not sides.isdigit() or not side_length.isdigit():
+        raise ValueError(f"{value} is not a geometry such as 5x3")
+    if int(sides) < 2 or int(side_length) < 1:
+        raise ValueError(f"{value} needs two or more sides of one or more letters")
+    return int(sides), int(side_length)
+
+
+def main(argv: Optional[List[str]] = None):  # pragma: no cover
+    """Benchmark the solver"""
+    parser = argparse.ArgumentParser(
+        prog="lbsolver bench",
+        description="Time the phases of a solve across a reproducible board corpus",
+    )
+    parser.add_argument(
+        "-d",
+        "--dictionary",
+        help="A words file or compiled index",
+        default="test_dictionary",
+    )
+    parser.add_argument(
+        "-b",
+        "--boards",
+        help=f"A file with one board per line. Defaults to {DEFAULT_BOARDS}",
+        type=argparse.FileType("r"),
+        default=None,
+    )
+    parser.add_argument(
+        "-n",
+        "--random-boards",
+        metavar="N",
+        help="The number of random boards added to the corpus",
+        type=int,
+        default=20,
+    )
+    parser.add_argument("--seed", help="The random board seed", type=int, default=0)
+    parser.add_argument(
+        "-g",
+        "--geometry",
+        metavar="SIDESxLETTERS",
+        help="Time N random boards of a geometry, e.g. 5x3, instead of the corpus. "
+        "Repeat to compare sizes.",
+        type=geometry,
+        action="append",
+        default=None,
+    )
+    parser.add_argument("-r", "--repeat", help="Timings per phase", type=int, default=3)
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="Write the JSON results to a file. Defaults to standard out",
+        type=argparse.FileType("w"),
+        default=sys.stdout,
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        help="Earlier JSON results. Exit with status 1 if a phase regressed.",
+        type=argparse.FileType("r"),
+        default=None,
+    )
+    parser.add_argument(
+        "--threshold",
+        help="The allowed slowdown against the baseline, e.g. 0.25 for 25%%",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+    )
+    args = parser.parse_args(argv)
+
+    if args.geometry and args.boards:
+        parser.error("--boards can't be used with --geometry")
+    if not args.boards and not args.geometry:
+        path = default_boards()
+        if path is not None:
+            args.boards = open(path, "r", encoding="utf-8")
+    boards = []
+    if args.boards:
+        with args.boards:
+            boards = [line.strip() for line in args.boards if line.strip()]
+    boards.extend(random_boards(args.random_boards, args.seed))
+
+    try:
+        if args.geometry:
+            results = run_size_benchmark(
+                args.dictionary,
+                args.geometry,
+                args.random_boards,
+                args.seed,
+                repeat=args.repeat,
+            )
+        else:
+            results = run_benchmark(args.dictionary, boards, repeat=args.repeat)
+    except OSError as exc:
+        parser.error(f"can't open '{args.dictionary}': {exc}")
+    except ValueError as exc:
+        parser.error(str(exc))
+    results["meta"]["seed"] = args.seed
+
+    json.dump(results, args.output, indent=2)
+    print(file=args.output)
+    args.output.close()
+
+    if args.baseline:
+        with args.baseline:
+            try:
+                regressions = compare(results, json.load(args.baseline), args.threshold)
+            except ValueError as exc:
+                parser.error(str(exc))
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
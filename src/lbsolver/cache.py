@@ -0,0 +1,266 @@
+"""The cache module provides a result cache for :meth:`lbsolver.LBSolver.solve`.
+
+Results are keyed by the board, a content hash of the dictionary and the solve
+options. The cache keeps recent results in memory and can also keep results in a
+SQLite database, so they survive restarts and are shared between processes.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from lbsolver.batchfilter import BoardFilter
+from lbsolver.layers import LayeredDictionary
+from lbsolver.trie import WordTrie
+from lbsolver.wordindex import WordIndex
+
+KEY_VERSION = 1
+
+
+def dictionary_fingerprint(dictionary: Sequence[str]) -> str:
+    """Get a content hash of a dictionary.
+
+    :param dictionary: The lines of a words file, a
+        :class:`lbsolver.wordindex.WordIndex`, a :class:`lbsolver.trie.WordTrie`, a
+        :class:`lbsolver.batchfilter.BoardFilter` or a
+        :class:`lbsolver.layers.LayeredDictionary`
+    :type dictionary: Sequence[str]
+    :return: A hex digest identifying the dictionary's contents
+    :rtype: str
+    """
+    if isinstance(dictionary, WordIndex):
+        return f"index:{dictionary.fingerprint}"
+    if isinstance(dictionary, WordTrie):
+        return f"trie:{dictionary.fingerprint}"
+    if isinstance(dictionary, BoardFilter):
+        return f"filter:{dictionary.fingerprint}"
+    if isinstance(dictionary, LayeredDictionary):
+        return f"layers:{dictionary.fingerprint}"
+    digest = hashlib.sha256()
+    for line in dictionary:
+        digest.update(line.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return f"lines:{digest.hexdigest()}"
+
+
+def board_key(board: Iterable[str], side_length: int = 3) -> str:
+    """Get a key for a board that does not depend on the order of the sides or of
+    the letters on a side. Equivalent boards always have the same answers.
+
+    :param board: The letters of a board, side by side, or its sides separated by
+        ':' as in :attr:`lbsolver.Gameboard.layout`
+    :type board: Iterable[str]
+    :param side_length: The number of letters of each side when the sides are not
+        separated by ':'
+    :type side_length: int
+    :return: The sides with their letters sorted, in sorted order, separated by ':'
+    :rtype: str
+    """
+    letters = "".join(board)
+    if ":" in letters:
+        sides: Iterable[str] = letters.split(":")
+    else:
+        sides = (
+            letters[start : start + side_length]
+            for start in range(0, len(letters), side_length)
+        )
+    return ":".join(sorted("".join(sorted(side)) for side in sides))
+
+
+def result_key(
+    board: Iterable[str],
+    fingerprint: str,
+    max_num_words: int,
+    minimum_answers: int,
+    skip: Iterable[str] = (),
+) -> str:
+    """Build the cache key for a solve call.
+
+    :param board: The letters of the board or its layout, see :func:`board_key`
+    :type board: Iterable[str]
+    :param fingerprint: The dictionary fingerprint, see :func:`dictionary_fingerprint`
+    :type fingerprint: str
+    :param max_num_words: The maximum number of words allowed in an answer
+    :type max_num_words: int
+    :param minimum_answers: The number of answers requested
+    :type minimum_answers: int
+    :param skip: Words skipped from answers
+    :type skip: Iterable[str]
+    :return: The cache key
+    :rtype: str
+    """
+    skip_key = ",".join(sorted({word.strip() for word in skip if word.strip()}))
+    return (
+        f"v{KEY_VERSION}|{board_key(board)}|{fingerprint}|"
+        f"{max_num_words}|{minimum_answers}|{skip_key}"
+    )
+
+
+@dataclass
+class CacheStats:
+    """Counters for a :class:`lbsolver.cache.ResultCache`"""
+
+    #: Lookups answered from memory
+    memory_hits: int = 0
+    #: Lookups answered from the SQLite database
+    disk_hits: int = 0
+    #: Lookups not found in the cache
+    misses: int = 0
+    #: Results removed from the SQLite database to stay under its size limit
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Lookups answered from memory or disk"""
+        return self.memory_hits + self.disk_hits
+
+
+class ResultCache:
+    """A two tier cache of solve results.
+
+    Recent results are kept in an in-memory LRU. When a path is given, results are
+    also stored in a SQLite database. The least recently used rows are deleted
+    once the stored results grow beyond ``max_bytes``. A cache can be shared by
+    several threads.
+
+    :param maxsize: The number of results kept in memory
+    :type maxsize: int
+    :param path: The path of a SQLite database for the disk tier, or None for memory only
+    :type path: str
+    :param max_bytes: The size limit of the results stored in the disk tier
+    :type max_bytes: int
+    :raise ValueError: If maxsize or max_bytes is less than zero
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        path: Optional[str] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        """Constructor method"""
+        if maxsize < 0:
+            raise ValueError("maxsize cannot be negative")
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative")
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, List[Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "key TEXT PRIMARY KEY, answers TEXT NOT NULL, "
+                    "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+                )
+
+    def get(self, key: str) -> Optional[List[Tuple[str, ...]]]:
+        """Look up the answers stored for a key.
+
+        :param key: A key built by :func:`result_key`
+        :type key: str
+        :return: A copy of the answers, or None if the key is not cached
+        :rtype: List[Tuple[str, ...]] or None
+        """
+        with self._lock:
+            answers = self._memory.get(key)
+            if answers is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return list(answers)
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT answers FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    with self._connection:
+                        self._connection.execute(
+                            "UPDATE results SET accessed = ? WHERE key = ?",
+                            (time.time(), key),
+                        )
+                    answers = [tuple(answer) for answer in json.loads(row[0])]
+                    self._remember(key, answers)
+                    self.stats.disk_hits += 1
+                    return list(answers)
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: str, answers: Iterable[Sequence[str]]) -> None:
+        """Store the answers for a key.
+
+        :param key: A key built by :func:`result_key`
+        :type key: str
+        :param answers: The answers to store
+        :type answers: Iterable[Sequence[str]]
+        """
+        answers = [tuple(answer) for answer in answers]
+        with self._lock:
+            self._remember(key, answers)
+            if self._connection is None:
+                return
+            encoded = json.dumps(answers, separators=(",", ":"))
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    (key, encoded, len(encoded), time.time()),
+                )
+                self._evict()
+
+    def clear(self) -> None:
+        """Remove every result from both tiers. Counters are kept."""
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the SQLite database. The memory tier stays usable."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, answers: List[Tuple[str, ...]]) -> None:
+        if not self.maxsize:
+            return
+        self._memory[key] = answers
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = self._connection.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+        self.stats.evictions += len(evicted)
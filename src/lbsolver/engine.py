@@ -0,0 +1,934 @@
+"""The engine module provides a bitmask based search engine for the Letter Boxed game.
+
+Every valid word is encoded once as an integer mask of the board letters it uses,
+together with the board index of its first and last letter. Coverage checks and
+pruning in the search then become integer OR/compare operations.
+"""
+import heapq
+import threading
+import time
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from itertools import count, islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+PRUNE_REASONS = ("duplicate", "used", "depth", "skip")
+
+
+def popcount(mask: int) -> int:
+    """Count the bits set in a mask.
+
+    :param mask: A letter mask
+    :type mask: int
+    :return: The number of letters in the mask
+    :rtype: int
+    """
+    return bin(mask).count("1")
+
+
+@dataclass
+class SearchStats:
+    """Counters and timings of a search, see :meth:`lbsolver.LBSolver.solve`"""
+
+    #: Words left by :meth:`lbsolver.LBSolver.generate_valid_words`
+    valid_words: int = 0
+    #: Seconds spent filtering the dictionary
+    filter_seconds: float = 0.0
+    #: Seconds spent ranking the valid words
+    rank_seconds: float = 0.0
+    #: Seconds spent searching
+    search_seconds: float = 0.0
+    #: Words entered on a search path, including first words
+    nodes: int = 0
+    #: Answers found
+    answers: int = 0
+    #: Branches not followed, by reason: ``duplicate`` for a word already in the
+    #: answer, ``used`` for a word of an earlier answer, ``depth`` for an answer
+    #: that would need more than max_num_words and ``skip`` for a skipped word
+    pruned: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(PRUNE_REASONS, 0)
+    )
+    #: Whether the answers came from a :class:`lbsolver.cache.ResultCache`
+    cached: bool = False
+
+
+class CancellationToken:
+    """A flag another thread sets to stop a search, see :class:`SearchLimit`"""
+
+    def __init__(self) -> None:
+        """Constructor method"""
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the searches using this token to stop"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether :meth:`cancel` was called"""
+        return self._event.is_set()
+
+
+class SearchLimit:
+    """Bounds on the work of a search. A search that reaches a bound stops and keeps
+    the answers found so far.
+
+    :param timeout: Seconds from now until the search stops
+    :type timeout: float
+    :param max_nodes: The most words the search enters, see
+        :attr:`SearchStats.nodes`
+    :type max_nodes: int
+    :param token: A token to cancel the search from another thread
+    :type token: :class:`lbsolver.engine.CancellationToken`
+    :raise ValueError: If timeout or max_nodes is negative
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        token: Optional[CancellationToken] = None,
+    ) -> None:
+        """Constructor method"""
+        if timeout is not None and timeout < 0:
+            raise ValueError("timeout must not be negative")
+        if max_nodes is not None and max_nodes < 0:
+            raise ValueError("max_nodes must not be negative")
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.max_nodes = max_nodes
+        self.token = token
+        #: Why the search stopped early: ``"cancelled"``, ``"nodes"`` or
+        #: ``"deadline"``, or None while it has not
+        self.reason: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        """Whether the search ran without reaching a bound"""
+        return self.reason is None
+
+    def exceeded(self, nodes: int) -> bool:
+        """Check the bounds before entering another word.
+
+        :param nodes: The words entered so far
+        :type nodes: int
+        :return: True if the search must stop
+        :rtype: bool
+        """
+        if self.reason is None:
+            if self.token is not None and self.token.cancelled:
+                self.reason = "cancelled"
+            elif self.max_nodes is not None and nodes >= self.max_nodes:
+                self.reason = "nodes"
+            elif self.deadline is not None and time.monotonic() >= self.deadline:
+                self.reason = "deadline"
+        return self.reason is not None
+
+
+class BitmaskEngine:
+    """A search engine over the valid words of a single board.
+
+    Words keep the order they are given in. Within the ranking used by the search
+    (number of distinct letters, then first letter, both descending) words that
+    share a rank are visited in that order.
+
+    Each word is stored once. Everything else refers to it by its word id, an index
+    into parallel arrays of masks and first and last letters, so an engine stays
+    small when many boards are solved in one process.
+
+    :param board: The board letters. Letter ``i`` of the board is bit ``i`` of a mask,
+        so boards of up to 32 letters are supported whatever their geometry.
+    :type board: str
+    :param words: Valid words for the board, as produced by
+        :meth:`lbsolver.LBSolver.generate_valid_words`
+    :type words: Iterable[str]
+    :raise ValueError: If the board has too many letters or a word contains a letter
+        that is not on the board
+    """
+
+    __slots__ = (
+        "board",
+        "letter_index",
+        "full_mask",
+        "words",
+        "masks",
+        "first",
+        "last",
+        "ids",
+        "order",
+        "rank",
+        "successors",
+    )
+
+    def __init__(self, board: str, words: Iterable[str]) -> None:
+        """Constructor method"""
+        self.board = "".join(board)
+        self.letter_index: Dict[str, int] = {
+            letter: index for index, letter in enumerate(self.board)
+        }
+        self.full_mask = (1 << len(self.board)) - 1
+
+        self.words: List[str] = []
+        self.masks = array("I")
+        if len(self.board) > 8 * self.masks.itemsize:
+            raise ValueError(
+                f"{self.board} has more letters than a mask of "
+                f"{8 * self.masks.itemsize} bits"
+            )
+        self.first = array("B")
+        self.last = array("B")
+        self.ids: Dict[str, int] = {}
+
+        for word in words:
+            if word in self.ids:
+                continue
+            mask = 0
+            for letter in word:
+                try:
+                    mask |= 1 << self.letter_index[letter]
+                except KeyError:
+                    raise ValueError(
+                        f"Word: {word} contains letters not found in gameboard: {self.board}"
+                    ) from None
+            self.ids[word] = len(self.words)
+            self.words.append(word)
+            self.masks.append(mask)
+            self.first.append(self.letter_index[word[0]])
+            self.last.append(self.letter_index[word[-1]])
+
+        ranking_map = defaultdict(list)
+        for word_id, word in enumerate(self.words):
+            ranking_map[(popcount(self.masks[word_id]), word[0])].append(word_id)
+        sorted_keys = sorted(ranking_map, reverse=True)
+
+        self.order = array(
+            "I", (word_id for key in sorted_keys for word_id in ranking_map[key])
+        )
+        self.rank = array("I", bytes(4 * len(self.words)))
+        for position, word_id in enumerate(self.order):
+            self.rank[word_id] = position
+        self.successors: List[array] = [array("I") for _ in self.board]
+        for word_id in self.order:
+            self.successors[self.first[word_id]].append(word_id)
+
+    def mask_for(self, letters: str) -> int:
+        """Get the mask for a sequence of board letters.
+
+        :param letters: Letters found on the board
+        :type letters: str
+        :raise KeyError: If a letter is not on the board
+        :return: A mask with one bit set per distinct letter
+        :rtype: int
+        """
+        mask = 0
+        for letter in letters:
+            mask |= 1 << self.letter_index[letter]
+        return mask
+
+    def _finishers(self, blocked: bytearray) -> Callable[[int, int], List[int]]:
+        """Get a memoized function listing the words that start with a letter and
+        cover every letter missing from a mask."""
+        full_mask = self.full_mask
+        by_mask: List[Dict[int, List[int]]] = [{} for _ in self.board]
+        for letter, word_ids in enumerate(self.successors):
+            for word_id in word_ids:
+                if not blocked[word_id]:
+                    by_mask[letter].setdefault(self.masks[word_id], []).append(word_id)
+        memo: Dict[Tuple[int, int], List[int]] = {}
+
+        def finishers(covered: int, letter: int) -> List[int]:
+            key = (covered, letter)
+            result = memo.get(key)
+            if result is None:
+                missing = full_mask & ~covered
+                result = [
+                    word_id
+                    for mask, word_ids in by_mask[letter].items()
+                    if mask & missing == missing
+                    for word_id in word_ids
+                ]
+                result.sort(key=self.rank.__getitem__)
+                memo[key] = result
+            return result
+
+        return finishers
+
+    def _can_finish(
+        self,
+        blocked: bytearray,
+        finishers: Optional[Callable[[int, int], List[int]]] = None,
+    ) -> Callable[[int, int, int], bool]:
+        """Get a memoized function checking whether a mask can be completed from a
+        letter in at most ``remaining`` words. Sharing the finishers of a search
+        lets the search reuse the last words listed while checking."""
+        masks = self.masks
+        last = self.last
+        successors = self.successors
+        full_mask = self.full_mask
+        if finishers is None:
+            finishers = self._finishers(blocked)
+        memo: Dict[Tuple[int, int, int], bool] = {}
+
+        def can_finish(covered: int, letter: int, remaining: int) -> bool:
+            if remaining == 1:
+                return bool(finishers(covered, letter))
+            key = (covered, letter, remaining)
+            result = memo.get(key)
+            if result is None:
+                result = False
+                for next_id in successors[letter]:
+                    if blocked[next_id]:
+                        continue
+                    next_covered = covered | masks[next_id]
+                    if next_covered == full_mask or (
+                        remaining > 1
+                        and can_finish(next_covered, last[next_id], remaining - 1)
+                    ):
+                        result = True
+                        break
+                memo[key] = result
+            return result
+
+        return can_finish
+
+    def _raw_counts(
+        self, blocked: bytearray, finishers: Callable[[int, int], List[int]]
+    ) -> Callable[[int, int, int], int]:
+        """Get a memoized function counting the ways to cover a mask from a letter in
+        exactly ``remaining`` words, ignoring whether a word is used twice."""
+        masks = self.masks
+        last = self.last
+        successors = self.successors
+        full_mask = self.full_mask
+        memo: Dict[Tuple[int, int, int], int] = {}
+
+        def raw_count(covered: int, letter: int, remaining: int) -> int:
+            if remaining == 1:
+                return len(finishers(covered, letter))
+            key = (covered, letter, remaining)
+            result = memo.get(key)
+            if result is None:
+                result = 0
+                for next_id in successors[letter]:
+                    next_covered = covered | masks[next_id]
+                    if not blocked[next_id] and next_covered != full_mask:
+                        result += raw_count(next_covered, last[next_id], remaining - 1)
+                memo[key] = result
+            return result
+
+        return raw_count
+
+    def blocked(self, skip: Iterable[str] = ()) -> bytearray:
+        """Get a flag per word id, set for the words to skip.
+
+        :param skip: Words that can never be part of an answer
+        :type skip: Iterable[str]
+        :return: One byte per word id, 1 when the word is skipped
+        :rtype: bytearray
+        """
+        blocked = bytearray(len(self.words))
+        for word in skip:
+            word_id = self.ids.get(word)
+            if word_id is not None:
+                blocked[word_id] = 1
+        return blocked
+
+    def search(
+        self,
+        max_num_words: int = 3,
+        minimum_answers: int = 1,
+        skip: Iterable[str] = (),
+        roots: Optional[Iterable[int]] = None,
+        stats: Optional[SearchStats] = None,
+        limit: Optional[SearchLimit] = None,
+    ) -> List[Tuple[str, ...]]:
+        """Find answers with the same ordering rules as :meth:`lbsolver.LBSolver.solve`.
+
+        A word can appear only once in an answer. Once an answer is found its words
+        cannot be entered again anywhere in the search.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param minimum_answers: Stop after finding this number of answers
+        :type minimum_answers: int
+        :param skip: Words that can never be part of an answer
+        :type skip: Iterable[str]
+        :param roots: Ids of the words to start answers with, in order. Defaults to
+            every word in ranking order.
+        :type roots: Iterable[int]
+        :param stats: Counters to update while searching, see :meth:`iter_search`
+        :type stats: :class:`lbsolver.engine.SearchStats`
+        :param limit: Bounds on the search, see :meth:`iter_search`
+        :type limit: :class:`lbsolver.engine.SearchLimit`
+        :return: A list filled with answer tuples
+        :rtype: List[Tuple[str, ...]]
+        """
+        return list(
+            islice(
+                self.iter_search(max_num_words, skip, roots, stats, limit),
+                minimum_answers,
+            )
+        )
+
+    def iter_search(
+        self,
+        max_num_words: int = 3,
+        skip: Iterable[str] = (),
+        roots: Optional[Iterable[int]] = None,
+        stats: Optional[SearchStats] = None,
+        limit: Optional[SearchLimit] = None,
+    ) -> Iterator[Tuple[str, ...]]:
+        """Yield answers one at a time, in the order :meth:`search` finds them.
+
+        The search uses an explicit stack and only runs while the caller asks for
+        the next answer, so the caller can stop at any time. A word is only entered
+        when the letters left can still be covered in the words left, which keeps
+        searches on larger boards from exploring chains that can never finish.
+
+        When ``stats`` is given, the search runs in a counting copy of the loop
+        that updates its nodes, answers, pruned branches and search time. The
+        default loop has no counters, so statistics cost nothing unless requested.
+        A ``limit`` also runs the counting loop, which checks the bounds before
+        entering each word and stops when one is reached. Check
+        :attr:`SearchLimit.complete` afterwards to know whether answers were missed.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: Words that can never be part of an answer
+        :type skip: Iterable[str]
+        :param roots: Ids of the words to start answers with, in order. Defaults to
+            every word in ranking order.
+        :type roots: Iterable[int]
+        :param stats: Counters to update while searching
+        :type stats: :class:`lbsolver.engine.SearchStats`
+        :param limit: Bounds on the search
+        :type limit: :class:`lbsolver.engine.SearchLimit`
+        :return: An iterator of answer tuples
+        :rtype: Iterator[Tuple[str, ...]]
+        """
+        if stats is not None or limit is not None:
+            return self._iter_search_counted(
+                max_num_words, skip, roots, stats or SearchStats(), limit
+            )
+        return self._iter_search(max_num_words, skip, roots)
+
+    def iter_root_answers(
+        self, root: int, max_num_words: int = 3, skip: Iterable[str] = ()
+    ) -> Iterator[Tuple[int, ...]]:
+        """Yield the answers starting with a word in the order :meth:`search` visits
+        them, but without blocking the words of an answer. The answers
+        :meth:`search` finds from this word, whatever words earlier answers
+        blocked, are the ones of this sequence whose words were not blocked when
+        the search entered them.
+
+        :param root: The id of the first word
+        :type root: int
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: Words that can never be part of an answer
+        :type skip: Iterable[str]
+        :return: An iterator of tuples of word ids
+        :rtype: Iterator[Tuple[int, ...]]
+        """
+        ids = self.ids
+        for answer in self._iter_search(max_num_words, skip, [root], False):
+            yield tuple(ids[word] for word in answer)
+
+    def _iter_search(
+        self,
+        max_num_words: int,
+        skip: Iterable[str],
+        roots: Optional[Iterable[int]],
+        block_answers: bool = True,
+    ) -> Iterator[Tuple[str, ...]]:
+        words = self.words
+        masks = self.masks
+        last = self.last
+        successors = self.successors
+        full_mask = self.full_mask
+
+        blocked = self.blocked(skip)
+        on_path = bytearray(len(words))
+        finishers = self._finishers(blocked)
+        can_finish = self._can_finish(blocked, finishers)
+        last_slot = max_num_words - 1
+
+        for root in self.order if roots is None else roots:
+            if blocked[root]:
+                continue
+            if masks[root] == full_mask:
+                if block_answers:
+                    blocked[root] = 1
+                yield (words[root],)
+                continue
+            if max_num_words <= 1:
+                continue
+            if last_slot > 1 and not can_finish(masks[root], last[root], last_slot):
+                continue
+
+            path = [root]
+            covers = [masks[root]]
+            if last_slot == 1:
+                stack = [iter(finishers(masks[root], last[root]))]
+            else:
+                stack = [iter(successors[last[root]])]
+            on_path[root] = 1
+            while stack:
+                next_id = next(stack[-1], None)
+                if next_id is None:
+                    stack.pop()
+                    covers.pop()
+                    on_path[path.pop()] = 0
+                    continue
+                if blocked[next_id] or on_path[next_id]:
+                    continue
+                covered = covers[-1] | masks[next_id]
+                if covered == full_mask:
+                    answer = path + [next_id]
+                    if block_answers:
+                        for word_id in answer:
+                            blocked[word_id] = 1
+                    yield tuple(words[word_id] for word_id in answer)
+                elif len(path) + 1 < last_slot and not can_finish(
+                    covered, last[next_id], last_slot - len(path)
+                ):
+                    continue
+                elif len(path) + 1 < max_num_words:
+                    path.append(next_id)
+                    covers.append(covered)
+                    if len(path) == last_slot:
+                        stack.append(iter(finishers(covered, last[next_id])))
+                    else:
+                        stack.append(iter(successors[last[next_id]]))
+                    on_path[next_id] = 1
+
+    def _iter_search_counted(
+        self,
+        max_num_words: int,
+        skip: Iterable[str],
+        roots: Optional[Iterable[int]],
+        stats: SearchStats,
+        limit: Optional[SearchLimit] = None,
+    ) -> Iterator[Tuple[str, ...]]:
+        """:meth:`_iter_search` with counters and bounds. Keep the two loops in
+        step."""
+        words = self.words
+        masks = self.masks
+        last = self.last
+        successors = self.successors
+        full_mask = self.full_mask
+        pruned = stats.pruned
+
+        skipped = self.blocked(skip)
+        blocked = bytearray(skipped)
+        on_path = bytearray(len(words))
+        # Skipped words stay in the finishers so they are counted as skipped
+        finishers = self._finishers(bytearray(len(words)))
+        can_finish = self._can_finish(blocked, finishers)
+        last_slot = max_num_words - 1
+
+        def last_words(covered: int, letter: int) -> Iterator[int]:
+            result = finishers(covered, letter)
+            pruned["depth"] += len(successors[letter]) - len(result)
+            return iter(result)
+
+        def reason(word_id: int) -> str:
+            return "skip" if skipped[word_id] else "used"
+
+        first_node = stats.nodes
+        start = time.perf_counter()
+        for root in self.order if roots is None else roots:
+            if blocked[root]:
+                pruned[reason(root)] += 1
+                continue
+            if masks[root] == full_mask:
+                blocked[root] = 1
+                stats.nodes += 1
+                stats.answers += 1
+                stats.search_seconds += time.perf_counter() - start
+                yield (words[root],)
+                start = time.perf_counter()
+                continue
+            if max_num_words <= 1 or (
+                last_slot > 1 and not can_finish(masks[root], last[root], last_slot)
+            ):
+                pruned["depth"] += 1
+                continue
+            if limit is not None and limit.exceeded(stats.nodes - first_node):
+                break
+
+            stats.nodes += 1
+            path = [root]
+            covers = [masks[root]]
+            if last_slot == 1:
+                stack = [last_words(masks[root], last[root])]
+            else:
+                stack = [iter(successors[last[root]])]
+            on_path[root] = 1
+            while stack:
+                next_id = next(stack[-1], None)
+                if next_id is None:
+                    stack.pop()
+                    covers.pop()
+                    on_path[path.pop()] = 0
+                    continue
+                if blocked[next_id]:
+                    pruned[reason(next_id)] += 1
+                    continue
+                if on_path[next_id]:
+                    pruned["duplicate"] += 1
+                    continue
+                covered = covers[-1] | masks[next_id]
+                if covered == full_mask:
+                    stats.nodes += 1
+                    stats.answers += 1
+                    answer = path + [next_id]
+                    for word_id in answer:
+                        blocked[word_id] = 1
+                    stats.search_seconds += time.perf_counter() - start
+                    yield tuple(words[word_id] for word_id in answer)
+                    start = time.perf_counter()
+                elif len(path) + 1 < last_slot and not can_finish(
+                    covered, last[next_id], last_slot - len(path)
+                ):
+                    pruned["depth"] += 1
+                elif len(path) + 1 < max_num_words:
+                    if limit is not None and limit.exceeded(stats.nodes - first_node):
+                        stats.search_seconds += time.perf_counter() - start
+                        return
+                    stats.nodes += 1
+                    path.append(next_id)
+                    covers.append(covered)
+                    if len(path) == last_slot:
+                        stack.append(last_words(covered, last[next_id]))
+                    else:
+                        stack.append(iter(successors[last[next_id]]))
+                    on_path[next_id] = 1
+                else:
+                    pruned["depth"] += 1
+        stats.search_seconds += time.perf_counter() - start
+
+    def optimal_search(
+        self,
+        max_num_words: int = 3,
+        minimum_answers: int = 1,
+        skip: Iterable[str] = (),
+        by_length: bool = False,
+    ) -> List[Tuple[str, ...]]:
+        """Find the answers with the fewest words.
+
+        Answers are searched by number of words, one word count at a time. A branch
+        is only followed when its coverage state ``(covered_mask, last_letter)``
+        can still cover the board with the words left. Those checks are memoized
+        per state, so dead states are only explored once. Answers with the same
+        number of words keep ranking order, or are ranked by total letters when
+        ``by_length`` is set.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param minimum_answers: The number of answers to return
+        :type minimum_answers: int
+        :param skip: Words that can never be part of an answer
+        :type skip: Iterable[str]
+        :param by_length: Rank answers with the same number of words by total letters
+        :type by_length: bool
+        :return: A list filled with answer tuples, fewest words first
+        :rtype: List[Tuple[str, ...]]
+        """
+        words = self.words
+        masks = self.masks
+        last = self.last
+        successors = self.successors
+        full_mask = self.full_mask
+        lengths = [len(word) for word in words]
+        shortest = min(lengths, default=0)
+        blocked = self.blocked(skip)
+        can_finish = self._can_finish(blocked)
+
+        answers: List[Tuple[str, ...]] = []
+        for num_words in range(1, max_num_words + 1):
+            needed = minimum_answers - len(answers)
+            if needed <= 0:
+                break
+            # A heap of (-total letters, -order found, word ids), worst answer first
+            found: List[Tuple[int, int, Tuple[int, ...]]] = []
+            order_found = count()
+            path: List[int] = []
+            on_path = bytearray(len(words))
+
+            def keep(length: int) -> bool:
+                if len(found) < needed:
+                    return True
+                return by_length and length < -found[0][0]
+
+            def dfs(word_id: int, covered: int, length: int) -> None:
+                path.append(word_id)
+                remaining = num_words - len(path)
+                if not remaining:
+                    entry = (-length, -next(order_found), tuple(path))
+                    if len(found) < needed:
+                        heapq.heappush(found, entry)
+                    else:
+                        heapq.heappushpop(found, entry)
+                    path.pop()
+                    return
+                on_path[word_id] = 1
+                for next_id in successors[last[word_id]]:
+                    if not keep(length + shortest * remaining):
+                        break
+                    if blocked[next_id] or on_path[next_id]:
+                        continue
+                    next_covered = covered | masks[next_id]
+                    if remaining == 1:
+                        if next_covered == full_mask:
+                            dfs(next_id, next_covered, length + lengths[next_id])
+                    elif next_covered != full_mask and can_finish(
+                        next_covered, last[next_id], remaining - 1
+                    ):
+                        dfs(next_id, next_covered, length + lengths[next_id])
+                on_path[word_id] = 0
+                path.pop()
+
+            for root in self.order:
+                if not keep(shortest * num_words):
+                    break
+                covered = masks[root]
+                if blocked[root] or (covered == full_mask) != (num_words == 1):
+                    continue
+                if num_words == 1 or can_finish(covered, last[root], num_words - 1):
+                    dfs(root, covered, lengths[root])
+
+            ranked = sorted((-length, -order, ids) for length, order, ids in found)
+            if not by_length:
+                ranked.sort(key=lambda entry: entry[1])
+            answers.extend(tuple(words[i] for i in ids) for _, _, ids in ranked)
+        return answers
+
+    def top_k_search(
+        self,
+        costs: Sequence[float],
+        k: int = 5,
+        max_num_words: int = 3,
+        skip: Iterable[str] = (),
+    ) -> List[Tuple[str, ...]]:
+        """Find the ``k`` answers with the lowest total cost, e.g. the most natural
+        answers with costs from :func:`lbsolver.frequency.word_costs`.
+
+        The search is depth first branch and bound. The k best answers found so far
+        are kept in a bounded heap, words are tried cheapest first and a branch is
+        cut as soon as its cost reaches the worst answer kept. Branches whose
+        coverage state cannot cover the board with the words left are not followed.
+        As in :meth:`iter_all`, only the last word of an answer completes the board
+        and words may be shared between answers.
+
+        :param costs: The cost of each word id. Costs must not be negative.
+        :type costs: Sequence[float]
+        :param k: The number of answers to return
+        :type k: int
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: Words that can never be part of an answer
+        :type skip: Iterable[str]
+        :return: A list filled with answer tuples, cheapest first. Answers with the
+            same cost keep the order they were found in.
+        :rtype: List[Tuple[str, ...]]
+        """
+        words = self.words
+        masks = self.masks
+        last = self.last
+        full_mask = self.full_mask
+        blocked = self.blocked(skip)
+        can_finish = self._can_finish(blocked)
+        cheapest_first = [
+            sorted(
+                (word_id for word_id in word_ids if not blocked[word_id]),
+                key=costs.__getitem__,
+            )
+            for word_ids in self.successors
+        ]
+        roots = sorted(
+            (word_id for word_id in self.order if not blocked[word_id]),
+            key=costs.__getitem__,
+        )
+
+        # A heap of (-cost, -order found, word ids), worst answer first
+        found: List[Tuple[float, int, Tuple[int, ...]]] = []
+        order_found = count()
+        path: List[int] = []
+        on_path = bytearray(len(words))
+
+        def bound() -> float:
+            return -found[0][0] if len(found) >= k else float("inf")
+
+        def dfs(word_id: int, covered: int, cost: float) -> None:
+            if covered == full_mask:
+                entry = (-cost, -next(order_found), (*path, word_id))
+                if len(found) < k:
+                    heapq.heappush(found, entry)
+                else:
+                    heapq.heappushpop(found, entry)
+                return
+            remaining = max_num_words - len(path) - 1
+            if not remaining or not can_finish(covered, last[word_id], remaining):
+                return
+            path.append(word_id)
+            on_path[word_id] = 1
+            for next_id in cheapest_first[last[word_id]]:
+                next_cost = cost + costs[next_id]
+                if next_cost >= bound():
+                    break
+                if not on_path[next_id]:
+                    dfs(next_id, covered | masks[next_id], next_cost)
+            on_path[word_id] = 0
+            path.pop()
+
+        if k > 0:
+            for root in roots:
+                if costs[root] >= bound():
+                    break
+                dfs(root, masks[root], costs[root])
+
+        ranked = sorted((-cost, -order, ids) for cost, order, ids in found)
+        return [tuple(words[i] for i in ids) for _, _, ids in ranked]
+
+    def count_solutions(
+        self, max_num_words: int = 3, skip: Iterable[str] = ()
+    ) -> Dict[int, int]:
+        """Count every answer of up to ``max_num_words`` words without building them.
+
+        An answer is a chain of different words where only the last word completes
+        the board. Counts of ways to cover the board from a ``(covered_mask,
+        last_letter)`` state are memoized. A word used twice in a chain adds no
+        letters, so it can only occur before the last two words. The last two
+        words are counted from the memo, correcting for words already on the path.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: Words that can never be part of an answer
+        :type skip: Iterable[str]
+        :return: The number of answers for each number of words
+        :rtype: Dict[int, int]
+        """
+        masks = self.masks
+        last = self.last
+        successors = self.successors
+        full_mask = self.full_mask
+        blocked = self.blocked(skip)
+        finishers = self._finishers(blocked)
+        raw_count = self._raw_counts(blocked, finishers)
+        roots = [word_id for word_id in self.order if not blocked[word_id]]
+
+        counts = {1: sum(1 for word_id in roots if masks[word_id] == full_mask)}
+        for num_words in range(2, max_num_words + 1):
+            total = 0
+            path: List[int] = []
+
+            def count_from(covered: int, letter: int) -> int:
+                remaining = num_words - len(path)
+                if remaining > 2:
+                    result = 0
+                    for next_id in successors[letter]:
+                        next_covered = covered | masks[next_id]
+                        if (
+                            blocked[next_id]
+                            or next_id in path
+                            or next_covered == full_mask
+                            or not raw_count(next_covered, last[next_id], remaining - 1)
+                        ):
+                            continue
+                        path.append(next_id)
+                        result += count_from(next_covered, last[next_id])
+                        path.pop()
+                    return result
+                result = raw_count(covered, letter, 2)
+                for word_id in path:
+                    if self.first[word_id] == letter:
+                        result -= len(finishers(covered, last[word_id]))
+                return result
+
+            for root in roots:
+                covered = masks[root]
+                if covered == full_mask:
+                    continue
+                if num_words == 2:
+                    total += len(finishers(covered, last[root]))
+                elif raw_count(covered, last[root], num_words - 1):
+                    path.append(root)
+                    total += count_from(covered, last[root])
+                    path.pop()
+            counts[num_words] = total
+        return counts
+
+    def iter_all(
+        self, max_num_words: int = 3, skip: Iterable[str] = ()
+    ) -> Iterator[Tuple[str, ...]]:
+        """Yield every answer of up to ``max_num_words`` words, fewest words first.
+
+        An answer is a chain of different words where only the last word completes
+        the board. Branches that cannot complete the board are cut using the same
+        memoized state counts as :meth:`count_solutions`, and the last word is
+        joined from a memoized list of words covering the missing letters. The work
+        done is proportional to the number of answers.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: Words that can never be part of an answer
+        :type skip: Iterable[str]
+        :return: An iterator of answer tuples
+        :rtype: Iterator[Tuple[str, ...]]
+        """
+        words = self.words
+        masks = self.masks
+        last = self.last
+        successors = self.successors
+        full_mask = self.full_mask
+        blocked = self.blocked(skip)
+        finishers = self._finishers(blocked)
+        raw_count = self._raw_counts(blocked, finishers)
+        roots = [word_id for word_id in self.order if not blocked[word_id]]
+
+        for root in roots:
+            if masks[root] == full_mask:
+                yield (words[root],)
+
+        for num_words in range(2, max_num_words + 1):
+            path: List[int] = []
+            covers: List[int] = []
+            for root in roots:
+                covered = masks[root]
+                if covered == full_mask or not raw_count(
+                    covered, last[root], num_words - 1
+                ):
+                    continue
+                path.append(root)
+                covers.append(covered)
+                stack = [iter(successors[last[root]])]
+                while stack:
+                    if len(path) == num_words - 1:
+                        prefix = tuple(words[word_id] for word_id in path)
+                        for word_id in finishers(covers[-1], last[path[-1]]):
+                            yield prefix + (words[word_id],)
+                        stack.pop()
+                        path.pop()
+                        covers.pop()
+                        continue
+                    next_id = next(stack[-1], None)
+                    if next_id is None:
+                        stack.pop()
+                        path.pop()
+                        covers.pop()
+                        continue
+                    next_covered = covers[-1] | masks[next_id]
+                    if (
+                        blocked[next_id]
+                        or next_id in path
+                        or next_covered == full_mask
+                        or not raw_count(
+                            next_covered, last[next_id], num_words - len(path) - 1
+                        )
+                    ):
+                        continue
+                    path.append(next_id)
+                    covers.append(next_covered)
+                    stack.append(iter(successors[last[next_id]]))
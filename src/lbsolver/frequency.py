@@ -0,0 +1,59 @@
+"""The frequency module provides word frequencies for ranking answers by how natural
+their words are.
+
+A frequency list has one word per line followed by its count, separated by
+whitespace, a tab or a comma, e.g. ``the 23135851162``. Lines that do not parse,
+such as a header, are skipped and compressed lists are read as with
+:func:`lbsolver.wordindex.open_words`.
+
+The cost of a word is its negative log probability with add one smoothing, so
+common words cost little and words missing from the list cost the most. The cost of
+an answer is the sum of the costs of its words, see
+:meth:`lbsolver.engine.BitmaskEngine.top_k_search`.
+"""
+import math
+import os
+import re
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Dict, Union
+
+from lbsolver.wordindex import open_words
+
+SEPARATOR = re.compile(r"[\s,]+")
+
+
+def load_frequencies(path: Union[str, os.PathLike]) -> Dict[str, int]:
+    """Read a frequency list. Counts of words differing only by case are added.
+
+    :param path: The path of a frequency list, optionally gzip or bzip2 compressed
+    :type path: str or os.PathLike
+    :return: The count of each lowercase word
+    :rtype: Dict[str, int]
+    """
+    counts: Dict[str, int] = Counter()
+    with open_words(path) as lines:
+        for line in lines:
+            fields = SEPARATOR.split(line.strip())
+            if len(fields) < 2 or not fields[1].isdigit():
+                continue
+            counts[fields[0].lower()] += int(fields[1])
+    return dict(counts)
+
+
+def word_costs(words: Iterable[str], frequencies: Mapping[str, int]) -> array:
+    """Get the cost of each word, in the order of the words.
+
+    :param words: Words, e.g. :attr:`lbsolver.engine.BitmaskEngine.words`
+    :type words: Iterable[str]
+    :param frequencies: The count of each word, e.g. from :func:`load_frequencies`
+    :type frequencies: Mapping[str, int]
+    :return: One cost per word, lower for more frequent words
+    :rtype: array
+    """
+    log_total = math.log(sum(frequencies.values()) + 1)
+    return array(
+        "d",
+        (log_total - math.log(frequencies.get(word, 0) + 1) for word in words),
+    )
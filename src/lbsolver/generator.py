@@ -0,0 +1,307 @@
+"""The generator module provides ``lbsolver generate``, a generator of candidate
+boards ranked by the quality of their solutions.
+
+Random valid boards are sampled from a seeded generator and scored against a
+dictionary. Scoring a board uses the fast paths of the solver: the valid words come
+from a compiled :class:`lbsolver.wordindex.WordIndex` or
+:class:`lbsolver.trie.WordTrie` and answers are counted by
+:meth:`lbsolver.engine.BitmaskEngine.count_solutions` without being built. Boards
+with too few valid words are rejected before any counting.
+
+A board is kept when it has enough two word answers and a number of answers in the
+requested range. Score against a dictionary of common words to keep obscure words
+out of the answers.
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from lbsolver.batchfilter import BoardFilter
+from lbsolver.engine import BitmaskEngine
+from lbsolver.layers import LayeredDictionary
+from lbsolver.trie import WordTrie
+from lbsolver.wordindex import ALPHABET, WordIndex, open_dictionary
+
+VOWELS = "aeiou"
+MIN_VOWELS = 3
+MIN_VALID_WORDS = 30
+
+_DICTIONARY: Optional[Union[WordIndex, WordTrie]] = None
+
+
+@dataclass
+class BoardScore:
+    """The solution properties of a board, see :func:`score_board`"""
+
+    #: The board letters
+    board: str
+    #: The number of valid words on the board
+    valid_words: int
+    #: The number of answers for each number of words
+    counts: Dict[int, int]
+
+    @property
+    def solutions(self) -> int:
+        """The number of answers"""
+        return sum(self.counts.values())
+
+    @property
+    def two_word_answers(self) -> int:
+        """The number of answers with two words"""
+        return self.counts.get(2, 0)
+
+    @property
+    def min_words(self) -> int:
+        """The fewest words of any answer, 0 when the board has no answers"""
+        return min((size for size, total in self.counts.items() if total), default=0)
+
+
+def sample_boards(
+    count: int, seed: int = 0, min_vowels: int = MIN_VOWELS
+) -> Iterator[str]:
+    """Sample random valid boards. The same seed always gives the same boards.
+
+    :param count: The number of boards
+    :type count: int
+    :param seed: The seed of the generator
+    :type seed: int
+    :param min_vowels: The fewest vowels on a board
+    :type min_vowels: int
+    :raise ValueError: If min_vowels is more than the number of vowels
+    :return: Boards of 12 distinct lowercase letters
+    :rtype: Iterator[str]
+    """
+    if min_vowels > len(VOWELS):
+        raise ValueError(f"min_vowels must be at most {len(VOWELS)}")
+    generator = random.Random(seed)
+    produced = 0
+    while produced < count:
+        letters = generator.sample(ALPHABET, 12)
+        if sum(letter in VOWELS for letter in letters) >= min_vowels:
+            produced += 1
+            yield "".join(letters)
+
+
+def score_board(
+    board: str,
+    dictionary: Union[WordIndex, WordTrie, Sequence[str]],
+    max_num_words: int = 3,
+    min_valid_words: int = MIN_VALID_WORDS,
+) -> Optional[BoardScore]:
+    """Count the answers of a board.
+
+    :param board: A board accepted by :class:`lbsolver.Gameboard`
+    :type board: str
+    :param dictionary: The dictionary to score against
+    :type dictionary: :class:`lbsolver.wordindex.WordIndex` or
+        :class:`lbsolver.trie.WordTrie` or Sequence[str]
+    :param max_num_words: The maximum number of words allowed in an answer
+    :type max_num_words: int
+    :param min_valid_words: Reject the board without counting answers when it has
+        fewer valid words
+    :type min_valid_words: int
+    :raise ValueError: If the board is invalid
+    :return: The score of the board, or None if it was rejected
+    :rtype: :class:`lbsolver.generator.BoardScore` or None
+    """
+    from lbsolver.lbsolver import Gameboard, LBSolver
+
+    solver = LBSolver(Gameboard(board), dictionary)
+    words = list(dict.fromkeys(solver.generate_valid_words()))
+    if len(words) < min_valid_words:
+        return None
+    engine = BitmaskEngine(solver.gameboard.board, words)
+    return BoardScore(
+        "".join(solver.gameboard.board),
+        len(words),
+        engine.count_solutions(max_num_words),
+    )
+
+
+def rank_key(score: BoardScore):
+    """The ranking of kept boards: the fewest two word answers first, so the puzzle
+    is solvable in two words without being easy, then the most answers."""
+    return (score.two_word_answers, -score.solutions, score.board)
+
+
+def _init_worker(dictionary) -> None:  # pragma: no cover
+    global _DICTIONARY
+    _DICTIONARY = dictionary
+
+
+def _score_in_worker(
+    board: str, max_num_words: int, min_valid_words: int
+) -> Optional[BoardScore]:  # pragma: no cover
+    return score_board(board, _DICTIONARY, max_num_words, min_valid_words)
+
+
+def generate_boards(
+    dictionary: Union[WordIndex, WordTrie, Iterable[str]],
+    boards: Iterable[str],
+    max_num_words: int = 3,
+    min_valid_words: int = MIN_VALID_WORDS,
+    min_two_word_answers: int = 1,
+    min_solutions: int = 1,
+    max_solutions: Optional[int] = None,
+    workers: int = 1,
+) -> List[BoardScore]:
+    """Score candidate boards and rank the boards worth keeping.
+
+    :param dictionary: The dictionary to score against. Words that are not in a
+        compiled index or trie are compiled into a :class:`lbsolver.wordindex.WordIndex`.
+    :type dictionary: :class:`lbsolver.wordindex.WordIndex` or
+        :class:`lbsolver.trie.WordTrie` or Iterable[str]
+    :param boards: The candidate boards, e.g. from :func:`sample_boards`
+    :type boards: Iterable[str]
+    :param max_num_words: The maximum number of words allowed in an answer
+    :type max_num_words: int
+    :param min_valid_words: Reject boards with fewer valid words before counting
+    :type min_valid_words: int
+    :param min_two_word_answers: The fewest two word answers of a kept board
+    :type min_two_word_answers: int
+    :param min_solutions: The fewest answers of a kept board
+    :type min_solutions: int
+    :param max_solutions: The most answers of a kept board. Defaults to no limit.
+    :type max_solutions: int
+    :param workers: The number of processes scoring boards
+    :type workers: int
+    :raise ValueError: If a board is invalid or workers is less than one
+    :return: The kept boards, best first, see :func:`rank_key`
+    :rtype: List[:class:`lbsolver.generator.BoardScore`]
+    """
+    if workers <= 0:
+        raise ValueError("workers must be greater than zero")
+    if not isinstance(
+        dictionary, (WordIndex, WordTrie, BoardFilter, LayeredDictionary)
+    ):
+        dictionary = WordIndex.from_words(dictionary)
+
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(),
+            initializer=_init_worker,
+            initargs=(dictionary,),
+        )
+        boards = list(boards)
+        try:
+            scores = pool.map(
+                _score_in_worker,
+                boards,
+                [max_num_words] * len(boards),
+                [min_valid_words] * len(boards),
+                chunksize=max(1, len(boards) // (workers * 8)),
+            )
+            scores = list(scores)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    else:
+        scores = [
+            score_board(board, dictionary, max_num_words, min_valid_words)
+            for board in boards
+        ]
+
+    kept = [
+        score
+        for score in scores
+        if score is not None
+        and score.two_word_answers >= min_two_word_answers
+        and score.solutions >= min_solutions
+        and (max_solutions is None or score.solutions <= max_solutions)
+    ]
+    kept.sort(key=rank_key)
+    return kept
+
+
+def main(argv: Optional[List[str]] = None):  # pragma: no cover
+    """Generate boards"""
+    parser = argparse.ArgumentParser(
+        prog="lbsolver generate",
+        description="Sample random boards and rank the ones with good solutions",
+    )
+    parser.add_argument(
+        "-d",
+        "--dictionary",
+        help="A words file, compiled index or trie. Use common words to keep "
+        "obscure words out of the answers.",
+        default="test_dictionary",
+    )
+    parser.add_argument(
+        "-n", "--count", help="The number of boards sampled", type=int, default=1000
+    )
+    parser.add_argument("--seed", help="The random board seed", type=int, default=0)
+    parser.add_argument(
+        "--min-vowels",
+        help="The fewest vowels on a sampled board",
+        type=int,
+        default=MIN_VOWELS,
+    )
+    parser.add_argument(
+        "-m",
+        "--max-num-words",
+        help="The maximum number of words in an answer",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "--min-valid-words",
+        help="Reject boards with fewer valid words",
+        type=int,
+        default=MIN_VALID_WORDS,
+    )
+    parser.add_argument(
+        "--min-two-word",
+        help="The fewest two word answers of a kept board",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--min-solutions",
+        help="The fewest answers of a kept board",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--max-solutions",
+        help="The most answers of a kept board",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-w", "--workers", help="The number of worker processes", type=int, default=1
+    )
+    parser.add_argument(
+        "-k", "--top", help="Print only the best N boards", type=int, default=None
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        dictionary = open_dictionary(args.dictionary)
+        boards = sample_boards(args.count, args.seed, args.min_vowels)
+        scores = generate_boards(
+            dictionary,
+            boards,
+            args.max_num_words,
+            args.min_valid_words,
+            args.min_two_word,
+            args.min_solutions,
+            args.max_solutions,
+            args.workers,
+        )
+    except OSError as exc:
+        parser.error(f"can't open '{args.dictionary}': {exc}")
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    print("board         two_word  solutions  min_words  valid_words")
+    for score in scores[: args.top]:
+        print(
+            f"{score.board:<12}  {score.two_word_answers:>8}  {score.solutions:>9}  "
+            f"{score.min_words:>9}  {score.valid_words:>11}"
+        )
+    print(f"Kept {len(scores)} of {args.count} boards", file=sys.stderr)
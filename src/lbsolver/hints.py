@@ -0,0 +1,133 @@
+"""The hints module completes partially played games.
+
+A :class:`HintIndex` is prepared once per board from its
+:class:`lbsolver.engine.BitmaskEngine`. The words already played give a coverage
+state, the letters covered and the letter the next word has to start with, and the
+search starts from that state instead of from scratch. The memoized tables of the
+index are kept between calls, so repeated hints for the same board, e.g. one per
+keystroke, only pay for the few branches that are new.
+"""
+from collections.abc import Iterable, Iterator, Sequence
+from typing import List, Optional, Set, Tuple
+
+from lbsolver.engine import BitmaskEngine
+
+
+class HintIndex:
+    """A prepared index of a board for completing partially played games.
+
+    :param engine: The engine for the board
+    :type engine: :class:`lbsolver.engine.BitmaskEngine`
+    """
+
+    def __init__(self, engine: BitmaskEngine) -> None:
+        """Constructor method"""
+        self.engine = engine
+        unblocked = bytearray(len(engine.words))
+        self._finishers = engine._finishers(unblocked)
+        self._can_finish = engine._can_finish(unblocked, self._finishers)
+
+    def state(self, played: Sequence[str]) -> Tuple[int, Optional[int]]:
+        """Get the coverage state after some words are played.
+
+        :param played: The words played so far, in order
+        :type played: Sequence[str]
+        :raise ValueError: If a word has letters that are not on the board or does
+            not start with the last letter of the word before it
+        :return: The mask of the letters covered and the board index of the letter
+            the next word starts with, or None if no word was played
+        :rtype: Tuple[int, Optional[int]]
+        """
+        engine = self.engine
+        covered = 0
+        letter = None
+        for word in played:
+            try:
+                covered |= engine.mask_for(word)
+            except KeyError:
+                raise ValueError(
+                    f"Word: {word} contains letters not found in gameboard: "
+                    f"{engine.board}"
+                ) from None
+            if letter is not None and engine.letter_index[word[0]] != letter:
+                raise ValueError(
+                    f"Word: {word} must start with the last letter of the word "
+                    "before it"
+                )
+            letter = engine.letter_index[word[-1]]
+        return covered, letter
+
+    def hints(
+        self,
+        played: Sequence[str] = (),
+        max_num_words: int = 2,
+        minimum_answers: int = 5,
+    ) -> List[Tuple[str, ...]]:
+        """Get the words that complete a partially played game, fewest words first.
+        Completions with the same number of words keep ranking order.
+
+        :param played: The words played so far, in order
+        :type played: Sequence[str]
+        :param max_num_words: The maximum number of words to add
+        :type max_num_words: int
+        :param minimum_answers: The number of completions to return
+        :type minimum_answers: int
+        :raise ValueError: If the played words are not a valid chain on the board
+        :return: A list filled with tuples of the words to add
+        :rtype: List[Tuple[str, ...]]
+        """
+        covered, letter = self.state(played)
+        engine = self.engine
+        if covered == engine.full_mask:
+            return []
+        played_ids = {engine.ids[word] for word in played if word in engine.ids}
+
+        completions: List[Tuple[str, ...]] = []
+        for num_words in range(1, max_num_words + 1):
+            if letter is None:
+                candidates: Iterable[int] = engine.order
+            elif num_words == 1:
+                candidates = self._finishers(covered, letter)
+            else:
+                candidates = engine.successors[letter]
+            for path in self._complete(covered, candidates, num_words, (), played_ids):
+                completions.append(tuple(engine.words[word_id] for word_id in path))
+                if len(completions) >= minimum_answers:
+                    return completions
+        return completions
+
+    def _complete(
+        self,
+        covered: int,
+        candidates: Iterable[int],
+        num_words: int,
+        path: Tuple[int, ...],
+        played_ids: Set[int],
+    ) -> Iterator[Tuple[int, ...]]:
+        """Yield the chains of exactly num_words words from candidates where only
+        the last word covers the board"""
+        masks = self.engine.masks
+        last = self.engine.last
+        full_mask = self.engine.full_mask
+        for word_id in candidates:
+            if word_id in played_ids or word_id in path:
+                continue
+            next_covered = covered | masks[word_id]
+            if num_words == 1:
+                if next_covered == full_mask:
+                    yield path + (word_id,)
+            elif next_covered != full_mask and self._can_finish(
+                next_covered, last[word_id], num_words - 1
+            ):
+                letter = last[word_id]
+                if num_words == 2:
+                    next_candidates = self._finishers(next_covered, letter)
+                else:
+                    next_candidates = self.engine.successors[letter]
+                yield from self._complete(
+                    next_covered,
+                    next_candidates,
+                    num_words - 1,
+                    path + (word_id,),
+                    played_ids,
+                )
@@ -0,0 +1,166 @@
+"""The layers module provides dictionaries layered from several word lists.
+
+A layered dictionary starts from a base word list and applies layers in order:
+
+``union``
+    Add the words of the layer.
+``intersection``
+    Keep only the words also in the layer, e.g. a curated list of common words.
+``exclusion``
+    Drop the words of the layer, e.g. a blocklist.
+
+Each word list is compiled once into a :class:`lbsolver.wordindex.WordIndex`, or
+kept as it is when it is already an index or a :class:`lbsolver.trie.WordTrie`.
+For a board, every layer is filtered through its own fast path and the few words
+left are combined with set operations, so word lists are never concatenated or
+filtered again.
+"""
+import hashlib
+import os
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+from lbsolver.trie import WordTrie
+from lbsolver.wordindex import WordIndex, open_dictionary
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lbsolver.lbsolver import Gameboard
+
+OPERATIONS = ("union", "intersection", "exclusion")
+
+WordList = Union[WordIndex, WordTrie, Iterable[str], str, os.PathLike]
+
+
+def _compile(words: WordList) -> Union[WordIndex, WordTrie]:
+    if isinstance(words, (str, os.PathLike)):
+        words = open_dictionary(words)
+    if isinstance(words, (WordIndex, WordTrie)):
+        return words
+    return WordIndex.from_words(words)
+
+
+def _combine(base: List[str], layers: Iterable[Tuple[str, List[str]]]) -> List[str]:
+    words = base
+    for operation, layer_words in layers:
+        if operation == "union":
+            present = set(words)
+            words = words + [word for word in layer_words if word not in present]
+        elif operation == "intersection":
+            keep = set(layer_words)
+            words = [word for word in words if word in keep]
+        else:
+            drop = set(layer_words)
+            words = [word for word in words if word not in drop]
+    return words
+
+
+class LayeredDictionary(Iterable):
+    """A dictionary combining a base word list with layers.
+
+    Words of the base come first in its order, followed by the words each union
+    adds in the order of its layer.
+
+    :param base: The base word list, or its path
+    :type base: :class:`lbsolver.wordindex.WordIndex` or
+        :class:`lbsolver.trie.WordTrie` or Iterable[str] or str or os.PathLike
+    :param layers: Pairs of an operation, one of ``"union"``, ``"intersection"``
+        or ``"exclusion"``, and a word list or its path
+    :type layers: Iterable[Tuple[str, ...]]
+    :raise ValueError: If an operation is unknown
+    """
+
+    def __init__(
+        self, base: WordList, layers: Iterable[Tuple[str, WordList]] = ()
+    ) -> None:
+        """Constructor method"""
+        self._base = _compile(base)
+        self._layers: List[Tuple[str, Union[WordIndex, WordTrie]]] = []
+        self._fingerprint: Optional[str] = None
+        for operation, words in layers:
+            if operation not in OPERATIONS:
+                raise ValueError(
+                    f"Unknown operation: {operation}. Use one of {', '.join(OPERATIONS)}"
+                )
+            self._layers.append((operation, _compile(words)))
+
+    @property
+    def base(self) -> Union[WordIndex, WordTrie]:
+        """The compiled base word list"""
+        return self._base
+
+    @property
+    def layers(self) -> List[Tuple[str, Union[WordIndex, WordTrie]]]:
+        """The operations and compiled word lists applied to the base, in order"""
+        return list(self._layers)
+
+    def union(self, words: WordList) -> "LayeredDictionary":
+        """Get a dictionary that also has the words of a list.
+
+        :param words: A word list or its path
+        :type words: Iterable[str] or str or os.PathLike
+        :return: A new layered dictionary
+        :rtype: :class:`lbsolver.layers.LayeredDictionary`
+        """
+        return self._with("union", words)
+
+    def intersection(self, words: WordList) -> "LayeredDictionary":
+        """Get a dictionary that only has the words also in a list.
+
+        :param words: A word list or its path
+        :type words: Iterable[str] or str or os.PathLike
+        :return: A new layered dictionary
+        :rtype: :class:`lbsolver.layers.LayeredDictionary`
+        """
+        return self._with("intersection", words)
+
+    def exclusion(self, words: WordList) -> "LayeredDictionary":
+        """Get a dictionary without the words of a list, e.g. a blocklist.
+
+        :param words: A word list or its path
+        :type words: Iterable[str] or str or os.PathLike
+        :return: A new layered dictionary
+        :rtype: :class:`lbsolver.layers.LayeredDictionary`
+        """
+        return self._with("exclusion", words)
+
+    def _with(self, operation: str, words: WordList) -> "LayeredDictionary":
+        layered = LayeredDictionary(self._base, self._layers)
+        layered._layers.append((operation, _compile(words)))
+        return layered
+
+    @property
+    def fingerprint(self) -> str:
+        """A SHA-256 hex digest of the word lists and operations"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256(self._base.fingerprint.encode())
+            for operation, words in self._layers:
+                digest.update(f"\0{operation}:{words.fingerprint}".encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def board_words(self, gameboard: "Gameboard") -> List[str]:
+        """Get the words that can be played on a board.
+
+        :param gameboard: The board
+        :type gameboard: :class:`lbsolver.Gameboard`
+        :return: Words in dictionary order
+        :rtype: List[str]
+        """
+
+        def playable(words: Union[WordIndex, WordTrie]) -> List[str]:
+            if isinstance(words, WordTrie):
+                return words.board_words(gameboard.sides)
+            return gameboard.possible_words(words.candidates(gameboard.board))
+
+        return _combine(
+            playable(self._base),
+            ((operation, playable(words)) for operation, words in self._layers),
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(
+            _combine(
+                list(self._base),
+                ((operation, list(words)) for operation, words in self._layers),
+            )
+        )
@@ -1,79 +1,219 @@
 """The lbsolver module provides classes and methods to solve the NYT Letter Boxed game.
 """
-import re
 import argparse
+import os
+import asyncio
 from collections import defaultdict
-from collections.abc import Iterator, Sequence
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from itertools import islice
+import sqlite3
 import sys
-from typing import List, Optional, Union
+import time
+from array import array
+from typing import Dict, List, Optional, TextIO, Tuple, Union
+
+from lbsolver import bench, generator, parallel, server, wordindex, writers
+from lbsolver.batchfilter import BoardFilter
+from lbsolver.cache import (
+    ResultCache,
+    board_key,
+    dictionary_fingerprint,
+    result_key,
+)
+from lbsolver.engine import (
+    BitmaskEngine,
+    CancellationToken,
+    SearchLimit,
+    SearchStats,
+)
+from lbsolver.frequency import load_frequencies, word_costs
+from lbsolver.hints import HintIndex
+from lbsolver.layers import LayeredDictionary
+from lbsolver.trie import WordTrie
+from lbsolver.wordindex import WordIndex, open_dictionary
+
+ENGINES = ("bitmask", "simple")
+BATCH_SIZE = 16384
+BATCH_CACHE_SIZE = 4096
+MAX_LETTERS = 26
 
 
 class Gameboard:
     """This is a class that represents a Gameboard for a solver. Takes a string \
         representing the board.
 
+        The board has two or more sides of the same number of letters, four sides
+        of three letters in the original game. Separating the sides with ':' gives
+        the geometry, e.g. 'abcd:efgh:ijkl:mnop' for four sides of four letters.
+        Otherwise the letters are split into sides of side_length letters.
+
         :param board: A string or list of strings that represent the board.
         :type board: list or str
+        :param side_length: The number of letters of each side when the sides are not
+            separated by ':'
+        :type side_length: int
         :raise ValueError: If the board is invalid (incorrect length, non-alphabet characters or repeated characters)
     """
 
-    def __init__(self, board: Union[str, List[str]]) -> None:
+    def __init__(self, board: Union[str, List[str]], side_length: int = 3) -> None:
         """This is the initialzer method."""
 
+        if side_length <= 0:
+            raise ValueError("side_length must be greater than zero")
         if isinstance(board, str):
             board = board.strip()
             if ":" in board:
-                pattern = "([a-zA-Z]{3}:){3}[a-zA-Z]{3}"
-                board_match = re.fullmatch(pattern, board)
-                board = "".join(board.split(":"))
-                if not board_match or len(set(board)) != 12:
-                    raise ValueError(
-                        f"{board} is not valid. Board must be 12 unique alphabetic characters"
-                    )
-            else:
-                if not board.isalpha() or len(set(board)) != 12:
+                sides = board.split(":")
+                side_length = len(sides[0])
+                if any(len(side) != side_length for side in sides):
                     raise ValueError(
-                        f"{board} is not valid. Board must be alphabetic"
-                        " characters only and 12 unique characters"
+                        f"{board} is not valid. Board must have sides of the same"
+                        " length"
                     )
+                board = "".join(sides)
 
-        if len(board) != 12 or not "".join(str(let) for let in board).isalpha():
+        letters = "".join(str(let) for let in board)
+        if (
+            len(board) != len(letters)
+            or not letters.isalpha()
+            or len(set(letters)) != len(letters)
+        ):
+            raise ValueError(
+                f"{board} is not valid. Board must only be unique alphabetic characters"
+            )
+        if len(letters) % side_length or len(letters) < 2 * side_length:
+            raise ValueError(
+                f"{board} is not valid. Board must be two or more sides of"
+                f" {side_length} characters"
+            )
+        if len(letters) > MAX_LETTERS:
             raise ValueError(
-                f"{board} is not valid. Board must only be 12 unique alphabetic characters"
+                f"{board} is not valid. Board must have at most {MAX_LETTERS}"
+                " characters"
             )
-        self._board = "".join(board)
+        self._board = letters
+        self._sides = [
+            letters[start : start + side_length]
+            for start in range(0, len(letters), side_length)
+        ]
+        self._canonical_key = board_key(self.layout)
+
+        sides = self._sides
+        self._letter_side = {letter: side for side in sides for letter in side}
+        self._transitions = frozenset(
+            first + second
+            for first in self._board
+            for second in self._board
+            if self._letter_side[first] != self._letter_side[second]
+        )
+
+        # Control characters other than the line break that separates words. Marker
+        # characters found in the words are translated to NUL, which is not a
+        # marker, so only board letters become markers.
+        markers = "".join(chr(code) for code in range(1, 32) if code != ord("\n"))
+        markers = markers[: len(sides)]
+        self._side_markers = markers.encode("ascii")
+        self._repeated_markers = [bytes([marker]) * 2 for marker in self._side_markers]
+        if self._board.isascii():
+            side_codes = bytearray(range(256))
+            for marker in self._side_markers:
+                side_codes[marker] = 0
+            for letter in self._board:
+                side_codes[ord(letter)] = ord(
+                    markers[sides.index(self._letter_side[letter])]
+                )
+            self._side_codes = bytes(side_codes)
+        else:
+            self._side_codes = None
+        self._side_table = str.maketrans(
+            {
+                **dict.fromkeys(markers, "\0"),
+                **{
+                    letter: markers[sides.index(self._letter_side[letter])]
+                    for letter in self._board
+                },
+            }
+        )
 
     @property
     def side1(self):
         """Get board side 1"""
-        return self._board[0:3]
+        return self._sides[0]
 
     @property
     def side2(self):
         """Get board side 2"""
-        return self._board[3:6]
+        return self._sides[1]
 
     @property
     def side3(self):
-        """Get board side 3"""
-        return self._board[6:9]
+        """Get board side 3, empty for a board of two sides"""
+        return self._sides[2] if len(self._sides) > 2 else ""
 
     @property
     def side4(self):
-        """Get board side 4"""
-        return self._board[9:12]
+        """Get board side 4, empty for a board of fewer sides"""
+        return self._sides[3] if len(self._sides) > 3 else ""
 
     @property
     def board(self):
         """The board represented as a list of strings"""
         return list(self._board)
 
+    @property
+    def sides(self) -> List[str]:
+        """The letters of each side of the board"""
+        return list(self._sides)
+
+    @property
+    def side_length(self) -> int:
+        """The number of letters of each side"""
+        return len(self._sides[0])
+
+    @property
+    def layout(self) -> str:
+        """The sides of the board separated by ':'. Unlike :attr:`board` it keeps the
+        geometry, so ``Gameboard(gameboard.layout)`` is the same board."""
+        return ":".join(self._sides)
+
+    @property
+    def canonical_key(self) -> str:
+        """A key shared by every arrangement of the same board. Permuting the sides,
+        or the letters within a side, gives the same puzzle and the same key.
+
+        :return: The sides with their letters sorted, in sorted order, separated by ':'
+        :rtype: str
+        """
+        return self._canonical_key
+
+    def canonical(self) -> "Gameboard":
+        """Get the arrangement of this board in canonical order.
+
+        :return: A gameboard whose letters are in the order of :attr:`canonical_key`
+        :rtype: :class:`lbsolver.Gameboard`
+        """
+        return Gameboard(self.canonical_key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Gameboard):
+            return NotImplemented
+        return self.canonical_key == other.canonical_key
+
+    def __hash__(self) -> int:
+        return hash(self.canonical_key)
+
     def __repr__(self) -> str:
-        return f"""Board: {self.board}
-        Side 1: {self.side1}
-        Side 2: {self.side2}
-        Side 3: {self.side3}
-        Side 4: {self.side4}"""
+        return f"Board: {self.board}" + "".join(
+            f"\n        Side {number}: {side}"
+            for number, side in enumerate(self._sides, 1)
+        )
 
     def get_side_for_letter(self, letter: str) -> Optional[str]:
         """Get the side a letter is on.
@@ -83,12 +223,48 @@ class Gameboard:
         :return: A str representing the side or None in case where the character is not on a side.
         :rtype: str or None
         """
-        sides = [self.side1, self.side2, self.side3, self.side4]
+        return self._letter_side.get(letter)
+
+    @property
+    def transitions(self) -> frozenset:
+        """The two letter sequences allowed on the board. A pair is allowed when both
+        letters are on the board and on different sides."""
+        return self._transitions
+
+    def possible_words(self, words: Sequence[str]) -> List[str]:
+        """Check a batch of words against the board rules at once. Every letter must
+        be on the board and consecutive letters must be on different sides.
 
-        for side in sides:
-            if letter in side:
-                return side
-        return None
+        Each letter is translated to a marker for its side in one pass over the whole
+        batch, so the per word work is a handful of substring checks. A word with any
+        character that is not on the board keeps a character that is not a marker.
+
+        :param words: Words to check. Words must not contain line breaks.
+        :type words: Sequence[str]
+        :return: The words possible on the board, in order
+        :rtype: List[str]
+        """
+        if not words:
+            return []
+        if self._side_codes is not None:
+            translated = (
+                "\n".join(words)
+                .encode("utf-8", "surrogatepass")
+                .translate(self._side_codes)
+                .split(b"\n")
+            )
+            markers, repeated = self._side_markers, self._repeated_markers
+        else:
+            translated = "\n".join(words).translate(self._side_table).split("\n")
+            markers = self._side_markers.decode("ascii")
+            repeated = [marker * 2 for marker in markers]
+        return [
+            word
+            for word, sides in zip(words, translated)
+            if sides
+            and not sides.strip(markers)
+            and not any(pair in sides for pair in repeated)
+        ]
 
     @staticmethod
     def default_board():
@@ -106,13 +282,32 @@ class LBSolver:
 
     :param gameboard: A gameboard representing the letters in the Letter Boxed game
     :type gameboard: :class: `lbsolver.Gameboard`
-    :param dictionary: A backing dictionary to use to find potential answers
-    :type dictionary: Sequence[str]
+    :param dictionary: A backing dictionary to use to find potential answers. Either
+        the lines of a words file, a :class:`lbsolver.wordindex.WordIndex` or the
+        path of either, which is streamed from disk, see
+        :func:`lbsolver.wordindex.open_dictionary`. An iterator is read once and
+        only the words valid on the gameboard are kept, so the gameboard can then
+        only be replaced by an equivalent board.
+    :type dictionary: Iterable[str] or str or os.PathLike
+    :param cache: A cache of solve results shared by solvers, see
+        :class:`lbsolver.cache.ResultCache`
+    :type cache: :class:`lbsolver.cache.ResultCache`
+    :param collect_stats: Record timings and search counters in :attr:`stats`
+    :type collect_stats: bool
+    :param frequencies: Word counts for :meth:`solve_top_k`, see :attr:`frequencies`
+    :type frequencies: Mapping[str, int] or str or os.PathLike
     :raise TypeError: If gameboard or dictionary is set to None
 
     """
 
-    def __init__(self, gameboard: Gameboard, dictionary: Sequence[str]) -> None:
+    def __init__(
+        self,
+        gameboard: Gameboard,
+        dictionary: Union[Iterable[str], str, os.PathLike],
+        cache: Optional[ResultCache] = None,
+        collect_stats: bool = False,
+        frequencies: Optional[Union[Mapping[str, int], str, os.PathLike]] = None,
+    ) -> None:
         """Constructor method"""
 
         if gameboard is None:
@@ -122,8 +317,21 @@ class LBSolver:
             raise TypeError("Dictionary was set to None.")
 
         self.__gameboard = gameboard
-        self.__dictionary = dictionary
+        self.__filtered_for: Optional[str] = None
+        self.__dictionary = self.__open(dictionary)
+        self.__fingerprint: Optional[str] = None
+        self.__valid_words: Optional[Tuple[str, List[str]]] = None
+        self.__hint_index: Optional[Tuple[str, HintIndex]] = None
+        self.__frequencies: Optional[Mapping[str, int]] = None
+        self.__frequency_source: Optional[Union[Mapping[str, int], str]] = None
+        self.__word_costs: Optional[Tuple[str, array]] = None
         self.__answers: List[tuple] = []
+        self.cache = cache
+        self.collect_stats = collect_stats
+        self.__stats: Optional[SearchStats] = None
+        self.__complete = True
+        if frequencies is not None:
+            self.frequencies = frequencies
 
     @property
     def gameboard(self) -> Gameboard:
@@ -132,24 +340,122 @@ class LBSolver:
 
     @gameboard.setter
     def gameboard(self, new_board: Gameboard):
-        if new_board:
-            self.__gameboard = new_board
-        else:
+        if not new_board:
             raise TypeError("gameboard cannot be set to None")
+        if (
+            self.__filtered_for is not None
+            and new_board.canonical_key != self.__filtered_for
+        ):
+            raise ValueError(
+                "The dictionary was read from an iterator and only keeps the words "
+                f"valid on {self.__filtered_for}. Create a new solver or set a "
+                f"dictionary that is not an iterator to solve {new_board.canonical_key}"
+            )
+        self.__gameboard = new_board
 
     @property
-    def dictionary(self) -> Sequence[str]:
+    def dictionary(self) -> Iterable[str]:
         """The dictionary instance"""
         return self.__dictionary
 
     @dictionary.setter
-    def dictionary(self, dictionary: Sequence[str]):
+    def dictionary(self, dictionary: Union[Iterable[str], str, os.PathLike]):
         "Setting the dictionary"
         if dictionary:
-            self.__dictionary = dictionary
+            self.__dictionary = self.__open(dictionary)
+            self.__fingerprint = None
+            self.__valid_words = None
+            self.__hint_index = None
+            self.__word_costs = None
         else:
             raise TypeError("dictionary cannot be set to None")
 
+    @property
+    def frequencies(self) -> Optional[Mapping[str, int]]:
+        """The count of each word used to rank answers in :meth:`solve_top_k`. Set it
+        to a mapping or the path of a frequency list, see :mod:`lbsolver.frequency`.
+        A path is read once, and the costs of the valid words of the gameboard are
+        kept until the frequencies, the dictionary or the board change."""
+        return self.__frequencies
+
+    @frequencies.setter
+    def frequencies(self, frequencies: Union[Mapping[str, int], str, os.PathLike]):
+        if frequencies is None:
+            raise TypeError("frequencies cannot be set to None")
+        if isinstance(frequencies, (str, os.PathLike)):
+            self.__frequency_source = os.fspath(frequencies)
+            self.__frequencies = load_frequencies(frequencies)
+        else:
+            self.__frequency_source = frequencies
+            self.__frequencies = frequencies
+        self.__word_costs = None
+
+    def __open(
+        self, dictionary: Union[Iterable[str], str, os.PathLike]
+    ) -> Iterable[str]:
+        """Open a dictionary path, or keep only the valid words of an iterator"""
+        self.__filtered_for = None
+        if isinstance(dictionary, (str, os.PathLike)):
+            return open_dictionary(dictionary)
+        if isinstance(dictionary, Iterator):
+            words = list(dict.fromkeys(self.generate_valid_words(dictionary)))
+            self.__filtered_for = self.gameboard.canonical_key
+            return words
+        return dictionary
+
+    @property
+    def stats(self) -> Optional[SearchStats]:
+        """The statistics of the last :meth:`solve` or :meth:`iter_solutions` call,
+        or None unless ``collect_stats`` is set"""
+        return self.__stats
+
+    @property
+    def complete(self) -> bool:
+        """Whether the last :meth:`solve` call searched until it had enough answers
+        or ran out of branches. False when a timeout, node budget or cancellation
+        stopped it first."""
+        return self.__complete
+
+    @property
+    def fingerprint(self) -> str:
+        """A content hash of the dictionary, see
+        :func:`lbsolver.cache.dictionary_fingerprint`"""
+        if self.__fingerprint is None:
+            self.__fingerprint = dictionary_fingerprint(self.dictionary)
+        return self.__fingerprint
+
+    def bitmask_engine(self) -> BitmaskEngine:
+        """Build a :class:`lbsolver.engine.BitmaskEngine` from the valid words of the
+        current gameboard, in dictionary order.
+
+        :return: A search engine for the current gameboard
+        :rtype: :class:`lbsolver.engine.BitmaskEngine`
+        """
+        return BitmaskEngine(self.gameboard.board, self.__board_words())
+
+    def __board_words(self) -> List[str]:
+        """The distinct valid words of the gameboard in dictionary order. The list is
+        kept until the dictionary changes or the gameboard changes to a board that is
+        not equivalent, see :attr:`lbsolver.Gameboard.canonical_key`."""
+        key = self.gameboard.canonical_key
+        if self.__valid_words is None or self.__valid_words[0] != key:
+            self.__valid_words = (
+                key,
+                list(dict.fromkeys(self.generate_valid_words())),
+            )
+        return self.__valid_words[1]
+
+    def __costs(self, bitmask_engine: BitmaskEngine) -> array:
+        """The cost of each word of the gameboard's engine, see
+        :func:`lbsolver.frequency.word_costs`. The costs are kept like the words."""
+        key = self.gameboard.canonical_key
+        if self.__word_costs is None or self.__word_costs[0] != key:
+            self.__word_costs = (
+                key,
+                word_costs(bitmask_engine.words, self.__frequencies),
+            )
+        return self.__word_costs[1]
+
     def get_unused_letters(self, my_word: str) -> set:
         """Given a word, identify characters on the gameboard not used.
 
@@ -180,60 +486,75 @@ class LBSolver:
         :return: True if sequence is possible on board, false otherwise
         :rtype: bool
         """
-        valid_sequence = True
-        first_let, second_let = ("", "")
+        transitions = self.gameboard.transitions
         for first_let, second_let in zip(word_sequence, word_sequence[1:]):
-            if first_let == second_let:
-                valid_sequence = False
-                break
-            side = self.gameboard.get_side_for_letter(first_let)
-            # side = get_side(a, [side1, side2, side3, side4])
-            if not side:
-                valid_sequence = False
-                break
-            elif second_let in side:
-                valid_sequence = False
-                break
-
-        if not self.gameboard.get_side_for_letter(second_let):
-            return False
-        return valid_sequence
+            if first_let + second_let not in transitions:
+                return False
+        return bool(word_sequence) and bool(
+            self.gameboard.get_side_for_letter(word_sequence[-1])
+        )
 
     def generate_valid_words(
-        self, dictionary: Optional[Sequence[str]] = None
+        self, dictionary: Optional[Iterable[str]] = None
     ) -> Iterator[str]:
         """Based on the current gameboard, generate a set of valid words from
         dictionary. If dictionary parameter is not set, default dictionary is used.
+        When the dictionary is a :class:`lbsolver.wordindex.WordIndex` only the words
+        made of board letters are checked. When it is a
+        :class:`lbsolver.trie.WordTrie` the words are found by walking the trie. A
+        :class:`lbsolver.batchfilter.BoardFilter` uses bitset operations and a
+        :class:`lbsolver.layers.LayeredDictionary` combines the words of its layers.
 
         :param dictionary: An dictionary to use to find valid words
-        :type dictionary: Sequence[str]
+        :type dictionary: Iterable[str]
         :return: A set of valid words
         :rtype: Iterator[str]
         """
         if not dictionary:
             dictionary = self.dictionary
 
+        if isinstance(dictionary, (WordTrie, BoardFilter)):
+            yield from dictionary.board_words(self.gameboard.sides)
+            return
+
+        if isinstance(dictionary, LayeredDictionary):
+            yield from dictionary.board_words(self.gameboard)
+            return
+
+        if isinstance(dictionary, WordIndex):
+            yield from self.gameboard.possible_words(
+                dictionary.candidates(self.gameboard.board)
+            )
+            return
+
+        batch: List[str] = []
         for item in dictionary:
             item = item.strip()
-            if not item:
-                continue
-            if (
-                item[0].islower()
-                and len(item) >= 3
-                and all(letter in self.gameboard.board for letter in item.lower())  # type: ignore
-            ):
-                item = item.lower().strip()
-
-                valid_word = self.possible_on_board(item)
-                if valid_word:
-                    yield item
-            else:
-                continue
+            if item and item[0].islower() and len(item) >= 3:
+                batch.append(item.lower().strip())
+                if len(batch) >= BATCH_SIZE:
+                    yield from self.gameboard.possible_words(batch)
+                    batch = []
+        yield from self.gameboard.possible_words(batch)
 
     def solve(
-        self, max_num_words: int = 3, minimum_answers: int = 1, skip: str = ""
+        self,
+        max_num_words: int = 3,
+        minimum_answers: int = 1,
+        skip: str = "",
+        engine: str = "bitmask",
+        workers: int = 1,
+        timeout: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        cancel: Optional[CancellationToken] = None,
     ) -> Sequence[tuple]:
-        """Solve the puzzle based on the current dictionary and gameboard.
+        """Solve the puzzle based on the current dictionary and gameboard. With
+        ``collect_stats`` set, the timings and counters of the call are kept in
+        :attr:`stats`.
+
+        A timeout, a node budget or a cancellation token bound the search. When one
+        is reached the answers found so far are returned and :attr:`complete` is
+        False. Incomplete results are not cached.
 
         :param max_num_words: The maximum number of words allowed in an answer
         :type max_num_words: int
@@ -243,11 +564,30 @@ class LBSolver:
         :param skip: A list of words separated by commas. Words in this list will be skipped
         from answers
         :type skip: str
-        :raise ValueError: if max_num_words or minimum_answers is less than or equal to zero.
+        :param engine: The search engine to use. ``"bitmask"`` uses
+        :class:`lbsolver.engine.BitmaskEngine`, ``"simple"`` uses the original
+        set based search. Both return the same answers.
+        :type engine: str
+        :param workers: The number of processes searching the board. With more than one
+        worker the first words are split across a process pool, see
+        :func:`lbsolver.parallel.search_parallel`. Requires the bitmask engine.
+        :type workers: int
+        :param timeout: Seconds after which the search stops
+        :type timeout: float
+        :param max_nodes: The most words the search enters, see
+        :attr:`lbsolver.engine.SearchStats.nodes`
+        :type max_nodes: int
+        :param cancel: A token another thread can use to stop the search
+        :type cancel: :class:`lbsolver.engine.CancellationToken`
+        :raise ValueError: if max_num_words, minimum_answers or workers is less than or
+        equal to zero, if engine is unknown, or if a bound is used with the simple
+        engine or more than one worker.
         :return: A list filled with answer tuples
         :rtype: Sequence[tuple]
         """
         self.__answers.clear()
+        self.__stats = None
+        self.__complete = True
 
         if max_num_words <= 0:
             raise ValueError("max_num_words must be greater than zero")
@@ -255,25 +595,120 @@ class LBSolver:
         if minimum_answers <= 0:
             raise ValueError("minimum_answers must be greater than zero")
 
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+
+        if workers <= 0:
+            raise ValueError("workers must be greater than zero")
+
+        if workers > 1 and engine != "bitmask":
+            raise ValueError("workers requires the bitmask engine")
+
+        limit = None
+        if timeout is not None or max_nodes is not None or cancel is not None:
+            if engine != "bitmask" or workers > 1:
+                raise ValueError(
+                    "timeout, max_nodes and cancel require the bitmask engine and "
+                    "one worker"
+                )
+            limit = SearchLimit(timeout, max_nodes, cancel)
+
+        skip_list = list(skip_word.strip() for skip_word in skip.lower().split(","))
+        stats = SearchStats() if self.collect_stats else None
+        self.__stats = stats
+        if self.cache is not None:
+            cache_key = result_key(
+                self.gameboard.layout,
+                self.fingerprint,
+                max_num_words,
+                minimum_answers,
+                skip_list,
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.__answers.extend(cached)
+                if stats is not None:
+                    stats.cached = True
+                    stats.answers = len(cached)
+                return self.__answers
+
+        self.__search(
+            max_num_words, minimum_answers, skip_list, engine, workers, stats, limit
+        )
+        self.__complete = limit is None or limit.complete
+        if self.cache is not None and self.__complete:
+            self.cache.put(cache_key, self.__answers)
+        return self.__answers
+
+    def __search(
+        self,
+        max_num_words: int,
+        minimum_answers: int,
+        skip_list: List[str],
+        engine: str,
+        workers: int,
+        stats: Optional[SearchStats] = None,
+        limit: Optional[SearchLimit] = None,
+    ) -> None:
+        """Run the search for :meth:`solve`, filling in the answers. Processes
+        searching in parallel do not report nodes or pruned branches."""
+        if stats is not None:
+            start = time.perf_counter()
+        ordered_words = self.__board_words()
+        if stats is not None:
+            stats.filter_seconds = time.perf_counter() - start
+            stats.valid_words = len(ordered_words)
+            start = time.perf_counter()
+
+        if engine == "bitmask":
+            bitmask_engine = BitmaskEngine(self.gameboard.board, ordered_words)
+            if stats is not None:
+                stats.rank_seconds = time.perf_counter() - start
+            if workers > 1:
+                start = time.perf_counter()
+                answers = parallel.search_parallel(
+                    bitmask_engine, max_num_words, minimum_answers, skip_list, workers
+                )
+                if stats is not None:
+                    stats.search_seconds = time.perf_counter() - start
+                    stats.answers = len(answers)
+            else:
+                answers = bitmask_engine.search(
+                    max_num_words, minimum_answers, skip_list, stats=stats, limit=limit
+                )
+            self.__answers.extend(answers)
+            return
+
         word_ranking_map = defaultdict(list)
-        valid_words = set(self.generate_valid_words())
-        for word in valid_words:
+        valid_words = set(ordered_words)
+        for word in ordered_words:
             num_letters_used = len(self.gameboard.board) - len(
                 self.get_unused_letters(word)
             )
             word_ranking_map[(num_letters_used, word[0])].append(word)
         sorted_keys = sorted(word_ranking_map, reverse=True)
+        # The words each letter can chain to, in rank order
+        successors = defaultdict(list)
+        for key in sorted_keys:
+            successors[key[1]].extend(word_ranking_map[key])
         used = set()
-        skip_list = list(skip_word.strip() for skip_word in skip.lower().split(","))
+        pruned = stats.pruned if stats is not None else None
+        if stats is not None:
+            stats.rank_seconds = time.perf_counter() - start
+            start = time.perf_counter()
 
         def dfs(word: str, possible_answer: tuple):
             if any(
                 word.lower().strip() == answer.lower().strip()
                 for answer in possible_answer
             ):
+                if pruned is not None:
+                    pruned["duplicate"] += 1
                 return
 
             if len(self.__answers) >= minimum_answers or word in skip_list:
+                if pruned is not None and word in skip_list:
+                    pruned["skip"] += 1
                 return
 
             if (
@@ -281,15 +716,16 @@ class LBSolver:
                 or word in used
                 or word not in valid_words
             ):
+                if pruned is not None:
+                    pruned["used" if word in used else "depth"] += 1
                 return
+            if stats is not None:
+                stats.nodes += 1
             possible_answer = possible_answer + (word,)
             letters_left = self.get_unused_letters("".join(possible_answer))
             if letters_left:
-
-                filter_keys = (key for key in sorted_keys if key[1] == word[-1])
-                for key in sorted(filter_keys, reverse=True):
-                    for next_word in word_ranking_map[key]:
-                        dfs(next_word, possible_answer)
+                for next_word in successors[word[-1]]:
+                    dfs(next_word, possible_answer)
             else:
                 used.update(possible_answer)
                 self.__answers.append(possible_answer)
@@ -301,18 +737,406 @@ class LBSolver:
             for word in word_ranking_map[key]:
                 if word.lower() not in skip_list:
                     dfs(word, tuple())
-        return self.__answers
+                elif pruned is not None:
+                    pruned["skip"] += 1
+        if stats is not None:
+            stats.search_seconds = time.perf_counter() - start
+            stats.answers = len(self.__answers)
+
+    def solve_optimal(
+        self,
+        max_num_words: int = 3,
+        minimum_answers: int = 1,
+        skip: str = "",
+        by_length: bool = False,
+    ) -> Sequence[tuple]:
+        """Solve the puzzle returning the answers with the fewest words first. Unlike
+        :meth:`solve`, words may be shared between answers.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param minimum_answers: The number of answers to retrieve
+        :type minimum_answers: int
+        :param skip: A list of words separated by commas. Words in this list will be skipped
+        from answers
+        :type skip: str
+        :param by_length: Rank answers with the same number of words by their total
+        number of letters, shortest first
+        :type by_length: bool
+        :raise ValueError: if max_num_words or minimum_answers is less than or equal to zero.
+        :return: A list filled with answer tuples
+        :rtype: Sequence[tuple]
+        """
+        if max_num_words <= 0:
+            raise ValueError("max_num_words must be greater than zero")
+
+        if minimum_answers <= 0:
+            raise ValueError("minimum_answers must be greater than zero")
+
+        skip_list = list(skip_word.strip() for skip_word in skip.lower().split(","))
+        bitmask_engine = self.bitmask_engine()
+        return bitmask_engine.optimal_search(
+            max_num_words, minimum_answers, skip_list, by_length=by_length
+        )
+
+    def solve_top_k(
+        self,
+        frequencies: Optional[Union[Mapping[str, int], str, os.PathLike]] = None,
+        k: int = 5,
+        max_num_words: int = 3,
+        skip: str = "",
+    ) -> Sequence[tuple]:
+        """Solve the puzzle returning the k most natural answers, those whose words
+        are the most frequent. Unlike :meth:`solve`, words may be shared between
+        answers.
+
+        :param frequencies: The count of each word, or the path of a frequency list,
+        see :mod:`lbsolver.frequency`. Defaults to :attr:`frequencies`, and is kept
+        there for the next calls when it is given.
+        :type frequencies: Mapping[str, int] or str or os.PathLike
+        :param k: The number of answers to retrieve
+        :type k: int
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: A list of words separated by commas. Words in this list will be skipped
+        from answers
+        :type skip: str
+        :raise ValueError: if max_num_words or k is less than or equal to zero, or
+        no frequencies were given
+        :return: A list filled with answer tuples, most natural first
+        :rtype: Sequence[tuple]
+        """
+        if max_num_words <= 0:
+            raise ValueError("max_num_words must be greater than zero")
+
+        if k <= 0:
+            raise ValueError("k must be greater than zero")
+
+        if isinstance(frequencies, (str, os.PathLike)):
+            frequencies = os.fspath(frequencies)
+            if frequencies != self.__frequency_source:
+                self.frequencies = frequencies
+        elif frequencies is not None and frequencies is not self.__frequency_source:
+            self.frequencies = frequencies
+        if self.__frequencies is None:
+            raise ValueError("no frequencies were given")
+
+        skip_list = list(skip_word.strip() for skip_word in skip.lower().split(","))
+        bitmask_engine = self.bitmask_engine()
+        costs = self.__costs(bitmask_engine)
+        return bitmask_engine.top_k_search(costs, k, max_num_words, skip_list)
+
+    def hints(
+        self,
+        played: Union[str, Sequence[str]],
+        max_num_words: int = 2,
+        minimum_answers: int = 5,
+    ) -> Sequence[tuple]:
+        """Complete a partially played game. The search starts from the letters the
+        played words cover and the last letter of the last played word. The
+        :class:`lbsolver.hints.HintIndex` of the gameboard is kept between calls, so
+        repeated hints for the same board are fast.
+
+        :param played: The words played so far, in order, or a list of words
+        separated by commas
+        :type played: str or Sequence[str]
+        :param max_num_words: The maximum number of words to add
+        :type max_num_words: int
+        :param minimum_answers: The number of completions to retrieve
+        :type minimum_answers: int
+        :raise ValueError: if max_num_words or minimum_answers is less than or equal
+        to zero, or the played words are not a valid chain on the board
+        :return: A list filled with tuples of the words to add, fewest words first
+        :rtype: Sequence[tuple]
+        """
+        if max_num_words <= 0:
+            raise ValueError("max_num_words must be greater than zero")
+
+        if minimum_answers <= 0:
+            raise ValueError("minimum_answers must be greater than zero")
+
+        if isinstance(played, str):
+            played = played.split(",")
+        played = [word.strip().lower() for word in played if word.strip()]
+        playable = set(self.gameboard.possible_words(played))
+        for word in played:
+            if word not in playable:
+                raise ValueError(
+                    f"Word: {word} cannot be played on gameboard: "
+                    f"{''.join(self.gameboard.board)}"
+                )
+
+        key = self.gameboard.canonical_key
+        if self.__hint_index is None or self.__hint_index[0] != key:
+            self.__hint_index = (key, HintIndex(self.bitmask_engine()))
+        return self.__hint_index[1].hints(played, max_num_words, minimum_answers)
+
+    def enumerate_solutions(
+        self, max_num_words: int = 3, skip: str = ""
+    ) -> Iterator[Tuple[str, ...]]:
+        """Yield every answer of up to max_num_words words, fewest words first. An
+        answer is a chain of different words where only the last word completes the
+        board. Unlike :meth:`solve`, words may be shared between answers.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: A list of words separated by commas. Words in this list will be skipped
+        from answers
+        :type skip: str
+        :raise ValueError: if max_num_words is less than or equal to zero.
+        :return: An iterator of answer tuples
+        :rtype: Iterator[Tuple[str, ...]]
+        """
+        if max_num_words <= 0:
+            raise ValueError("max_num_words must be greater than zero")
+
+        skip_list = list(skip_word.strip() for skip_word in skip.lower().split(","))
+        return self.bitmask_engine().iter_all(max_num_words, skip_list)
 
+    def count_solutions(self, max_num_words: int = 3, skip: str = "") -> Dict[int, int]:
+        """Count the answers :meth:`enumerate_solutions` would yield without building
+        them.
 
-def main():  # pragma: no cover
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: A list of words separated by commas. Words in this list will be skipped
+        from answers
+        :type skip: str
+        :raise ValueError: if max_num_words is less than or equal to zero.
+        :return: The number of answers for each number of words
+        :rtype: Dict[int, int]
+        """
+        if max_num_words <= 0:
+            raise ValueError("max_num_words must be greater than zero")
+
+        skip_list = list(skip_word.strip() for skip_word in skip.lower().split(","))
+        return self.bitmask_engine().count_solutions(max_num_words, skip_list)
+
+    def iter_solutions(
+        self, max_num_words: int = 3, skip: str = ""
+    ) -> Iterator[Tuple[str, ...]]:
+        """Yield answers one at a time as the search finds them, in the same order
+        as :meth:`solve`. The search only runs while answers are requested, so the
+        caller can stop at any time. With ``collect_stats`` set, :attr:`stats` is
+        updated as answers are produced.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: A list of words separated by commas. Words in this list will be skipped
+        from answers
+        :type skip: str
+        :raise ValueError: if max_num_words is less than or equal to zero.
+        :return: An iterator of answer tuples
+        :rtype: Iterator[Tuple[str, ...]]
+        """
+        if max_num_words <= 0:
+            raise ValueError("max_num_words must be greater than zero")
+
+        skip_list = list(skip_word.strip() for skip_word in skip.lower().split(","))
+        if not self.collect_stats:
+            self.__stats = None
+            return self.bitmask_engine().iter_search(max_num_words, skip_list)
+
+        stats = self.__stats = SearchStats()
+        start = time.perf_counter()
+        ordered_words = self.__board_words()
+        stats.filter_seconds = time.perf_counter() - start
+        stats.valid_words = len(ordered_words)
+        start = time.perf_counter()
+        bitmask_engine = BitmaskEngine(self.gameboard.board, ordered_words)
+        stats.rank_seconds = time.perf_counter() - start
+        return bitmask_engine.iter_search(max_num_words, skip_list, stats=stats)
+
+    async def aiter_solutions(
+        self, max_num_words: int = 3, skip: str = ""
+    ) -> AsyncIterator[Tuple[str, ...]]:
+        """Asynchronous version of :meth:`iter_solutions` for use in an asyncio
+        server. Each step of the search runs in the event loop's default executor,
+        so the event loop is never blocked.
+
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param skip: A list of words separated by commas. Words in this list will be skipped
+        from answers
+        :type skip: str
+        :raise ValueError: if max_num_words is less than or equal to zero.
+        :return: An asynchronous iterator of answer tuples
+        :rtype: AsyncIterator[Tuple[str, ...]]
+        """
+        loop = asyncio.get_running_loop()
+        answers = await loop.run_in_executor(
+            None, self.iter_solutions, max_num_words, skip
+        )
+        while True:
+            answer = await loop.run_in_executor(None, next, answers, None)
+            if answer is None:
+                return
+            yield answer
+
+    @classmethod
+    def solve_many(
+        cls,
+        boards: Iterable[Union[str, Gameboard]],
+        dictionary: Union[Iterable[str], str, os.PathLike],
+        max_num_words: int = 3,
+        minimum_answers: int = 1,
+        skip: str = "",
+        engine: str = "bitmask",
+        workers: int = 1,
+        cache: Optional[ResultCache] = None,
+        on_error: Optional[Callable[[Union[str, Gameboard], ValueError], None]] = None,
+    ) -> Iterator[Tuple[Gameboard, Sequence[tuple]]]:
+        """Solve many boards against one dictionary. Unless it is a
+        :class:`lbsolver.trie.WordTrie`, a :class:`lbsolver.batchfilter.BoardFilter`
+        or a :class:`lbsolver.layers.LayeredDictionary`, the dictionary is normalized
+        into a
+        :class:`lbsolver.wordindex.WordIndex` once and shared by every board.
+        Results are yielded as each board is solved.
+
+        :param boards: Gameboards or strings accepted by :class:`lbsolver.Gameboard`
+        :type boards: Iterable[str or :class:`lbsolver.Gameboard`]
+        :param dictionary: A backing dictionary to use to find potential answers, or
+        its path
+        :type dictionary: Iterable[str] or str or os.PathLike
+        :param max_num_words: The maximum number of words allowed in an answer
+        :type max_num_words: int
+        :param minimum_answers: The minimum number of answers to retrieve per board
+        :type minimum_answers: int
+        :param skip: A list of words separated by commas. Words in this list will be skipped
+        from answers
+        :type skip: str
+        :param engine: The search engine to use, see :meth:`solve`
+        :type engine: str
+        :param workers: The number of processes solving boards. With more than one
+        worker boards are solved on a process pool, see
+        :func:`lbsolver.parallel.solve_many_parallel`. Results keep the order of boards.
+        :type workers: int
+        :param cache: A cache of solve results shared by every board. Defaults to an
+        in-memory cache of the most recent boards, so repeated boards and boards
+        equivalent to an earlier one are solved once.
+        :type cache: :class:`lbsolver.cache.ResultCache`
+        :param on_error: Called with an invalid board and its error instead of
+        raising. The boards after it are still solved.
+        :type on_error: Callable[[str or :class:`lbsolver.Gameboard`, ValueError], None]
+        :raise ValueError: If a board is invalid and on_error is not given, or the
+        solve parameters are invalid
+        :raise TypeError: If dictionary is set to None
+        :return: An iterator of gameboards paired with their answers
+        :rtype: Iterator[Tuple[:class:`lbsolver.Gameboard`, Sequence[tuple]]]
+        """
+        if dictionary is None:
+            raise TypeError("Dictionary was set to None.")
+
+        if workers <= 0:
+            raise ValueError("workers must be greater than zero")
+
+        if isinstance(dictionary, (str, os.PathLike)):
+            dictionary = open_dictionary(dictionary)
+        if not isinstance(
+            dictionary, (WordIndex, WordTrie, BoardFilter, LayeredDictionary)
+        ):
+            dictionary = WordIndex.from_words(dictionary)
+
+        if cache is None:
+            cache = ResultCache(maxsize=BATCH_CACHE_SIZE)
+
+        if workers > 1:
+            yield from parallel.solve_many_parallel(
+                boards,
+                dictionary,
+                max_num_words,
+                minimum_answers,
+                skip,
+                engine=engine,
+                workers=workers,
+                cache=cache,
+                on_error=on_error,
+            )
+            return
+
+        for board in boards:
+            try:
+                gameboard = board if isinstance(board, Gameboard) else Gameboard(board)
+            except ValueError as exc:
+                if on_error is None:
+                    raise
+                on_error(board, exc)
+                continue
+            solver = cls(gameboard, dictionary, cache=cache)
+            yield gameboard, solver.solve(
+                max_num_words, minimum_answers, skip, engine=engine
+            )
+
+
+COMMANDS = {
+    "bench": bench.main,
+    "compile": wordindex.main,
+    "generate": generator.main,
+    "serve": server.main,
+}
+
+
+class LayerAction(argparse.Action):
+    """Collect dictionary layers in the order they are given on the command line"""
+
+    OPERATIONS = {
+        "union": "union",
+        "intersect": "intersection",
+        "blocklist": "exclusion",
+    }
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        layers = getattr(namespace, "layers", None) or []
+        layers.append((self.OPERATIONS[self.dest], values))
+        namespace.layers = layers
+
+
+def board_name(gameboard: Gameboard) -> str:
+    """Get the name of a board in output. Boards with sides of three letters are
+    written as their letters, other boards as their layout.
+
+    :param gameboard: The board
+    :type gameboard: :class:`lbsolver.Gameboard`
+    :return: A string that :class:`lbsolver.Gameboard` reads back as the same board
+    :rtype: str
+    """
+    if gameboard.side_length == 3:
+        return "".join(gameboard.board)
+    return gameboard.layout
+
+
+def print_stats(stats: SearchStats, output: TextIO):  # pragma: no cover
+    """Print search statistics in a human readable format"""
+    pruned = ", ".join(f"{reason} {total}" for reason, total in stats.pruned.items())
+    print(
+        f"Valid words: {stats.valid_words}\n"
+        f"Filter: {stats.filter_seconds * 1000:.1f} ms, "
+        f"rank: {stats.rank_seconds * 1000:.1f} ms, "
+        f"search: {stats.search_seconds * 1000:.1f} ms\n"
+        f"Nodes: {stats.nodes}, answers: {stats.answers}"
+        f"{' (cached)' if stats.cached else ''}\n"
+        f"Pruned: {pruned}",
+        file=output,
+    )
+
+
+def main(argv: Optional[List[str]] = None):  # pragma: no cover
     """Main function"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         prog="lbsolver",
         description="Generate solutions to the NYT Letter-Boxed puzzle",
+        epilog="Run 'lbsolver compile -h' to build a dictionary index and "
+        "'lbsolver serve -h' to run a solver service. 'lbsolver bench -h' times "
+        "the solver and 'lbsolver generate -h' generates boards.",
     )
     parser.add_argument(
         "board",
-        help="A string representing the board in format 'abcdefghijkl' or 'abc:def:ghi:jkl' where each group of 3 letters represents a side. ",
+        help="A string representing the board in format 'abcdefghijkl' or 'abc:def:ghi:jkl' where each group of 3 letters represents a side. Larger boards separate their sides with ':', e.g. 'abcd:efgh:ijkl:mnop'. ",
         nargs="?",
         default="giyercpolahx",
         type=str,
@@ -322,12 +1146,34 @@ def main():  # pragma: no cover
         "-d",
         "--dictionary",
         metavar="dictionary",
-        help="The path to a dictionary for the puzzle to select words from."
-        "Should be a text file.",
-        type=argparse.FileType("r"),
+        help="The path to a dictionary for the puzzle to select words from. "
+        "Should be a text file, optionally gzip or bzip2 compressed, or an index "
+        "or trie built with 'lbsolver compile'.",
+        type=str,
         default="/usr/share/dict/words",
     )
 
+    parser.add_argument(
+        "--union",
+        metavar="FILE",
+        help="Also use the words of another words file",
+        action=LayerAction,
+    )
+
+    parser.add_argument(
+        "--intersect",
+        metavar="FILE",
+        help="Only use the words also in another words file, e.g. common words",
+        action=LayerAction,
+    )
+
+    parser.add_argument(
+        "--blocklist",
+        metavar="FILE",
+        help="Never use the words of a words file. Layers apply in the order given.",
+        action=LayerAction,
+    )
+
     parser.add_argument(
         "-a",
         "--answer-size",
@@ -355,6 +1201,98 @@ def main():  # pragma: no cover
         default="",
     )
 
+    parser.add_argument(
+        "--optimal",
+        help="Return the answers with the fewest words first",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--by-length",
+        help="With --optimal, rank answers with the same number of words by total letters",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--frequencies",
+        metavar="FILE",
+        help="A list of words and their counts. Return the total-answers answers "
+        "made of the most frequent words.",
+        type=str,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--played",
+        metavar="WORDS",
+        help="A comma separated list of the words played so far. Print the words "
+        "that complete the game, with up to answer-size words.",
+        type=str,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--all",
+        help="Print every answer with up to answer-size words, fewest words first",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--count",
+        help="Print the number of answers for each number of words",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--stats",
+        help="Print search timings and counters to standard error",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        metavar="SECONDS",
+        help="Stop searching after this many seconds and print the answers found",
+        type=float,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--max-nodes",
+        metavar="N",
+        help="Stop searching after entering N words and print the answers found",
+        type=int,
+        default=None,
+    )
+
+    parser.add_argument(
+        "-b",
+        "--boards",
+        metavar="FILE",
+        help="A file with one board per line to solve in a batch. Use '-' for "
+        "standard input. The board argument is ignored when this is set.",
+        type=argparse.FileType("r"),
+        default=None,
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        metavar="N",
+        help="The number of worker processes. Batches solve boards in parallel, "
+        "a single board splits its first words across workers.",
+        type=int,
+        default=1,
+    )
+
+    parser.add_argument(
+        "--cache",
+        metavar="FILE",
+        help="A SQLite file caching answers between runs",
+        type=str,
+        default=None,
+    )
+
     parser.add_argument(
         "-o",
         "--output",
@@ -364,24 +1302,170 @@ def main():  # pragma: no cover
         default=sys.stdout,
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "-f",
+        "--format",
+        help="The output format. ndjson, csv and binary stream each answer and "
+        "the solve time and answer count of each board for other programs.",
+        choices=writers.FORMATS,
+        default="text",
+    )
+
+    parser.set_defaults(layers=[])
+    args = parser.parse_args(argv)
+    single_board_modes = [
+        name
+        for name in ("optimal", "frequencies", "played", "all", "count")
+        if getattr(args, name)
+    ]
+    if len(single_board_modes) > 1:
+        parser.error(
+            "--optimal, --frequencies, --played, --all and --count cannot be used "
+            "together"
+        )
+    if single_board_modes and args.boards:
+        parser.error(
+            f"--{single_board_modes[0]} solves a single board and cannot be used "
+            "with --boards"
+        )
+    if args.count and args.format != "text":
+        parser.error("--count prints counts and only supports the text format")
+    if args.stats and (single_board_modes or args.boards):
+        parser.error("--stats reports on the search of a single board")
+    bounded = args.timeout is not None or args.max_nodes is not None
+    if bounded and (single_board_modes or args.boards or args.workers > 1):
+        parser.error(
+            "--timeout and --max-nodes bound the search of a single board with "
+            "one worker"
+        )
+
+    try:
+        dictionary_words = open_dictionary(args.dictionary)
+        if args.layers:
+            dictionary_words = LayeredDictionary(dictionary_words, args.layers)
+    except OSError as exc:
+        parser.error(f"can't open '{exc.filename or args.dictionary}': {exc}")
+
+    frequencies = None
+    if args.frequencies:
+        try:
+            frequencies = load_frequencies(args.frequencies)
+        except OSError as exc:
+            parser.error(f"can't open '{args.frequencies}': {exc}")
+
+    cache = None
+    if args.cache:
+        try:
+            cache = ResultCache(path=args.cache)
+        except sqlite3.Error as exc:
+            parser.error(f"can't open cache '{args.cache}': {exc}")
 
     try:
+        writer = writers.open_writer(args.format, args.output, bool(args.boards))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    try:
+        if args.boards:
+            boards = (line.strip() for line in args.boards if line.strip())
+            invalid = []
+
+            def report(board: str, exc: ValueError) -> None:
+                invalid.append(board)
+                print(
+                    f"LBSolver: error: skipping board {board}: {exc}", file=sys.stderr
+                )
+
+            start = time.perf_counter()
+            for gameboard, answers in LBSolver.solve_many(
+                boards,
+                dictionary_words,
+                max_num_words=args.answer_size,
+                minimum_answers=args.total_answers,
+                skip=args.skip,
+                workers=args.workers,
+                cache=cache,
+                on_error=report,
+            ):
+                writer.write_board(
+                    board_name(gameboard), answers, time.perf_counter() - start
+                )
+                start = time.perf_counter()
+            args.output.close()
+            if invalid:
+                sys.exit(1)
+            return
+
         myboard = Gameboard(args.board)
-        dictionary_words = args.dictionary.readlines()
-        solver = LBSolver(myboard, dictionary_words)
-        final_answers = solver.solve(
-            max_num_words=args.answer_size,
-            minimum_answers=args.total_answers,
-            skip=args.skip,
+        solver = LBSolver(
+            myboard,
+            dictionary_words,
+            cache=cache,
+            collect_stats=args.stats,
+            frequencies=frequencies,
         )
+        if args.count:
+            counts = solver.count_solutions(
+                max_num_words=args.answer_size, skip=args.skip
+            )
+            for num_words, total in counts.items():
+                print(f"{num_words}-word answers: {total}", file=args.output)
+            args.output.close()
+            return
+        start = time.perf_counter()
+        if args.all:
+            final_answers = solver.enumerate_solutions(
+                max_num_words=args.answer_size, skip=args.skip
+            )
+        elif args.optimal:
+            final_answers = solver.solve_optimal(
+                max_num_words=args.answer_size,
+                minimum_answers=args.total_answers,
+                skip=args.skip,
+                by_length=args.by_length,
+            )
+        elif args.frequencies:
+            final_answers = solver.solve_top_k(
+                k=args.total_answers,
+                max_num_words=args.answer_size,
+                skip=args.skip,
+            )
+        elif args.played is not None:
+            final_answers = solver.hints(
+                args.played,
+                max_num_words=args.answer_size,
+                minimum_answers=args.total_answers,
+            )
+        elif args.workers == 1 and cache is None and not bounded:
+            if args.total_answers <= 0:
+                raise ValueError("minimum_answers must be greater than zero")
+            final_answers = islice(
+                solver.iter_solutions(max_num_words=args.answer_size, skip=args.skip),
+                args.total_answers,
+            )
+        else:
+            final_answers = solver.solve(
+                max_num_words=args.answer_size,
+                minimum_answers=args.total_answers,
+                skip=args.skip,
+                workers=args.workers,
+                timeout=args.timeout,
+                max_nodes=args.max_nodes,
+            )
     except ValueError as exc1:
         parser.print_usage(sys.stderr)
         if "Board must" in str(exc1):
             print(
-                "LBSolver: error: board is not valid. It must be only 12 unique alphabetic characters.",
+                "LBSolver: error: board is not valid. It must be two or more sides of"
+                " the same number of unique alphabetic characters.",
                 file=sys.stderr,
             )
+        elif str(exc1).startswith("Word:"):
+            print(f"LBSolver: error: {exc1}", file=sys.stderr)
+        elif "workers" in str(exc1):
+            print(
+                "LBSolver: error: workers must be greater than zero.", file=sys.stderr
+            )
         else:
             print(
                 f"LBSolver: error: {'answer_size' if 'minimum_answers' in str(exc1) else 'total_answers'}"
@@ -391,15 +1475,20 @@ def main():  # pragma: no cover
         args.output.close()
         sys.exit(1)
 
-    if final_answers:
-        for a_id, answer in enumerate(final_answers, start=1):
-            print(f"Answer {a_id:>2}: {'---'.join(answer)}", file=args.output)
-    else:
+    writer.write_board(
+        board_name(myboard),
+        final_answers,
+        time.perf_counter() - start,
+        solver.complete,
+    )
+    args.output.close()
+    if not solver.complete:
         print(
-            "No answers for given board and dictionary for requested answer size",
-            file=args.output,
+            "LBSolver: the search was stopped early, answers may be missing",
+            file=sys.stderr,
         )
-    args.output.close()
+    if solver.stats is not None:
+        print_stats(solver.stats, sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,299 @@
+"""The parallel module provides process pool versions of the solver.
+
+Answers are the same as the sequential solver's, whatever the number of workers.
+
+For a single board, workers take the first words of the ranking in slices. For each
+first word they list its answers in the order the sequential search visits them,
+without blocking the words of an answer, see
+:meth:`lbsolver.engine.BitmaskEngine.iter_root_answers`. The lists are merged in
+ranking order by replaying the blocking of the sequential search over them, so the
+answers are exactly the sequential ones without searching again. A list is cut at
+:data:`ROOT_ANSWERS` answers. A first word whose cut list runs out before the merge
+has enough answers is searched again in the calling process.
+"""
+import multiprocessing
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Deque, List, Optional, Tuple, Union
+
+from lbsolver.cache import ResultCache, dictionary_fingerprint, result_key
+from lbsolver.engine import BitmaskEngine
+from lbsolver.wordindex import WordIndex
+
+if TYPE_CHECKING:  # pragma: no cover
+    from lbsolver.lbsolver import Gameboard
+
+ROOT_ANSWERS = 4096
+
+_ENGINE: Optional[BitmaskEngine] = None
+_INDEX: Optional[WordIndex] = None
+_STOP = None
+
+
+def _init_worker(engine, index, stop) -> None:  # pragma: no cover
+    global _ENGINE, _INDEX, _STOP
+    _ENGINE, _INDEX, _STOP = engine, index, stop
+
+
+def _list_roots(
+    roots: List[int], max_num_words: int, skip: List[str], limit: int
+) -> List[List[Tuple[int, ...]]]:  # pragma: no cover
+    results = []
+    for root in roots:
+        if _STOP.is_set():
+            break
+        answers = _ENGINE.iter_root_answers(root, max_num_words, skip)
+        results.append(list(islice(answers, limit + 1)))
+    return results
+
+
+def _replay(
+    answers: List[Tuple[int, ...]], blocked: bytearray, needed: int
+) -> List[Tuple[int, ...]]:
+    """Keep the answers of a first word that the sequential search finds. The
+    search enters each word of a path once, in the order of the answers, and skips
+    every answer below a word that was blocked when it was entered. ``blocked`` is
+    updated with the words of the answers kept."""
+    kept: List[Tuple[int, ...]] = []
+    path: Tuple[int, ...] = ()
+    pruned: Optional[Tuple[int, ...]] = None
+    for answer in answers:
+        prefix = answer[:-1]
+        if pruned is not None and prefix[: len(pruned)] == pruned:
+            continue
+        pruned = None
+        common = 0
+        while common < min(len(path), len(prefix)) and path[common] == prefix[common]:
+            common += 1
+        for depth in range(common, len(prefix)):
+            if blocked[prefix[depth]]:
+                pruned = prefix[: depth + 1]
+                break
+        if pruned is not None:
+            path = pruned[:-1]
+            continue
+        path = prefix
+        if not blocked[answer[-1]]:
+            kept.append(answer)
+            for word_id in answer:
+                blocked[word_id] = 1
+            if len(kept) >= needed:
+                break
+    return kept
+
+
+def _merge_root(
+    engine: BitmaskEngine,
+    root: int,
+    answers: List[Tuple[int, ...]],
+    blocked: bytearray,
+    max_num_words: int,
+    needed: int,
+) -> List[Tuple[str, ...]]:
+    """Get the answers of a first word from its listed answers, see :func:`_replay`.
+    A list cut at :data:`ROOT_ANSWERS` that runs out first is searched again."""
+    words = engine.words
+    if len(answers) <= ROOT_ANSWERS:
+        kept = _replay(answers, blocked, needed)
+    else:
+        trial = bytearray(blocked)
+        kept = _replay(answers[:ROOT_ANSWERS], trial, needed)
+        if len(kept) < needed:
+            skip = [word for word, used in zip(words, blocked) if used]
+            found = engine.search(max_num_words, needed, skip, roots=[root])
+            for answer in found:
+                for word in answer:
+                    blocked[engine.ids[word]] = 1
+            return found
+        blocked[:] = trial
+    return [tuple(words[word_id] for word_id in answer) for answer in kept]
+
+
+def _solve_board(
+    board: str, max_num_words: int, minimum_answers: int, skip: str, engine: str
+) -> List[tuple]:  # pragma: no cover
+    from lbsolver.lbsolver import Gameboard, LBSolver
+
+    solver = LBSolver(Gameboard(board), _INDEX)
+    return list(solver.solve(max_num_words, minimum_answers, skip, engine=engine))
+
+
+def _pool(workers: int, engine=None, index=None) -> Tuple[ProcessPoolExecutor, object]:
+    context = multiprocessing.get_context()
+    stop = context.Event()
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(engine, index, stop),
+    )
+    return pool, stop
+
+
+def search_parallel(
+    engine: BitmaskEngine,
+    max_num_words: int = 3,
+    minimum_answers: int = 1,
+    skip: Iterable[str] = (),
+    workers: int = 2,
+    chunk_size: Optional[int] = None,
+) -> List[Tuple[str, ...]]:
+    """Run :meth:`lbsolver.engine.BitmaskEngine.search` with the first words split
+    across a process pool.
+
+    Once ``minimum_answers`` answers are merged, queued slices are cancelled and
+    running workers stop at their next first word.
+
+    :param engine: The engine for the board
+    :type engine: :class:`lbsolver.engine.BitmaskEngine`
+    :param max_num_words: The maximum number of words allowed in an answer
+    :type max_num_words: int
+    :param minimum_answers: Stop after finding this number of answers
+    :type minimum_answers: int
+    :param skip: Words that can never be part of an answer
+    :type skip: Iterable[str]
+    :param workers: The number of worker processes
+    :type workers: int
+    :param chunk_size: The number of first words per task. Defaults to a size that
+        gives each worker several tasks.
+    :type chunk_size: int
+    :return: A list filled with answer tuples
+    :rtype: List[Tuple[str, ...]]
+    """
+    skip = list(skip)
+    order = engine.order
+    if chunk_size is None:
+        chunk_size = max(1, len(order) // (workers * 8))
+    chunks = [
+        order[start : start + chunk_size] for start in range(0, len(order), chunk_size)
+    ]
+
+    answers: List[Tuple[str, ...]] = []
+    blocked = engine.blocked(skip)
+    pool, stop = _pool(workers, engine=engine)
+    try:
+        futures = [
+            pool.submit(_list_roots, chunk, max_num_words, skip, ROOT_ANSWERS)
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            if len(answers) >= minimum_answers:
+                break
+            for root, root_answers in zip(chunk, future.result()):
+                if len(answers) >= minimum_answers:
+                    break
+                if not root_answers:
+                    continue
+                needed = minimum_answers - len(answers)
+                answers.extend(
+                    _merge_root(
+                        engine, root, root_answers, blocked, max_num_words, needed
+                    )
+                )
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+    return answers
+
+
+def solve_many_parallel(
+    boards: Iterable[Union[str, "Gameboard"]],
+    dictionary: WordIndex,
+    max_num_words: int = 3,
+    minimum_answers: int = 1,
+    skip: str = "",
+    engine: str = "bitmask",
+    workers: int = 2,
+    cache: Optional[ResultCache] = None,
+    on_error: Optional[Callable[[Union[str, "Gameboard"], ValueError], None]] = None,
+) -> Iterator[Tuple["Gameboard", Sequence[tuple]]]:
+    """Solve boards on a process pool, yielding results in the order of the boards.
+
+    At most two boards per worker are queued at a time, so boards can be read from
+    a stream.
+
+    :param boards: Gameboards or strings accepted by :class:`lbsolver.Gameboard`
+    :type boards: Iterable[str or :class:`lbsolver.Gameboard`]
+    :param dictionary: The dictionary shared by every worker
+    :type dictionary: :class:`lbsolver.wordindex.WordIndex`
+    :param max_num_words: The maximum number of words allowed in an answer
+    :type max_num_words: int
+    :param minimum_answers: The minimum number of answers to retrieve per board
+    :type minimum_answers: int
+    :param skip: A list of words separated by commas to skip from answers
+    :type skip: str
+    :param engine: The search engine to use, see :meth:`lbsolver.LBSolver.solve`
+    :type engine: str
+    :param workers: The number of worker processes
+    :type workers: int
+    :param cache: A cache of solve results. Cached boards are not sent to the pool.
+    :type cache: :class:`lbsolver.cache.ResultCache`
+    :param on_error: Called with an invalid board and its error, in the order of the
+        boards, instead of raising. The boards after it are still solved.
+    :type on_error: Callable[[str or :class:`lbsolver.Gameboard`, ValueError], None]
+    :raise ValueError: If a board is invalid and on_error is not given, or the solve
+        parameters are invalid
+    :return: An iterator of gameboards paired with their answers
+    :rtype: Iterator[Tuple[:class:`lbsolver.Gameboard`, Sequence[tuple]]]
+    """
+    from lbsolver.lbsolver import Gameboard
+
+    pending: Deque[
+        Tuple[
+            Union[str, "Gameboard"],
+            Union["Gameboard", ValueError],
+            Optional[Future],
+            bool,
+        ]
+    ] = deque()
+
+    skip_list = [skip_word.strip() for skip_word in skip.lower().split(",")]
+    fingerprint = dictionary_fingerprint(dictionary) if cache is not None else ""
+
+    def cache_key(gameboard: "Gameboard") -> str:
+        return result_key(
+            gameboard.layout, fingerprint, max_num_words, minimum_answers, skip_list
+        )
+
+    def results(keep: int):
+        while len(pending) > keep:
+            board, gameboard, future, cached = pending.popleft()
+            if isinstance(gameboard, ValueError):
+                if on_error is None:
+                    raise gameboard
+                on_error(board, gameboard)
+                continue
+            answers = future.result()
+            if cache is not None and not cached:
+                cache.put(cache_key(gameboard), answers)
+            yield gameboard, answers
+
+    pool, stop = _pool(workers, index=dictionary)
+    try:
+        for board in boards:
+            try:
+                gameboard = board if isinstance(board, Gameboard) else Gameboard(board)
+            except ValueError as exc:
+                pending.append((board, exc, None, False))
+            else:
+                cached = cache.get(cache_key(gameboard)) if cache is not None else None
+                if cached is not None:
+                    future = Future()
+                    future.set_result(cached)
+                else:
+                    future = pool.submit(
+                        _solve_board,
+                        gameboard.layout,
+                        max_num_words,
+                        minimum_answers,
+                        skip,
+                        engine,
+                    )
+                pending.append((board, gameboard, future, cached is not None))
+            yield from results(workers * 2 - 1)
+        yield from results(0)
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
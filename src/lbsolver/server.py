@@ -0,0 +1,569 @@
+"""The server module provides ``lbsolver serve``, a long running solver service.
+
+Dictionaries are compiled into :class:`lbsolver.wordindex.WordIndex` objects once
+at startup and kept in memory, so a request only pays for the search. Requests are
+JSON over HTTP, on a TCP port or a Unix socket:
+
+``POST /solve``
+    Solve a board. The body is an object with a ``board`` and optionally
+    ``max_num_words``, ``minimum_answers``, ``skip``, ``dictionary``, ``mode``
+    (``solve``, ``optimal`` or ``count``) and ``timeout_ms``, a time limit for the
+    ``solve`` mode. Solve responses say whether the search was ``complete``.
+``GET /stats``
+    Request counts, latency percentiles and cache counters.
+``GET /health``
+    Returns ``{"status": "ok"}``.
+
+Searches run on a worker pool, either a thread in the server process or a pool of
+processes that each hold the dictionaries. On the thread, a request whose task is
+cancelled, e.g. when the server shuts down, or whose connection is lost before the
+answer is sent, e.g. reset by the client, cancels its search. A client that only
+shuts down its writing side after the request still gets the answer.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+from lbsolver.cache import ResultCache, result_key
+from lbsolver.engine import CancellationToken
+from lbsolver.trie import WordTrie
+from lbsolver.wordindex import WordIndex, open_dictionary
+
+MODES = ("solve", "optimal", "count")
+DEFAULT_DICTIONARY = "default"
+MAX_BODY_SIZE = 1024 * 1024
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+_DICTIONARIES: Dict[str, WordIndex] = {}
+
+
+def _init_worker(dictionaries: Dict[str, WordIndex]) -> None:  # pragma: no cover
+    global _DICTIONARIES
+    _DICTIONARIES = dictionaries
+
+
+def _solve_in_worker(request: dict) -> dict:  # pragma: no cover
+    return solve_request(_DICTIONARIES, request)
+
+
+def parse_request(request: dict, dictionaries: Dict[str, WordIndex]) -> dict:
+    """Check a solve request and fill in the defaults.
+
+    :param request: The decoded JSON body of a solve request
+    :type request: dict
+    :param dictionaries: The dictionaries served, by name
+    :type dictionaries: Dict[str, :class:`lbsolver.wordindex.WordIndex`]
+    :raise ValueError: If the request is not valid
+    :return: The request with every field set
+    :rtype: dict
+    """
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    defaults = {
+        "max_num_words": 3,
+        "minimum_answers": 1,
+        "skip": "",
+        "dictionary": DEFAULT_DICTIONARY,
+        "mode": "solve",
+        "timeout_ms": None,
+    }
+    unknown = set(request) - set(defaults) - {"board"}
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+    parsed = {**defaults, **request}
+    if not isinstance(parsed.get("board"), str):
+        raise ValueError("board must be a string")
+    for field in ("max_num_words", "minimum_answers"):
+        if not isinstance(parsed[field], int) or isinstance(parsed[field], bool):
+            raise ValueError(f"{field} must be an integer")
+    timeout_ms = parsed["timeout_ms"]
+    if timeout_ms is not None and (
+        not isinstance(timeout_ms, (int, float))
+        or isinstance(timeout_ms, bool)
+        or timeout_ms < 0
+    ):
+        raise ValueError("timeout_ms must be a number of milliseconds")
+    if not isinstance(parsed["skip"], str):
+        raise ValueError("skip must be a string of words separated by commas")
+    if parsed["mode"] not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+    if parsed["dictionary"] not in dictionaries:
+        raise ValueError(f"unknown dictionary: {parsed['dictionary']}")
+    return parsed
+
+
+def solve_request(
+    dictionaries: Dict[str, WordIndex],
+    request: dict,
+    cancel: Optional[CancellationToken] = None,
+) -> dict:
+    """Run a parsed solve request.
+
+    :param dictionaries: The dictionaries served, by name
+    :type dictionaries: Dict[str, :class:`lbsolver.wordindex.WordIndex`]
+    :param request: A request returned by :func:`parse_request`
+    :type request: dict
+    :param cancel: A token to stop the search of the ``solve`` mode
+    :type cancel: :class:`lbsolver.engine.CancellationToken`
+    :raise ValueError: If the board or the solve parameters are invalid
+    :return: The response body
+    :rtype: dict
+    """
+    from lbsolver.lbsolver import Gameboard, LBSolver
+
+    solver = LBSolver(Gameboard(request["board"]), dictionaries[request["dictionary"]])
+    max_num_words = request["max_num_words"]
+    if request["mode"] == "count":
+        counts = solver.count_solutions(max_num_words, request["skip"])
+        return {"counts": {str(words): total for words, total in counts.items()}}
+    if request["mode"] == "optimal":
+        answers = solver.solve_optimal(
+            max_num_words, request["minimum_answers"], request["skip"]
+        )
+    else:
+        timeout_ms = request.get("timeout_ms")
+        answers = solver.solve(
+            max_num_words,
+            request["minimum_answers"],
+            request["skip"],
+            timeout=None if timeout_ms is None else timeout_ms / 1000,
+            cancel=cancel,
+        )
+        return {
+            "answers": [list(answer) for answer in answers],
+            "complete": solver.complete,
+        }
+    return {"answers": [list(answer) for answer in answers]}
+
+
+class LatencyStats:
+    """Latencies of the most recent requests.
+
+    :param window: The number of requests kept
+    :type window: int
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        """Constructor method"""
+        self.requests = 0
+        self.errors = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float, error: bool = False) -> None:
+        """Record a finished request.
+
+        :param seconds: The time taken to answer the request
+        :type seconds: float
+        :param error: Whether the request failed
+        :type error: bool
+        """
+        self.requests += 1
+        self.errors += error
+        self._latencies.append(seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Get a latency percentile, by the nearest rank method.
+
+        :param percent: The percentile, from 0 to 100
+        :type percent: float
+        :return: The latency in seconds, or 0.0 before any request
+        :rtype: float
+        """
+        if not self._latencies:
+            return 0.0
+        latencies = sorted(self._latencies)
+        rank = max(1, -(-len(latencies) * percent // 100))
+        return latencies[min(int(rank), len(latencies)) - 1]
+
+    def summary(self) -> dict:
+        """Get the counters and the p50, p90 and p99 latencies in milliseconds.
+
+        :return: A JSON serializable summary
+        :rtype: dict
+        """
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": {
+                f"p{percent}": round(self.percentile(percent) * 1000, 3)
+                for percent in (50, 90, 99)
+            },
+        }
+
+
+class SolverService:
+    """Solves requests against dictionaries kept in memory.
+
+    :param dictionaries: The dictionaries served, by name
+    :type dictionaries: Dict[str, :class:`lbsolver.wordindex.WordIndex`]
+    :param workers: The number of worker processes. With one worker, searches run
+        on a thread of the current process.
+    :type workers: int
+    :param cache: A cache of solve results
+    :type cache: :class:`lbsolver.cache.ResultCache`
+    :raise ValueError: If there are no dictionaries or workers is less than one
+    """
+
+    def __init__(
+        self,
+        dictionaries: Dict[str, WordIndex],
+        workers: int = 1,
+        cache: Optional[ResultCache] = None,
+    ) -> None:
+        """Constructor method"""
+        if not dictionaries:
+            raise ValueError("at least one dictionary is required")
+        if workers <= 0:
+            raise ValueError("workers must be greater than zero")
+
+        self.dictionaries = dictionaries
+        self.cache = cache
+        self.stats = LatencyStats()
+        self._executor: Executor
+        if workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(dictionaries,),
+            )
+            self._run = _solve_in_worker
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            self._run = self._solve_in_thread
+        self._fingerprints = {
+            name: dictionary.fingerprint for name, dictionary in dictionaries.items()
+        }
+
+    def _solve_in_thread(
+        self, request: dict, cancel: Optional[CancellationToken] = None
+    ) -> dict:
+        return solve_request(self.dictionaries, request, cancel)
+
+    async def solve(
+        self, request: dict, connection: Optional["asyncio.Future[None]"] = None
+    ) -> dict:
+        """Solve a request on the worker pool.
+
+        :param request: The decoded JSON body of a solve request
+        :type request: dict
+        :param connection: A future done when the client's connection is lost, e.g.
+            :meth:`asyncio.StreamWriter.wait_closed`. If it is done before the
+            search, the search is cancelled.
+        :type connection: asyncio.Future[None]
+        :raise ValueError: If the request is not valid
+        :raise ConnectionResetError: If the connection was lost
+        :return: The response body
+        :rtype: dict
+        """
+        from lbsolver.lbsolver import Gameboard
+
+        request = parse_request(request, self.dictionaries)
+        key = None
+        if self.cache is not None and request["mode"] == "solve":
+            skip_list = [word.strip() for word in request["skip"].lower().split(",")]
+            key = result_key(
+                Gameboard(request["board"]).layout,
+                self._fingerprints[request["dictionary"]],
+                request["max_num_words"],
+                request["minimum_answers"],
+                skip_list,
+            )
+            answers = self.cache.get(key)
+            if answers is not None:
+                return {
+                    "answers": [list(answer) for answer in answers],
+                    "complete": True,
+                }
+
+        loop = asyncio.get_running_loop()
+        if self._run == self._solve_in_thread:
+            cancel = CancellationToken()
+            future = loop.run_in_executor(self._executor, self._run, request, cancel)
+        else:
+            cancel = None
+            future = loop.run_in_executor(self._executor, self._run, request)
+        try:
+            if connection is not None:
+                await asyncio.wait(
+                    (future, connection), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not future.done():
+                    raise ConnectionResetError("the connection to the client was lost")
+            response = await future
+        except (asyncio.CancelledError, ConnectionResetError):
+            if cancel is not None:
+                cancel.cancel()
+            raise
+        if key is not None and response["complete"]:
+            self.cache.put(key, response["answers"])
+        return response
+
+    def summary(self) -> dict:
+        """Get the service statistics served by ``GET /stats``.
+
+        :return: A JSON serializable summary
+        :rtype: dict
+        """
+        summary = self.stats.summary()
+        summary["dictionaries"] = {
+            name: len(dictionary) for name, dictionary in self.dictionaries.items()
+        }
+        if self.cache is not None:
+            summary["cache"] = {
+                "hits": self.cache.stats.hits,
+                "misses": self.cache.stats.misses,
+            }
+        return summary
+
+    async def handle(
+        self,
+        method: str,
+        path: str,
+        body: bytes,
+        connection: Optional["asyncio.Future[None]"] = None,
+    ) -> Tuple[int, dict]:
+        """Answer a HTTP request.
+
+        :param method: The HTTP method
+        :type method: str
+        :param path: The request path
+        :type path: str
+        :param body: The request body
+        :type body: bytes
+        :param connection: A future done when the client's connection is lost, see
+            :meth:`solve`
+        :type connection: asyncio.Future[None]
+        :raise ConnectionResetError: If the connection was lost
+        :return: The status code and the response body
+        :rtype: Tuple[int, dict]
+        """
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, self.summary()
+        if path != "/solve":
+            return 404, {"error": f"unknown path: {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST to solve a board"}
+
+        start = time.perf_counter()
+        try:
+            response = await self.solve(json.loads(body or b"null"), connection)
+        except ValueError as exc:
+            self.stats.record(time.perf_counter() - start, error=True)
+            return 400, {"error": str(exc)}
+        except ConnectionResetError:
+            self.stats.record(time.perf_counter() - start, error=True)
+            raise
+        except Exception as exc:  # pragma: no cover
+            self.stats.record(time.perf_counter() - start, error=True)
+            return 500, {"error": str(exc)}
+        elapsed = time.perf_counter() - start
+        self.stats.record(elapsed)
+        response["elapsed_ms"] = round(elapsed * 1000, 3)
+        return 200, response
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests on a connection until the client closes it.
+
+        A search is cancelled when the connection is lost, e.g. reset by the client.
+        A client that only shuts down its writing side after its request is still
+        answered.
+
+        :param reader: The connection's reader
+        :type reader: asyncio.StreamReader
+        :param writer: The connection's writer
+        :type writer: asyncio.StreamWriter
+        """
+        connection = asyncio.ensure_future(writer.wait_closed())
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await _respond(writer, 400, {"error": "bad request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    and version == "HTTP/1.1"
+                )
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY_SIZE:
+                    await _respond(writer, 413, {"error": "bad body size"}, False)
+                    break
+                body = await reader.readexactly(length)
+
+                status, response = await self.handle(method, path, body, connection)
+                await _respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            if not connection.done():
+                connection.cancel()
+            elif not connection.cancelled():
+                connection.exception()
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def _respond(
+    writer: asyncio.StreamWriter, status: int, body: dict, keep_alive: bool
+) -> None:
+    payload = json.dumps(body).encode("utf-8")
+    writer.write(
+        (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+        + payload
+    )
+    await writer.drain()
+
+
+async def start_server(
+    service: SolverService,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    unix_path: Optional[str] = None,
+) -> asyncio.AbstractServer:
+    """Start serving a solver service.
+
+    :param service: The service answering requests
+    :type service: :class:`lbsolver.server.SolverService`
+    :param host: The address to listen on
+    :type host: str
+    :param port: The TCP port to listen on. Use 0 to pick a free port.
+    :type port: int
+    :param unix_path: Listen on this Unix socket instead of a TCP port
+    :type unix_path: str
+    :return: The running server
+    :rtype: asyncio.AbstractServer
+    """
+    if unix_path is not None:
+        return await asyncio.start_unix_server(
+            service.handle_connection, path=unix_path
+        )
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+def load_dictionaries(specs: List[str]) -> Dict[str, WordIndex]:
+    """Load the dictionaries named on the command line.
+
+    :param specs: Paths of words files or compiled indexes, optionally prefixed by
+        ``NAME=``. The first dictionary is also served as ``default``.
+    :type specs: List[str]
+    :raise OSError: If a dictionary cannot be read
+    :return: The dictionaries by name
+    :rtype: Dict[str, :class:`lbsolver.wordindex.WordIndex`]
+    """
+    dictionaries: Dict[str, WordIndex] = {}
+    for spec in specs:
+        name, separator, path = spec.partition("=")
+        if not separator:
+            name, path = spec, spec
+        dictionary = open_dictionary(path)
+        if not isinstance(dictionary, (WordIndex, WordTrie)):
+            dictionary = WordIndex.from_words(dictionary)
+        dictionaries.setdefault(DEFAULT_DICTIONARY, dictionary)
+        dictionaries[name] = dictionary
+    return dictionaries
+
+
+def main(argv: Optional[List[str]] = None):  # pragma: no cover
+    """Serve solve requests over HTTP"""
+    parser = argparse.ArgumentParser(
+        prog="lbsolver serve",
+        description="Keep dictionaries in memory and solve boards over HTTP/JSON",
+    )
+    parser.add_argument(
+        "-d",
+        "--dictionary",
+        metavar="[NAME=]PATH",
+        help="A words file or compiled index to serve. Repeat to serve several.",
+        action="append",
+        default=None,
+    )
+    parser.add_argument("--host", help="The address to listen on", default="127.0.0.1")
+    parser.add_argument("--port", help="The port to listen on", type=int, default=8080)
+    parser.add_argument(
+        "--unix", metavar="PATH", help="Listen on a Unix socket instead", default=None
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        metavar="N",
+        help="The number of worker processes",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--cache-size",
+        metavar="N",
+        help="The number of results kept in memory",
+        type=int,
+        default=1024,
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        dictionaries = load_dictionaries(args.dictionary or ["/usr/share/dict/words"])
+    except OSError as exc:
+        parser.error(f"can't open dictionary: {exc}")
+    if args.workers <= 0:
+        parser.error("workers must be greater than zero")
+    if args.cache_size < 0:
+        parser.error("cache size cannot be negative")
+
+    service = SolverService(
+        dictionaries, workers=args.workers, cache=ResultCache(maxsize=args.cache_size)
+    )
+
+    async def serve():
+        server = await start_server(service, args.host, args.port, args.unix)
+        where = args.unix or f"http://{args.host}:{args.port}"
+        print(f"Serving {', '.join(dictionaries)} on {where}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -0,0 +1,268 @@
+"""The trie module provides a letter trie of a dictionary for board guided word
+generation.
+
+Instead of testing every word against a board, the valid words of a board are
+found by walking only the trie edges the board allows: the letter is on the board
+and on a different side than the previous letter. The cost of the walk depends on
+the words the board can reach, not on the size of the dictionary.
+
+Nodes are numbered in breadth first order with the children of a node sorted by
+letter, so the children of a node are a contiguous run of nodes. The file is little
+endian and laid out as::
+
+    header        magic, version, number of nodes, number of words
+    first_child   uint32[number of nodes + 1], first child of each node
+    parent        uint32[number of nodes], parent of each node
+    node_words    uint32[number of nodes], word id ending at each node or 0xFFFFFFFF
+    word_nodes    uint32[number of words], node of each word id
+    letters       uint8[number of nodes], ascii letter on the edge into each node
+"""
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Dict, List, Optional, Union
+
+from lbsolver.wordindex import _u32, normalize_word
+
+MAGIC = b"LBTR"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+NO_WORD = 0xFFFFFFFF
+
+
+class WordTrie(Sequence):
+    """A letter trie of the playable words of a dictionary.
+
+    A word trie is a ``Sequence[str]`` of the normalized words in dictionary order,
+    so it can be passed anywhere a dictionary is expected.
+
+    :param buffer: The compiled trie, as written by :meth:`save`
+    :type buffer: bytes or mmap.mmap
+    :raise ValueError: If the buffer is not a word trie
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        """Constructor method"""
+        if len(buffer) < HEADER.size:
+            raise ValueError("Buffer is too small to be a word trie")
+        magic, version, num_nodes, num_words = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Buffer is not a version 1 word trie")
+
+        self._buffer = buffer
+        self._fingerprint: Optional[str] = None
+        view = memoryview(buffer)
+        start = HEADER.size
+        sections = []
+        for size in (num_nodes + 1, num_nodes, num_nodes, num_words):
+            sections.append(_u32(view[start : start + 4 * size]))
+            start += 4 * size
+        self._first_child, self._parent, self._node_words, self._word_nodes = sections
+        self._letters = view[start : start + num_nodes]
+
+    @classmethod
+    def from_words(cls, lines: Iterable[str]) -> "WordTrie":
+        """Compile lines from a words file into an in-memory trie.
+
+        :param lines: Lines from a words file
+        :type lines: Iterable[str]
+        :return: A word trie
+        :rtype: :class:`lbsolver.trie.WordTrie`
+        """
+        return cls(compile_trie(lines))
+
+    @classmethod
+    def load(cls, path: str) -> "WordTrie":
+        """Memory map a compiled trie from disk.
+
+        :param path: The path of a file written by :meth:`save`
+        :type path: str
+        :return: A word trie backed by the file
+        :rtype: :class:`lbsolver.trie.WordTrie`
+        """
+        with open(path, "rb") as trie_file:
+            return cls(mmap.mmap(trie_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, path: str) -> None:
+        """Write the trie to disk.
+
+        :param path: The destination path
+        :type path: str
+        """
+        with open(path, "wb") as trie_file:
+            trie_file.write(self._buffer)
+
+    @property
+    def buffer(self) -> Union[bytes, mmap.mmap]:
+        """The compiled trie"""
+        return self._buffer
+
+    @property
+    def fingerprint(self) -> str:
+        """A SHA-256 hex digest of the compiled trie"""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(self._buffer).hexdigest()
+        return self._fingerprint
+
+    @property
+    def num_nodes(self) -> int:
+        """The number of nodes, including the root"""
+        return len(self._parent)
+
+    def close(self) -> None:
+        """Release the underlying buffer. The trie cannot be used afterwards."""
+        for section in (
+            self._first_child,
+            self._parent,
+            self._node_words,
+            self._word_nodes,
+        ):
+            if isinstance(section, memoryview):
+                section.release()
+        self._letters.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __reduce__(self):
+        return (self.__class__, (bytes(self._buffer),))
+
+    def __enter__(self) -> "WordTrie":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._word_nodes)
+
+    def __getitem__(self, word_id):
+        if isinstance(word_id, slice):
+            return [self[i] for i in range(*word_id.indices(len(self)))]
+        if word_id < 0:
+            word_id += len(self)
+        if not 0 <= word_id < len(self):
+            raise IndexError("word index out of range")
+        letters = bytearray()
+        node = self._word_nodes[word_id]
+        while node:
+            letters.append(self._letters[node])
+            node = self._parent[node]
+        letters.reverse()
+        return letters.decode("ascii")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[word_id] for word_id in range(len(self)))
+
+    def board_words(self, sides: Iterable[str]) -> List[str]:
+        """Get the words that can be played on a board by walking the trie.
+
+        A child is only visited when its letter is on a side and that side differs
+        from the side of the previous letter.
+
+        :param sides: The letters of each side of the board
+        :type sides: Iterable[str]
+        :return: Words in dictionary order
+        :rtype: List[str]
+        """
+        side_of = [-1] * 256
+        for side_id, side in enumerate(sides):
+            for letter in side:
+                if letter.isascii():
+                    side_of[ord(letter)] = side_id
+
+        first_child, letters, node_words = (
+            self._first_child,
+            self._letters,
+            self._node_words,
+        )
+        found = []
+        stack = [(0, -1, "")]
+        while stack:
+            node, previous_side, prefix = stack.pop()
+            for child in range(first_child[node], first_child[node + 1]):
+                letter = letters[child]
+                side = side_of[letter]
+                if side < 0 or side == previous_side:
+                    continue
+                word = prefix + chr(letter)
+                if node_words[child] != NO_WORD:
+                    found.append((node_words[child], word))
+                if first_child[child] != first_child[child + 1]:
+                    stack.append((child, side, word))
+        found.sort()
+        return [word for _, word in found]
+
+
+def compile_trie(lines: Iterable[str]) -> bytes:
+    """Compile lines from a words file into the binary trie format.
+
+    :param lines: Lines from a words file
+    :type lines: Iterable[str]
+    :return: The compiled trie
+    :rtype: bytes
+    """
+    children: List[Dict[str, int]] = [{}]
+    node_words: List[int] = [NO_WORD]
+    num_words = 0
+    for line in lines:
+        word = normalize_word(line)
+        if word is None:
+            continue
+        node = 0
+        for letter in word:
+            child = children[node].get(letter)
+            if child is None:
+                child = children[node][letter] = len(children)
+                children.append({})
+                node_words.append(NO_WORD)
+            node = child
+        if node_words[node] == NO_WORD:
+            node_words[node] = num_words
+            num_words += 1
+
+    # Renumber the nodes breadth first, children sorted by letter
+    order = [0]
+    letters = bytearray(b"\0")
+    parent = array("I", [0])
+    first_child = array("I")
+    queue = deque([0])
+    position = 0
+    while queue:
+        old = queue.popleft()
+        first_child.append(len(order))
+        for letter in sorted(children[old]):
+            order.append(children[old][letter])
+            letters.append(ord(letter))
+            parent.append(position)
+            queue.append(children[old][letter])
+        position += 1
+    first_child.append(len(order))
+
+    new_words = array("I", (node_words[old] for old in order))
+    word_nodes = array("I", bytes(4 * num_words))
+    for new, word_id in enumerate(new_words):
+        if word_id != NO_WORD:
+            word_nodes[word_id] = new
+
+    sections = [first_child, parent, new_words, word_nodes]
+    if sys.byteorder != "little":  # pragma: no cover
+        for section in sections:
+            section.byteswap()
+    header = HEADER.pack(MAGIC, VERSION, len(order), num_words)
+    return header + b"".join(section.tobytes() for section in sections) + letters
+
+
+def is_word_trie(path: str) -> bool:
+    """Check whether a file is a compiled word trie.
+
+    :param path: The path of the file to check
+    :type path: str
+    :return: True if the file starts with the trie header
+    :rtype: bool
+    """
+    with open(path, "rb") as candidate:
+        return candidate.read(len(MAGIC)) == MAGIC
@@ -0,0 +1,396 @@
+"""The wordindex module provides a precompiled, board independent dictionary index.
+
+A words file is compiled once into a compact binary file. Words are grouped by the
+26-bit mask of the letters they use, so the candidates for a board are found by
+looking up the submasks of the board's mask instead of scanning every word.
+
+The file is little endian and laid out as::
+
+    header        magic, version, number of masks, number of words, blob size
+    masks         uint32[number of masks], sorted ascending
+    group_starts  uint32[number of masks + 1], start of each mask in group_ids
+    group_ids     uint32[number of words], word ids grouped by mask
+    word_offsets  uint32[number of words + 1], offset of each word in blob
+    blob          the words, ascii encoded and concatenated
+"""
+import argparse
+import bz2
+import gzip
+import hashlib
+import io
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Dict, List, Optional, TextIO, Union
+
+MAGIC = b"LBIX"
+VERSION = 1
+HEADER = struct.Struct("<4sIIII")
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+READ_BUFFER_SIZE = 1024 * 1024
+COMPRESSED = {b"\x1f\x8b": gzip.open, b"BZh": bz2.open}
+
+
+def normalize_word(line: str) -> Optional[str]:
+    """Normalize a dictionary line the way :meth:`lbsolver.LBSolver.generate_valid_words` does.
+
+    Proper nouns, words shorter than three letters, words with characters outside
+    a-z and words with a repeated adjacent letter can never be played and are dropped.
+
+    :param line: A line from a words file
+    :type line: str
+    :return: The lowercase word or None if it can never be played
+    :rtype: str or None
+    """
+    item = line.strip()
+    if not item or not item[0].islower() or len(item) < 3:
+        return None
+    item = item.lower()
+    if not item.isascii() or not item.isalpha():
+        return None
+    if any(first == second for first, second in zip(item, item[1:])):
+        return None
+    return item
+
+
+def letter_mask(letters: Iterable[str]) -> int:
+    """Get the 26-bit mask of a sequence of lowercase letters.
+
+    :param letters: Letters from a-z
+    :type letters: Iterable[str]
+    :return: A mask with bit 0 for 'a' through bit 25 for 'z'
+    :rtype: int
+    """
+    mask = 0
+    for letter in letters:
+        mask |= 1 << (ord(letter) - 97)
+    return mask
+
+
+def _u32(data: Union[bytes, memoryview]) -> Sequence[int]:
+    if sys.byteorder == "little":
+        return memoryview(data).cast("I")
+    values = array("I", bytes(data))  # pragma: no cover
+    values.byteswap()  # pragma: no cover
+    return values  # pragma: no cover
+
+
+class WordIndex(Sequence):
+    """A dictionary of playable words grouped by letter mask.
+
+    A word index is a ``Sequence[str]`` of the normalized words in dictionary
+    order, so it can be passed anywhere a dictionary is expected.
+
+    :param buffer: The compiled index, as written by :meth:`save`
+    :type buffer: bytes or mmap.mmap
+    :raise ValueError: If the buffer is not a word index
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        """Constructor method"""
+        if len(buffer) < HEADER.size:
+            raise ValueError("Buffer is too small to be a word index")
+        magic, version, num_masks, num_words, blob_size = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Buffer is not a version 1 word index")
+
+        self._buffer = buffer
+        self._fingerprint: Optional[str] = None
+        view = memoryview(buffer)
+        start = HEADER.size
+        sections = []
+        for size in (num_masks, num_masks + 1, num_words, num_words + 1):
+            sections.append(_u32(view[start : start + 4 * size]))
+            start += 4 * size
+        self._masks, self._group_starts, self._group_ids, self._offsets = sections
+        self._blob = view[start : start + blob_size]
+
+    @classmethod
+    def from_words(cls, lines: Iterable[str]) -> "WordIndex":
+        """Compile lines from a words file into an in-memory index.
+
+        :param lines: Lines from a words file
+        :type lines: Iterable[str]
+        :return: A word index
+        :rtype: :class:`lbsolver.wordindex.WordIndex`
+        """
+        return cls(compile_words(lines))
+
+    @classmethod
+    def load(cls, path: str) -> "WordIndex":
+        """Memory map a compiled index from disk.
+
+        :param path: The path of a file written by :meth:`save` or :func:`compile_words`
+        :type path: str
+        :return: A word index backed by the file
+        :rtype: :class:`lbsolver.wordindex.WordIndex`
+        """
+        with open(path, "rb") as index_file:
+            return cls(mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, path: str) -> None:
+        """Write the index to disk.
+
+        :param path: The destination path
+        :type path: str
+        """
+        with open(path, "wb") as index_file:
+            index_file.write(self._buffer)
+
+    @property
+    def buffer(self) -> Union[bytes, mmap.mmap]:
+        """The compiled index"""
+        return self._buffer
+
+    @property
+    def fingerprint(self) -> str:
+        """A SHA-256 hex digest of the compiled index"""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(self._buffer).hexdigest()
+        return self._fingerprint
+
+    def close(self) -> None:
+        """Release the underlying buffer. The index cannot be used afterwards."""
+        for section in (self._masks, self._group_starts, self._group_ids, self._offsets):
+            if isinstance(section, memoryview):
+                section.release()
+        self._blob.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __reduce__(self):
+        return (self.__class__, (bytes(self._buffer),))
+
+    def __enter__(self) -> "WordIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, word_id):
+        if isinstance(word_id, slice):
+            return [self[i] for i in range(*word_id.indices(len(self)))]
+        if word_id < 0:
+            word_id += len(self)
+        if not 0 <= word_id < len(self):
+            raise IndexError("word index out of range")
+        return bytes(
+            self._blob[self._offsets[word_id] : self._offsets[word_id + 1]]
+        ).decode("ascii")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[word_id] for word_id in range(len(self)))
+
+    def candidate_ids(self, letters: Iterable[str]) -> List[int]:
+        """Get the ids of the words made only of the given letters.
+
+        Only the groups whose mask is a subset of the letters' mask are read. They
+        are found by walking the submasks of the letters' mask while there are
+        fewer submasks than distinct masks, and by scanning the distinct masks
+        otherwise, so large boards cost no more than one pass over the masks.
+
+        :param letters: The letters available, e.g. a board
+        :type letters: Iterable[str]
+        :return: Word ids in dictionary order
+        :rtype: List[int]
+        """
+        board_mask = letter_mask(
+            letter for letter in "".join(letters).lower() if letter in ALPHABET
+        )
+        masks, starts, group_ids = self._masks, self._group_starts, self._group_ids
+        num_masks = len(masks)
+        word_ids: List[int] = []
+        if 1 << bin(board_mask).count("1") <= num_masks:
+            submask = board_mask
+            while submask:
+                position = bisect_left(masks, submask)
+                if position < num_masks and masks[position] == submask:
+                    word_ids.extend(group_ids[starts[position] : starts[position + 1]])
+                submask = (submask - 1) & board_mask
+        else:
+            outside = ~board_mask
+            for position, mask in enumerate(masks):
+                if not mask & outside:
+                    word_ids.extend(group_ids[starts[position] : starts[position + 1]])
+        word_ids.sort()
+        return word_ids
+
+    def candidates(self, letters: Iterable[str]) -> List[str]:
+        """Get the words made only of the given letters.
+
+        :param letters: The letters available, e.g. a board
+        :type letters: Iterable[str]
+        :return: Words in dictionary order
+        :rtype: List[str]
+        """
+        return [self[word_id] for word_id in self.candidate_ids(letters)]
+
+
+def compile_words(lines: Iterable[str]) -> bytes:
+    """Compile lines from a words file into the binary index format.
+
+    :param lines: Lines from a words file
+    :type lines: Iterable[str]
+    :return: The compiled index
+    :rtype: bytes
+    """
+    words: Dict[str, int] = {}
+    for line in lines:
+        word = normalize_word(line)
+        if word is not None and word not in words:
+            words[word] = letter_mask(word)
+
+    groups: Dict[int, List[int]] = {}
+    for word_id, mask in enumerate(words.values()):
+        groups.setdefault(mask, []).append(word_id)
+
+    masks = array("I", sorted(groups))
+    group_starts = array("I", [0])
+    group_ids = array("I")
+    for mask in masks:
+        group_ids.extend(groups[mask])
+        group_starts.append(len(group_ids))
+
+    blob = "".join(words).encode("ascii")
+    word_offsets = array("I", [0])
+    for word in words:
+        word_offsets.append(word_offsets[-1] + len(word))
+
+    sections = [masks, group_starts, group_ids, word_offsets]
+    if sys.byteorder != "little":  # pragma: no cover
+        for section in sections:
+            section.byteswap()
+    header = HEADER.pack(MAGIC, VERSION, len(masks), len(words), len(blob))
+    return header + b"".join(section.tobytes() for section in sections) + blob
+
+
+def open_words(path: Union[str, os.PathLike]) -> TextIO:
+    """Open a words file for reading with a large buffer. Gzip and bzip2 files are
+    decompressed while they are read.
+
+    :param path: The path of a words file, compressed or not
+    :type path: str or os.PathLike
+    :return: A text file of the words
+    :rtype: TextIO
+    """
+    with open(path, "rb") as words_file:
+        magic = words_file.read(3)
+    for prefix, opener in COMPRESSED.items():
+        if magic.startswith(prefix):
+            raw = opener(path, "rb")
+            break
+    else:
+        raw = open(path, "rb", buffering=0)
+    return io.TextIOWrapper(io.BufferedReader(raw, READ_BUFFER_SIZE), encoding="utf-8")
+
+
+class WordFile(Iterable):
+    """The lines of a words file, read from disk each time they are iterated.
+
+    Unlike a list of lines, nothing is kept in memory, so a solver only holds the
+    words that survive the filter for its board.
+
+    :param path: The path of a words file, compressed with gzip or bzip2 or not
+    :type path: str or os.PathLike
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        """Constructor method"""
+        self.path = os.fspath(path)
+
+    def __iter__(self) -> Iterator[str]:
+        with open_words(self.path) as words_file:
+            yield from words_file
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.path!r})"
+
+
+def is_word_index(path: str) -> bool:
+    """Check whether a file is a compiled word index.
+
+    :param path: The path of the file to check
+    :type path: str
+    :return: True if the file starts with the index header
+    :rtype: bool
+    """
+    with open(path, "rb") as candidate:
+        return candidate.read(len(MAGIC)) == MAGIC
+
+
+def load_dictionary(path: str) -> Sequence[str]:
+    """Load a dictionary from either a words file, a compiled index or a compiled
+    trie.
+
+    :param path: The path to a words file, compiled index or compiled trie
+    :type path: str
+    :return: The words file lines, a :class:`lbsolver.wordindex.WordIndex` or a
+        :class:`lbsolver.trie.WordTrie`
+    :rtype: Sequence[str]
+    """
+    from lbsolver.trie import WordTrie, is_word_trie
+
+    if is_word_index(path):
+        return WordIndex.load(path)
+    if is_word_trie(path):
+        return WordTrie.load(path)
+    with open_words(path) as dictionary_file:
+        return dictionary_file.readlines()
+
+
+def open_dictionary(path: Union[str, os.PathLike]) -> Iterable[str]:
+    """Open a dictionary without reading a words file into memory.
+
+    :param path: The path to a words file, compiled index or compiled trie
+    :type path: str or os.PathLike
+    :raise OSError: If the file cannot be read
+    :return: A memory mapped :class:`lbsolver.wordindex.WordIndex` or
+        :class:`lbsolver.trie.WordTrie`, or a :class:`lbsolver.wordindex.WordFile`
+    :rtype: Iterable[str]
+    """
+    from lbsolver.trie import WordTrie, is_word_trie
+
+    if is_word_index(path):
+        return WordIndex.load(path)
+    if is_word_trie(path):
+        return WordTrie.load(path)
+    return WordFile(path)
+
+
+def main(argv: Optional[List[str]] = None):  # pragma: no cover
+    """Compile a words file into an index"""
+    parser = argparse.ArgumentParser(
+        prog="lbsolver compile",
+        description="Compile a words file into a board independent index",
+    )
+    parser.add_argument(
+        "dictionary",
+        help="The words file to compile. It may be compressed with gzip or bzip2.",
+        type=str,
+    )
+    parser.add_argument("output", help="The path of the index to write", type=str)
+    parser.add_argument(
+        "--trie",
+        help="Compile a letter trie, which finds a board's words by walking only the "
+        "letters the board allows",
+        action="store_true",
+    )
+    args = parser.parse_args(argv)
+
+    from lbsolver.trie import WordTrie
+
+    try:
+        index = (WordTrie if args.trie else WordIndex).from_words(
+            WordFile(args.dictionary)
+        )
+    except OSError as exc:
+        parser.error(f"can't open '{args.dictionary}': {exc}")
+    index.save(args.output)
+    print(f"Compiled {len(index)} words into {args.output}")
@@ -0,0 +1,353 @@
+"""The writers module streams solve results in formats made for other programs.
+
+``text``
+    The human readable ``Answer  1: safari---irks`` lines of ``lbsolver``.
+``ndjson``
+    One JSON object per line. Each answer is
+    ``{"type": "answer", "board": ..., "index": 1, "words": [...]}`` and each board
+    ends with ``{"type": "board", "board": ..., "answers": 10, "seconds": ...,
+    "complete": true}``.
+``csv``
+    A header then one row per answer and one per board, told apart by the
+    ``record`` column. The words of an answer are separated by spaces.
+``binary``
+    A compact stream of records, see :class:`BinaryWriter` and
+    :func:`read_binary`.
+
+Boards are written as they are given, ``lbsolver`` gives a string that
+:class:`lbsolver.Gameboard` reads back as the same board. Answers are written as
+they are produced and are buffered in chunks of :data:`BUFFER_ANSWERS`, so a
+large result set is neither formatted line by line nor held in memory. The stream
+is flushed after each board.
+"""
+import csv
+import io
+import json
+import struct
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Sequence
+from typing import BinaryIO, Dict, List, Optional, TextIO, Tuple, Union
+
+FORMATS = ("text", "ndjson", "csv", "binary")
+BUFFER_ANSWERS = 4096
+CSV_FIELDS = ("record", "board", "index", "words", "answers", "seconds", "complete")
+
+MAGIC = b"LBA\x01"
+WORD = b"W"
+BOARD = b"B"
+ANSWER = b"A"
+END = b"E"
+_LENGTH = struct.Struct("<H")
+_END = struct.Struct("<Id?")
+
+
+class AnswerWriter(ABC):
+    """Write the answers of boards to a stream. Subclasses format the records and
+    must implement :meth:`_answer`.
+
+    :param stream: The stream to write to
+    :type stream: TextIO or BinaryIO
+    """
+
+    def __init__(self, stream: Union[TextIO, BinaryIO]) -> None:
+        """Constructor method"""
+        self.stream = stream
+        self._chunk: list = []
+
+    def write_board(
+        self,
+        board: str,
+        answers: Iterable[Sequence[str]],
+        seconds: float = 0.0,
+        complete: bool = True,
+    ) -> int:
+        """Write the answers of a board as they are produced, then its metadata.
+
+        :param board: The board, e.g. its :attr:`lbsolver.Gameboard.layout`
+        :type board: str
+        :param answers: The answers, e.g. a list or a lazy
+            :meth:`lbsolver.LBSolver.iter_solutions`
+        :type answers: Iterable[Sequence[str]]
+        :param seconds: The time spent solving before the answers were passed. The
+            time spent producing answers while they are written is added to it.
+        :type seconds: float
+        :param complete: Whether the search found every answer it was asked for
+        :type complete: bool
+        :return: The number of answers written
+        :rtype: int
+        """
+        self._begin(board)
+        count = 0
+        iterator = iter(answers)
+        while True:
+            start = time.perf_counter()
+            answer = next(iterator, None)
+            seconds += time.perf_counter() - start
+            if answer is None:
+                break
+            count += 1
+            self._answer(board, count, answer)
+            if len(self._chunk) >= BUFFER_ANSWERS:
+                self._flush_chunk()
+        self._end(board, count, seconds, complete)
+        self._flush_chunk()
+        self.stream.flush()
+        return count
+
+    def _flush_chunk(self) -> None:
+        if self._chunk:
+            self.stream.write(self._join(self._chunk))
+            self._chunk = []
+
+    def _join(self, chunk: list):
+        return "".join(chunk)
+
+    def _begin(self, board: str) -> None:
+        pass
+
+    @abstractmethod
+    def _answer(self, board: str, index: int, answer: Sequence[str]) -> None:
+        pass
+
+    def _end(self, board: str, count: int, seconds: float, complete: bool) -> None:
+        pass
+
+
+class TextWriter(AnswerWriter):
+    """Write answers in the human readable format of ``lbsolver``.
+
+    :param stream: The text stream to write to
+    :type stream: TextIO
+    :param board_headers: Write a ``Board:`` line before the answers of each board
+        and a blank line after them, as for a batch
+    :type board_headers: bool
+    """
+
+    def __init__(self, stream: TextIO, board_headers: bool = False) -> None:
+        """Constructor method"""
+        super().__init__(stream)
+        self.board_headers = board_headers
+
+    def _begin(self, board: str) -> None:
+        if self.board_headers:
+            self._chunk.append(f"Board: {board}\n")
+
+    def _answer(self, board: str, index: int, answer: Sequence[str]) -> None:
+        self._chunk.append(f"Answer {index:>2}: {'---'.join(answer)}\n")
+
+    def _end(self, board: str, count: int, seconds: float, complete: bool) -> None:
+        if not count:
+            self._chunk.append(
+                "No answers for given board and dictionary for requested answer size\n"
+            )
+        if self.board_headers:
+            self._chunk.append("\n")
+
+
+class NDJSONWriter(AnswerWriter):
+    """Write one JSON object per answer and per board.
+
+    :param stream: The text stream to write to
+    :type stream: TextIO
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Constructor method"""
+        super().__init__(stream)
+        self._encoded: Dict[str, str] = {}
+        self._prefix = ""
+
+    def _begin(self, board: str) -> None:
+        self._prefix = f'{{"type": "answer", "board": {json.dumps(board)}, "index": '
+
+    def _answer(self, board: str, index: int, answer: Sequence[str]) -> None:
+        encoded = self._encoded
+        words = []
+        for word in answer:
+            text = encoded.get(word)
+            if text is None:
+                text = encoded[word] = json.dumps(word)
+            words.append(text)
+        self._chunk.append(
+            f"{self._prefix}{index}, \"words\": [{', '.join(words)}]}}\n"
+        )
+
+    def _end(self, board: str, count: int, seconds: float, complete: bool) -> None:
+        record = {
+            "type": "board",
+            "board": board,
+            "answers": count,
+            "seconds": round(seconds, 6),
+            "complete": complete,
+        }
+        self._chunk.append(json.dumps(record) + "\n")
+
+
+class CSVWriter(AnswerWriter):
+    """Write a header then one row per answer and per board.
+
+    :param stream: The text stream to write to
+    :type stream: TextIO
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Constructor method"""
+        super().__init__(stream)
+        self._rows = io.StringIO()
+        self._writer = csv.writer(self._rows, lineterminator="\n")
+        self._chunk.append(CSV_FIELDS)
+
+    def _answer(self, board: str, index: int, answer: Sequence[str]) -> None:
+        self._chunk.append(("answer", board, index, " ".join(answer), "", "", ""))
+
+    def _end(self, board: str, count: int, seconds: float, complete: bool) -> None:
+        self._chunk.append(
+            ("board", board, "", "", count, round(seconds, 6), str(complete).lower())
+        )
+
+    def _join(self, chunk: list) -> str:
+        self._writer.writerows(chunk)
+        rows = self._rows.getvalue()
+        self._rows.seek(0)
+        self._rows.truncate()
+        return rows
+
+
+class BinaryWriter(AnswerWriter):
+    """Write a compact binary stream of word ids and a word table.
+
+    The stream starts with the magic bytes ``LBA\\x01`` followed by records that
+    each start with a one byte tag. Integers are little endian.
+
+    ``W``
+        A word of the table: its length in bytes as an unsigned short, then the
+        UTF-8 word. Words get ids 0, 1, 2, ... in the order they are defined, and
+        each is defined once, before the first answer using it.
+    ``B``
+        The start of a board: its length as an unsigned short, then the board.
+    ``A``
+        An answer: the number of words as an unsigned byte, then the id of each
+        word as an unsigned int.
+    ``E``
+        The end of a board: the number of answers as an unsigned int, the seconds
+        as a double and whether the search was complete as a byte.
+
+    :param stream: The binary stream to write to
+    :type stream: BinaryIO
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Constructor method"""
+        super().__init__(stream)
+        self._ids: Dict[str, int] = {}
+        self._chunk.append(MAGIC)
+
+    def _join(self, chunk: list) -> bytes:
+        return b"".join(chunk)
+
+    def _begin(self, board: str) -> None:
+        encoded = board.encode("utf-8")
+        self._chunk.append(BOARD + _LENGTH.pack(len(encoded)) + encoded)
+
+    def _answer(self, board: str, index: int, answer: Sequence[str]) -> None:
+        ids = self._ids
+        word_ids = []
+        for word in answer:
+            word_id = ids.get(word)
+            if word_id is None:
+                word_id = ids[word] = len(ids)
+                encoded = word.encode("utf-8")
+                self._chunk.append(WORD + _LENGTH.pack(len(encoded)) + encoded)
+            word_ids.append(word_id)
+        self._chunk.append(
+            ANSWER + struct.pack(f"<B{len(word_ids)}I", len(word_ids), *word_ids)
+        )
+
+    def _end(self, board: str, count: int, seconds: float, complete: bool) -> None:
+        self._chunk.append(END + _END.pack(count, seconds, complete))
+
+
+def open_writer(
+    output_format: str, stream: TextIO, board_headers: bool = False
+) -> AnswerWriter:
+    """Get a writer for a format. The binary format writes to the binary buffer
+    under a text stream such as standard out.
+
+    :param output_format: One of :data:`FORMATS`
+    :type output_format: str
+    :param stream: The text stream to write to
+    :type stream: TextIO
+    :param board_headers: Write board headers in the text format, see
+        :class:`TextWriter`
+    :type board_headers: bool
+    :raise ValueError: If the format is unknown or a binary stream is not available
+    :return: The writer
+    :rtype: :class:`AnswerWriter`
+    """
+    if output_format == "text":
+        return TextWriter(stream, board_headers)
+    if output_format == "ndjson":
+        return NDJSONWriter(stream)
+    if output_format == "csv":
+        return CSVWriter(stream)
+    if output_format == "binary":
+        buffer = getattr(stream, "buffer", None)
+        if buffer is None:
+            raise ValueError("the binary format needs a stream with a binary buffer")
+        stream.flush()
+        return BinaryWriter(buffer)
+    raise ValueError(
+        f"Unknown format: {output_format}. Use one of {', '.join(FORMATS)}"
+    )
+
+
+def _read(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("the binary stream ends in the middle of a record")
+    return data
+
+
+def read_binary(
+    stream: BinaryIO,
+) -> Iterator[Tuple[str, List[Tuple[str, ...]], Dict[str, object]]]:
+    """Read a stream written by :class:`BinaryWriter`.
+
+    :param stream: The binary stream to read
+    :type stream: BinaryIO
+    :raise ValueError: If the stream is not a valid binary answer stream
+    :return: An iterator of each board, its answers and its metadata, with the
+        ``answers``, ``seconds`` and ``complete`` keys
+    :rtype: Iterator[Tuple[str, List[Tuple[str, ...]], Dict[str, object]]]
+    """
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError("the stream is not a binary answer stream")
+    words: List[str] = []
+    board: Optional[str] = None
+    answers: List[Tuple[str, ...]] = []
+    while True:
+        tag = stream.read(1)
+        if not tag:
+            break
+        if tag in (WORD, BOARD):
+            (length,) = _LENGTH.unpack(_read(stream, _LENGTH.size))
+            text = _read(stream, length).decode("utf-8")
+            if tag == WORD:
+                words.append(text)
+            else:
+                board, answers = text, []
+        elif tag == ANSWER:
+            (length,) = _read(stream, 1)
+            word_ids = struct.unpack(f"<{length}I", _read(stream, 4 * length))
+            answers.append(tuple(words[word_id] for word_id in word_ids))
+        elif tag == END and board is not None:
+            count, seconds, complete = _END.unpack(_read(stream, _END.size))
+            yield board, answers, {
+                "answers": count,
+                "seconds": seconds,
+                "complete": complete,
+            }
+            board, answers = None, []
+        else:
+            raise ValueError(f"unexpected record {tag!r} in the binary stream")
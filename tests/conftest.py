@@ -0,0 +1,9 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def dictionary():
+    with open(Path(".") / "test_dictionary", "r", encoding="utf-8") as words_file:
+        return words_file.readlines()
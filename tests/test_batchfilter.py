@@ -0,0 +1,47 @@
+import pytest
+from lbsolver import Gameboard, LBSolver
+from lbsolver.batchfilter import BoardFilter
+from lbsolver.cache import dictionary_fingerprint
+from lbsolver.generator import sample_boards
+from lbsolver.trie import WordTrie
+
+
+def test_board_words_match_trie(dictionary):
+    board_filter = BoardFilter(dictionary)
+    trie = WordTrie.from_words(dictionary)
+    for board in sample_boards(25, seed=3):
+        sides = Gameboard(board).sides
+        assert board_filter.board_words(sides) == trie.board_words(sides)
+
+
+def test_generate_valid_words(dictionary):
+    board_filter = BoardFilter(dictionary)
+    solver = LBSolver(Gameboard("slgatipryhfo"), dictionary)
+    expected = list(solver.generate_valid_words())
+    solver.dictionary = board_filter
+    assert list(solver.generate_valid_words()) == expected
+    assert solver.solve(2) == LBSolver(Gameboard("slgatipryhfo"), dictionary).solve(2)
+
+
+def test_filter_many(dictionary):
+    board_filter = BoardFilter(dictionary)
+    boards = ["slgatipryhfo", Gameboard("giyercpolahx")]
+    results = list(board_filter.filter_many(boards))
+    assert ["".join(gameboard.board) for gameboard, _ in results] == [
+        "slgatipryhfo",
+        "giyercpolahx",
+    ]
+    for gameboard, words in results:
+        assert words == board_filter.board_words(gameboard.sides)
+    with pytest.raises(ValueError):
+        list(board_filter.filter_many(["abc"]))
+
+
+def test_sequence_and_fingerprint(dictionary):
+    board_filter = BoardFilter(["Tiger", "tiger", "it's", "tree", "stone"])
+    assert list(board_filter) == ["tiger", "stone"]
+    assert len(board_filter) == 2 and board_filter[1] == "stone"
+    assert board_filter.fingerprint == BoardFilter(["tiger", "stone"]).fingerprint
+    assert board_filter.fingerprint != BoardFilter(["stone", "tiger"]).fingerprint
+    assert dictionary_fingerprint(board_filter).startswith("filter:")
+    assert BoardFilter([]).board_words(["abc", "def", "ghi", "jkl"]) == []
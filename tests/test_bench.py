@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+from lbsolver import Gameboard
+from lbsolver.bench import (
+    compare,
+    default_boards,
+    geometry,
+    random_boards,
+    run_benchmark,
+    run_size_benchmark,
+)
+
+
+def test_random_boards():
+    boards = random_boards(10, seed=3)
+    assert boards == random_boards(10, seed=3)
+    assert boards != random_boards(10, seed=4)
+    for board in boards:
+        Gameboard(board)
+    for board in random_boards(5, seed=3, sides=5, side_length=4):
+        assert Gameboard(board).sides == board.split(":")
+        assert len(board.split(":")) == 5
+    assert random_boards(3, sides=5)[0] != random_boards(3)[0]
+
+
+def test_run_size_benchmark():
+    results = run_size_benchmark(
+        str(Path(".") / "test_dictionary"),
+        [(4, 3), (4, 4)],
+        count=2,
+        settings=[(2, 3)],
+    )
+    assert results["meta"]["boards"] == 4
+    assert list(results["phases"]) == [
+        "load",
+        "4x3 filter",
+        "4x3 rank",
+        "4x3 solve 2/3",
+        "4x4 filter",
+        "4x4 rank",
+        "4x4 solve 2/3",
+    ]
+    assert results["phases"]["4x4 filter"]["count"] == 2
+    assert compare(results, results) == []
+
+    with pytest.raises(ValueError):
+        run_size_benchmark(str(Path(".") / "test_dictionary"), repeat=0)
+
+
+def test_default_boards(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert default_boards() == Path(__file__).resolve().parent.parent / "gameboards.txt"
+    (tmp_path / "gameboards.txt").write_text("slgatipryhfo\n", encoding="utf-8")
+    assert default_boards() == tmp_path / "gameboards.txt"
+
+
+def test_geometry():
+    assert geometry("5x3") == (5, 3)
+    assert geometry("4X4") == (4, 4)
+    for value in ("5", "x3", "1x3", "4x0", "-4x3"):
+        with pytest.raises(ValueError):
+            geometry(value)
+
+
+def test_run_benchmark():
+    results = run_benchmark(
+        str(Path(".") / "test_dictionary"),
+        ["slgatipryhfo", "giy:erc:pol:ahx"],
+        settings=[(2, 3), (3, 5)],
+        repeat=1,
+    )
+    assert results["meta"]["boards"] == 2
+    assert results["meta"]["answers"] > 0
+    assert list(results["phases"]) == [
+        "load",
+        "filter",
+        "rank",
+        "solve 2/3",
+        "solve 3/5",
+    ]
+    assert results["phases"]["filter"]["count"] == 2
+    assert results["phases"]["load"]["count"] == 1
+
+    with pytest.raises(ValueError):
+        run_benchmark(str(Path(".") / "test_dictionary"), [], repeat=0)
+
+
+def test_compare():
+    meta = {"words": 10, "boards": 2}
+    baseline = {
+        "meta": meta,
+        "phases": {"filter": {"total": 1.0}, "rank": {"total": 0.0}},
+    }
+    results = {
+        "meta": meta,
+        "phases": {
+            "filter": {"total": 1.5},
+            "rank": {"total": 1.0},
+            "solve 3/5": {"total": 2.0},
+        },
+    }
+    assert compare(results, baseline, threshold=0.6) == []
+    regressions = compare(results, baseline, threshold=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("filter")
+
+    with pytest.raises(ValueError):
+        compare(results, {"meta": {"words": 10, "boards": 3}, "phases": {}})
@@ -0,0 +1,103 @@
+import pytest
+from lbsolver import Gameboard, LBSolver
+from lbsolver.cache import ResultCache, board_key, dictionary_fingerprint, result_key
+from lbsolver.wordindex import WordIndex
+
+
+def test_board_key_ignores_order():
+    assert board_key("slgatipryhfo") == board_key("hfoslgryptia")
+    assert board_key("slgatipryhfo") == board_key("gslitayprohf")
+    assert board_key("slgatipryhfo") == board_key("pry:hfo:slg:ati")
+    assert board_key("slgatipryhfo", 4) == "agls:fhoy:iprt"
+    assert board_key("abcd:efgh") != board_key("abc:def:gh")
+
+
+def test_result_key():
+    key = result_key("slgatipryhfo", "lines:abc", 3, 5, ["safari", "", "fool"])
+    assert key == result_key("tiaslgrypofh", "lines:abc", 3, 5, ["fool", "safari"])
+    assert key != result_key("slgatipryhfo", "lines:abd", 3, 5, ["fool", "safari"])
+    assert key != result_key("slgatipryhfo", "lines:abc", 2, 5, ["fool", "safari"])
+    assert key != result_key("slgatipryhfo", "lines:abc", 3, 5, [])
+
+
+def test_dictionary_fingerprint(dictionary):
+    assert dictionary_fingerprint(dictionary) == dictionary_fingerprint(
+        list(dictionary)
+    )
+    assert dictionary_fingerprint(dictionary) != dictionary_fingerprint(dictionary[1:])
+    index = WordIndex.from_words(dictionary)
+    assert dictionary_fingerprint(index) == dictionary_fingerprint(
+        WordIndex.from_words(dictionary)
+    )
+
+
+def test_memory_lru():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", [("one",)])
+    cache.put("b", [("two",)])
+    assert cache.get("a") == [("one",)]
+    cache.put("c", [("three",)])
+    assert cache.get("b") is None
+    assert cache.get("a") == [("one",)]
+    assert len(cache) == 2
+    assert (cache.stats.memory_hits, cache.stats.misses) == (2, 1)
+
+
+def test_disk_tier(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path=path)
+    cache.put("a", [("safari", "ions")])
+    cache.close()
+
+    reopened = ResultCache(path=path)
+    assert reopened.get("a") == [("safari", "ions")]
+    assert reopened.get("a") == [("safari", "ions")]
+    assert reopened.stats.disk_hits == 1
+    assert reopened.stats.memory_hits == 1
+    reopened.clear()
+    assert reopened.get("a") is None
+    reopened.close()
+
+
+def test_disk_eviction(tmp_path):
+    cache = ResultCache(maxsize=0, path=str(tmp_path / "cache.sqlite"), max_bytes=40)
+    cache.put("a", [("aaaaaaaaaa",)])
+    cache.put("b", [("bbbbbbbbbb",)])
+    assert cache.get("a") == [("aaaaaaaaaa",)]
+    cache.put("c", [("cccccccccc",)])
+    assert cache.stats.evictions == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == [("aaaaaaaaaa",)]
+    assert cache.get("c") == [("cccccccccc",)]
+    cache.close()
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=-1)
+    with pytest.raises(ValueError):
+        ResultCache(max_bytes=-1)
+
+
+def test_solver_uses_cache(dictionary):
+    cache = ResultCache()
+    expected = LBSolver(Gameboard("slgatipryhfo"), dictionary).solve(3, 5)
+
+    solver = LBSolver(Gameboard("slgatipryhfo"), dictionary, cache=cache)
+    assert solver.solve(3, 5) == expected
+    assert cache.stats.misses == 1
+
+    permuted = LBSolver(Gameboard("hfoslgryptia"), dictionary, cache=cache)
+    assert permuted.solve(3, 5) == expected
+    assert cache.stats.memory_hits == 1
+
+    assert solver.solve(3, 5, skip="safari") != expected
+    assert cache.stats.misses == 2
+
+
+def test_solve_many_uses_cache(dictionary):
+    cache = ResultCache()
+    boards = ["slgatipryhfo", "giyercpolahx", "slgatipryhfo"]
+    results = list(LBSolver.solve_many(boards, dictionary, 3, 2, cache=cache))
+    assert results[0][1] == results[2][1]
+    assert (cache.stats.misses, cache.stats.hits) == (2, 1)
@@ -0,0 +1,174 @@
+import pickle
+
+import pytest
+from lbsolver.engine import (
+    BitmaskEngine,
+    CancellationToken,
+    SearchLimit,
+    SearchStats,
+    popcount,
+)
+
+
+@pytest.fixture
+def engine():
+    return BitmaskEngine("abcdefghijkl", ["adgjbehk", "kcfil", "adg", "gil"])
+
+
+def test_masks(engine):
+    assert engine.full_mask == 0xFFF
+    assert engine.masks[engine.ids["adg"]] == 0b1001001
+    assert engine.first[engine.ids["kcfil"]] == 10
+    assert engine.last[engine.ids["kcfil"]] == 11
+    assert popcount(engine.masks[engine.ids["adgjbehk"]]) == 8
+    assert engine.mask_for("lk") == 0b110000000000
+
+
+def test_ranking(engine):
+    assert engine.words[engine.order[0]] == "adgjbehk"
+    assert [engine.words[i] for i in engine.successors[6]] == ["gil"]
+
+
+def test_search(engine):
+    assert engine.search(3, 5) == [("adgjbehk", "kcfil")]
+    assert engine.search(2, 5) == [("adgjbehk", "kcfil")]
+    assert engine.search(1, 5) == []
+    assert engine.search(3, 5, skip=["kcfil"]) == []
+
+
+def test_invalid_word():
+    with pytest.raises(ValueError):
+        BitmaskEngine("abcdefghijkl", ["xyz"])
+
+
+def test_iter_search(engine):
+    answers = engine.iter_search(3)
+    assert next(answers) == ("adgjbehk", "kcfil")
+    assert next(answers, None) is None
+    assert list(engine.iter_search(3, roots=[engine.ids["kcfil"]])) == []
+
+
+def test_optimal_search():
+    engine = BitmaskEngine("abcdefghijkl", ["kcf", "fil", "adgjbehk", "kcfil", "lad"])
+    expected = [("adgjbehk", "kcfil"), ("adgjbehk", "kcf", "fil")]
+    assert engine.optimal_search(3, 5) == expected
+    assert engine.optimal_search(3, 1) == expected[:1]
+    assert engine.optimal_search(2, 5) == expected[:1]
+    assert engine.optimal_search(3, 5, skip=["kcfil"]) == expected[1:]
+
+
+def brute_force(engine, max_num_words):
+    answers = []
+
+    def dfs(path, covered):
+        if len(path) == max_num_words:
+            return
+        for word_id in engine.successors[engine.last[path[-1]]] if path else engine.order:
+            if word_id in path:
+                continue
+            if covered | engine.masks[word_id] == engine.full_mask:
+                answers.append(tuple(engine.words[i] for i in path + [word_id]))
+            else:
+                dfs(path + [word_id], covered | engine.masks[word_id])
+
+    dfs([], 0)
+    return answers
+
+
+@pytest.mark.parametrize("max_num_words", [1, 2, 3, 4])
+def test_count_and_iter_all(max_num_words):
+    engine = BitmaskEngine(
+        "abcdefghijkl",
+        ["adgjbehk", "kcfil", "kcf", "fil", "lad", "dad", "dal", "lakcfil"],
+    )
+    expected = brute_force(engine, max_num_words)
+    answers = list(engine.iter_all(max_num_words))
+    assert sorted(answers) == sorted(expected)
+    assert [len(answer) for answer in answers] == sorted(map(len, answers))
+    counts = engine.count_solutions(max_num_words)
+    assert sum(counts.values()) == len(expected)
+    for num_words, total in counts.items():
+        assert total == sum(1 for answer in expected if len(answer) == num_words)
+    assert sum(engine.count_solutions(max_num_words, skip=["kcf"]).values()) == len(
+        [answer for answer in expected if "kcf" not in answer]
+    )
+
+
+def test_search_stats(engine):
+    stats = SearchStats()
+    assert engine.search(3, 5, stats=stats) == engine.search(3, 5)
+    assert (stats.nodes, stats.answers) == (2, 1)
+    assert stats.pruned == {"duplicate": 0, "used": 1, "depth": 2, "skip": 0}
+    assert stats.search_seconds > 0
+
+    stats = SearchStats()
+    assert engine.search(2, 5, skip=["kcfil"], stats=stats) == []
+    assert stats.pruned == {"duplicate": 0, "used": 0, "depth": 1, "skip": 2}
+
+    stats = SearchStats()
+    assert engine.search(1, 5, stats=stats) == []
+    assert (stats.nodes, stats.pruned["depth"]) == (0, 4)
+
+
+def test_board_size():
+    engine = BitmaskEngine(
+        "abcdefghijklmnopqrstuvwxyz", ["abc", "cdefghijklmnopqrstuvwxyz"]
+    )
+    assert engine.full_mask == (1 << 26) - 1
+    assert engine.search(2, 5) == [("abc", "cdefghijklmnopqrstuvwxyz")]
+    with pytest.raises(ValueError):
+        BitmaskEngine("abcdefghijklmnopqrstuvwxyzABCDEFGH", [])
+
+
+def test_compact_storage(engine):
+    assert not hasattr(engine, "__dict__")
+    assert engine.masks.typecode == "I" and engine.last.typecode == "B"
+    copy = pickle.loads(pickle.dumps(engine))
+    assert copy.search(3, 5) == engine.search(3, 5)
+
+
+def test_top_k_search(engine):
+    costs = [1.0, 2.0, 0.5, 0.0]
+    assert engine.top_k_search(costs, 5) == [("adgjbehk", "kcfil")]
+    assert engine.top_k_search(costs, 5, max_num_words=1) == []
+    assert engine.top_k_search(costs, 5, skip=["kcfil"]) == []
+    assert engine.top_k_search(costs, 0) == []
+
+
+def test_top_k_search_matches_brute_force():
+    engine = BitmaskEngine(
+        "abcdefghijkl",
+        ["adgjbehk", "kcfil", "kcfila", "adg", "gil", "lafk", "kcfiadgjbehl"],
+    )
+    costs = [float(len(word) % 5) for word in engine.words]
+    answers = list(engine.iter_all(4))
+    best = sorted(
+        answers, key=lambda answer: sum(costs[engine.ids[word]] for word in answer)
+    )
+    top = engine.top_k_search(costs, 3, 4)
+    assert [sum(costs[engine.ids[word]] for word in answer) for answer in top] == [
+        sum(costs[engine.ids[word]] for word in answer) for answer in best[:3]
+    ]
+
+
+def test_search_limit(engine):
+    limit = SearchLimit(max_nodes=0)
+    assert engine.search(3, 5, limit=limit) == []
+    assert not limit.complete and limit.reason == "nodes"
+
+    limit = SearchLimit(max_nodes=100, timeout=60)
+    assert engine.search(3, 5, limit=limit) == engine.search(3, 5)
+    assert limit.complete
+
+    token = CancellationToken()
+    token.cancel()
+    limit = SearchLimit(token=token)
+    assert engine.search(3, 5, limit=limit) == []
+    assert limit.reason == "cancelled"
+
+    limit = SearchLimit(timeout=0)
+    assert engine.search(3, 5, limit=limit) == []
+    assert limit.reason == "deadline"
+
+    with pytest.raises(ValueError):
+        SearchLimit(timeout=-1)
@@ -0,0 +1,17 @@
+import gzip
+import math
+
+from lbsolver.frequency import load_frequencies, word_costs
+
+
+def test_load_frequencies(tmp_path):
+    path = tmp_path / "counts.txt.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as counts:
+        counts.write("word,count\nthe,10\nSafari\t4\nsafari 1\nbroken\n\n")
+    assert load_frequencies(path) == {"the": 10, "safari": 5}
+
+
+def test_word_costs():
+    costs = word_costs(["the", "safari", "zzz"], {"the": 10, "safari": 5})
+    assert costs[0] < costs[1] < costs[2]
+    assert costs[2] == math.log(16)
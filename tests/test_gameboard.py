@@ -1,6 +1,6 @@
 from contextlib import nullcontext
 import pytest
-from lbsolver import Gameboard
+from lbsolver import Gameboard, LBSolver
 
 
 def test_default_board():
@@ -48,3 +48,101 @@ def test_valid_board():
 def test_valid_and_invalid_boards(my_input, expectation):
     with expectation:
         Gameboard(my_input)
+
+
+def test_transitions():
+    gb1 = Gameboard("nwrabicodelt")
+    assert "na" in gb1.transitions
+    assert "nw" not in gb1.transitions
+    assert "nn" not in gb1.transitions
+    assert "ns" not in gb1.transitions
+    assert len(gb1.transitions) == 12 * 9
+
+
+@pytest.mark.parametrize(
+    "board,expected",
+    [
+        ("slgatipryhfo", ["physiologists", "safaris"]),
+        ("slgatipryhfé", ["safaris", "éris"]),
+    ],
+)
+def test_possible_words(board, expected):
+    gb1 = Gameboard(board)
+    words = ["physiologists", "safaris", "slg", "xsafari", "éris", "sssaaafff", ""]
+    assert gb1.possible_words(words) == expected
+    assert gb1.possible_words([]) == []
+
+
+@pytest.mark.parametrize("board", ["slgatipryhfo", "slgatipryhfé"])
+def test_possible_words_non_letters(board):
+    gb1 = Gameboard(board)
+    solver = LBSolver(gb1, ["safari\n"])
+    words = ["\x01", "\x02\x03\x04", "s\x02a", "\x00", "safa\x01", "s a", "safari"]
+    expected = [word for word in words if solver.possible_on_board(word)]
+    assert expected == ["safari"]
+    assert gb1.possible_words(words) == expected
+
+
+def test_canonical_board():
+    gb1 = Gameboard("nwrabicodelt")
+    gb2 = Gameboard("ltedocbiarwn")
+    assert gb1.canonical_key == "abi:cdo:elt:nrw"
+    assert gb2.canonical_key == gb1.canonical_key
+    assert gb1 == gb2 and hash(gb1) == hash(gb2)
+    assert gb1 != Gameboard("nwbaricodelt")
+    assert gb1 != "nwrabicodelt"
+    assert len({gb1, gb2, Gameboard("abi:cdo:elt:nrw")}) == 1
+    assert gb1.canonical().board == list("abicdoeltnrw")
+
+
+@pytest.mark.parametrize(
+    "board,side_length,sides",
+    [
+        ("abcd:efgh:ijkl:mnop", 3, ["abcd", "efgh", "ijkl", "mnop"]),
+        ("abcdefghijklmno", 3, ["abc", "def", "ghi", "jkl", "mno"]),
+        ("abcdefghijklmnop", 4, ["abcd", "efgh", "ijkl", "mnop"]),
+        (list("abcdef"), 2, ["ab", "cd", "ef"]),
+        ("abcdefghijklmnopqrstuvwxyz", 1, list("abcdefghijklmnopqrstuvwxyz")),
+    ],
+)
+def test_board_geometry(board, side_length, sides):
+    gb1 = Gameboard(board, side_length)
+    assert gb1.sides == sides
+    assert gb1.side_length == len(sides[0])
+    assert gb1.layout == ":".join(sides)
+    assert Gameboard(gb1.layout) == gb1
+    assert str(gb1).count("Side") == len(sides)
+    assert len(gb1.transitions) == len(gb1.board) * (len(gb1.board) - len(sides[0]))
+
+
+@pytest.mark.parametrize(
+    "board,side_length",
+    [
+        ("abcd:efgh:ijk:lmno", 3),
+        ("abcdefghijklmn", 4),
+        ("abc", 3),
+        ("abcdefghijklmnopqrstuvwxyzé", 3),
+        ("abcdef", 0),
+    ],
+)
+def test_invalid_geometry(board, side_length):
+    with pytest.raises(ValueError):
+        Gameboard(board, side_length)
+
+
+def test_larger_board_sides():
+    gb1 = Gameboard("abcde:fghij:klmno")
+    assert (gb1.side1, gb1.side3, gb1.side4) == ("abcde", "klmno", "")
+    assert gb1.canonical_key == "abcde:fghij:klmno"
+    words = ["afkbg", "abf", "kfakfakfakfakfakfakfakfa"]
+    assert gb1.possible_words(words) == ["afkbg", "kfakfakfakfakfakfakfakfa"]
+
+    gb2 = Gameboard("abcdefghijklmnopqrstuvwxyz", 1)
+    assert gb2.possible_words(["zebra", "jazz", "quiz"]) == ["zebra", "quiz"]
+
+
+def test_control_characters_on_many_sides():
+    gb1 = Gameboard("ab:cd:ef:gh:ij:kl:mn:op:qr:st")
+    words = ["ac\tegi", "ac\regi", "ac\x0begi", "ac\x0cegi", "acegikmoqs"]
+    assert gb1.possible_words(words) == ["acegikmoqs"]
+    assert LBSolver(gb1, [word + "\n" for word in words]).solve() == []
@@ -0,0 +1,54 @@
+import pytest
+from lbsolver import Gameboard, LBSolver
+from lbsolver.generator import (
+    VOWELS,
+    BoardScore,
+    generate_boards,
+    sample_boards,
+    score_board,
+)
+from lbsolver.wordindex import WordIndex
+
+
+@pytest.fixture
+def index(dictionary):
+    return WordIndex.from_words(dictionary)
+
+
+def test_sample_boards():
+    boards = list(sample_boards(20, seed=2))
+    assert boards == list(sample_boards(20, seed=2))
+    for board in boards:
+        Gameboard(board)
+        assert sum(letter in VOWELS for letter in board) >= 3
+    with pytest.raises(ValueError):
+        list(sample_boards(1, min_vowels=6))
+
+
+def test_score_board(index):
+    score = score_board("slgatipryhfo", index)
+    assert score.board == "slgatipryhfo"
+    assert score.counts == LBSolver(Gameboard("slgatipryhfo"), index).count_solutions(3)
+    assert score.two_word_answers == score.counts[2] > 0
+    assert score.min_words == 2
+    assert score.solutions == sum(score.counts.values())
+    assert score_board("slgatipryhfo", index, min_valid_words=10**6) is None
+
+
+def test_board_score_metrics():
+    score = BoardScore("slgatipryhfo", 10, {1: 0, 2: 0, 3: 4})
+    assert (score.solutions, score.two_word_answers, score.min_words) == (4, 0, 3)
+    assert BoardScore("slgatipryhfo", 10, {1: 0, 2: 0}).min_words == 0
+
+
+def test_generate_boards(index):
+    boards = ["slgatipryhfo", "giyercpolahx", "tnmhrvikeaub"]
+    scores = [score_board(board, index) for board in boards]
+    kept = generate_boards(index, boards)
+    assert kept == sorted(
+        (score for score in scores if score.two_word_answers),
+        key=lambda score: (score.two_word_answers, -score.solutions),
+    )
+    assert generate_boards(index, boards, max_solutions=0) == []
+    with pytest.raises(ValueError):
+        generate_boards(index, boards, workers=0)
@@ -0,0 +1,48 @@
+import pytest
+from lbsolver import Gameboard, LBSolver
+from lbsolver.hints import HintIndex
+
+
+@pytest.fixture
+def solver(dictionary):
+    return LBSolver(Gameboard("slgatipryhfo"), dictionary)
+
+
+@pytest.mark.parametrize(
+    "played", [("physiologist",), ("yogis", "safari"), ("oafish",)]
+)
+def test_hints_match_enumeration(solver, played):
+    expected = [
+        answer[len(played) :]
+        for answer in solver.enumerate_solutions(len(played) + 2)
+        if answer[: len(played)] == played
+    ]
+    hints = solver.hints(list(played), max_num_words=2, minimum_answers=10**6)
+    assert sorted(hints) == sorted(expected)
+    sizes = [len(hint) for hint in hints]
+    assert sizes == sorted(sizes)
+
+
+def test_hints(solver):
+    assert solver.hints("physiologist, thrifts", 1, 2) == [("spiral",), ("splashy",)]
+    assert solver.hints(["physiologist", "thrifts", "spiral"]) == []
+    assert solver.hints("", 2, 1) == solver.solve_optimal(2, 1)
+
+    with pytest.raises(ValueError):
+        solver.hints("physiologist,tax")
+    with pytest.raises(ValueError):
+        solver.hints("physiologist,salsa")
+    with pytest.raises(ValueError):
+        solver.hints("spry")
+    with pytest.raises(ValueError):
+        solver.hints("physiologist", max_num_words=0)
+    with pytest.raises(ValueError):
+        solver.hints("physiologist", minimum_answers=0)
+
+
+def test_hint_index_state(solver):
+    index = HintIndex(solver.bitmask_engine())
+    covered, letter = index.state(["yogis", "safari"])
+    assert covered == index.engine.mask_for("yogisafari")
+    assert index.engine.board[letter] == "i"
+    assert index.state([]) == (0, None)
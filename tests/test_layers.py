@@ -0,0 +1,66 @@
+import pickle
+
+import pytest
+from lbsolver import Gameboard, LBSolver
+from lbsolver.cache import dictionary_fingerprint
+from lbsolver.layers import LayeredDictionary
+from lbsolver.trie import WordTrie
+
+
+def test_combine_layers():
+    layered = LayeredDictionary(["safari", "ions", "spiral"])
+    assert list(layered) == ["safari", "ions", "spiral"]
+    assert list(layered.union(["lion", "ions"])) == ["safari", "ions", "spiral", "lion"]
+    assert list(layered.intersection(["spiral", "safari", "zoo"])) == [
+        "safari",
+        "spiral",
+    ]
+    assert list(layered.exclusion(["ions"]).union(["ions"])) == [
+        "safari",
+        "spiral",
+        "ions",
+    ]
+    assert len(layered.layers) == 0
+    with pytest.raises(ValueError):
+        LayeredDictionary(["safari"], [("difference", ["safari"])])
+
+
+def test_board_words(dictionary):
+    board = Gameboard("slgatipryhfo")
+    common = ["physiologist", "thrifts", "spiral", "splashy", "safari"]
+    layered = (
+        LayeredDictionary(dictionary)
+        .intersection(WordTrie.from_words(common))
+        .exclusion(["safari"])
+    )
+    assert layered.board_words(board) == [
+        "physiologist",
+        "spiral",
+        "splashy",
+        "thrifts",
+    ]
+    solver = LBSolver(board, layered)
+    assert list(solver.solve(3, 5)) == [
+        ("physiologist", "thrifts", "spiral"),
+        ("physiologist", "thrifts", "splashy"),
+    ]
+
+
+def test_blocklist_matches_skip(dictionary, tmp_path):
+    blocklist = tmp_path / "blocklist.txt"
+    blocklist.write_text("physiologist\nthrifts\n", encoding="utf-8")
+    layered = LayeredDictionary(dictionary).exclusion(blocklist)
+    board = Gameboard("slgatipryhfo")
+    assert LBSolver(board, layered).solve(3, 10) == LBSolver(board, dictionary).solve(
+        3, 10, skip="physiologist,thrifts"
+    )
+
+
+def test_fingerprint_and_pickle(dictionary):
+    layered = LayeredDictionary(dictionary).exclusion(["safari"])
+    assert dictionary_fingerprint(layered) == "layers:" + layered.fingerprint
+    assert layered.fingerprint != LayeredDictionary(dictionary).fingerprint
+    copy = pickle.loads(pickle.dumps(layered))
+    assert copy.fingerprint == layered.fingerprint
+    board = Gameboard("giyercpolahx")
+    assert copy.board_words(board) == layered.board_words(board)
@@ -1,8 +1,13 @@
+import asyncio
 from contextlib import nullcontext
+from itertools import islice
 from pathlib import Path
 
 import pytest
 from lbsolver import Gameboard, LBSolver
+from lbsolver.cache import ResultCache
+from lbsolver.engine import CancellationToken
+from lbsolver.frequency import word_costs
 
 
 @pytest.fixture
@@ -150,3 +155,260 @@ def test_nonrepeating_answers(dictionary):
     answers = solver.solve(8, 5)
     for answer in answers:
         assert len(answer) == len(set(answer))
+
+
+@pytest.mark.parametrize(
+    "board,settings",
+    [
+        ("slgatipryhfo", (3, 10, "")),
+        ("slgatipryhfo", (4, 20, "physiologists")),
+        ("giyercpolahx", (2, 5, "")),
+        ("giyercpolahx", (3, 30, "lexicography")),
+        ("tnmhrvikeaub", (3, 10, "")),
+        ("slg:ati:pry:hfo:enc", (3, 10, "")),
+    ],
+)
+def test_engines_agree(board, settings, dictionary):
+    solver = LBSolver(Gameboard(board), dictionary)
+    simple = list(solver.solve(*settings, engine="simple"))
+    bitmask = list(solver.solve(*settings, engine="bitmask"))
+    assert simple == bitmask
+
+
+def test_larger_board(dictionary):
+    gameboard = Gameboard("slga:tipr:yhfo:encd")
+    solver = LBSolver(gameboard, dictionary)
+    answers = solver.solve(3, 5)
+    assert len(answers) == 5
+    for answer in answers:
+        assert set("".join(answer)) == set(gameboard.board)
+        assert all(solver.possible_on_board(word) for word in answer)
+        assert all(one[-1] == two[0] for one, two in zip(answer, answer[1:]))
+    assert LBSolver(Gameboard(gameboard.layout), dictionary).solve(3, 5) == answers
+
+
+def test_unknown_engine(lbsolver1):
+    with pytest.raises(ValueError):
+        lbsolver1.solve(engine="quantum")
+
+
+def test_solve_many(dictionary):
+    boards = ["slgatipryhfo", Gameboard("giyercpolahx"), "tnmhrvikeaub"]
+    results = list(LBSolver.solve_many(boards, dictionary, 3, 5))
+    assert [gameboard.board for gameboard, _ in results] == [
+        list("slgatipryhfo"),
+        list("giyercpolahx"),
+        list("tnmhrvikeaub"),
+    ]
+    for gameboard, answers in results:
+        assert list(answers) == list(LBSolver(gameboard, dictionary).solve(3, 5))
+
+
+def test_solve_many_errors(dictionary):
+    with pytest.raises(TypeError):
+        list(LBSolver.solve_many(["slgatipryhfo"], None))
+
+    results = LBSolver.solve_many(["giyercpolahx", "abc"], dictionary)
+    assert next(results)[1]
+    with pytest.raises(ValueError):
+        next(results)
+
+    errors = []
+    boards = ["giyercpolahx", "abc", "aaabbbcccddd", "slgatipryhfo"]
+    results = list(
+        LBSolver.solve_many(
+            boards, dictionary, on_error=lambda *error: errors.append(error)
+        )
+    )
+    assert [gameboard.board for gameboard, _ in results] == [
+        list("giyercpolahx"),
+        list("slgatipryhfo"),
+    ]
+    assert [board for board, _ in errors] == ["abc", "aaabbbcccddd"]
+    assert all(isinstance(exc, ValueError) for _, exc in errors)
+
+
+def test_iter_solutions(lbsolver1):
+    answers = lbsolver1.iter_solutions(3, skip="physiologists")
+    first = next(answers)
+    assert "physiologists" not in first
+    assert [first] + list(islice(answers, 9)) == list(
+        lbsolver1.solve(3, 10, skip="physiologists")
+    )
+
+    with pytest.raises(ValueError):
+        lbsolver1.iter_solutions(0)
+
+
+def test_aiter_solutions(lbsolver1):
+    async def collect():
+        answers = []
+        async for answer in lbsolver1.aiter_solutions(3):
+            answers.append(answer)
+            if len(answers) == 5:
+                break
+        return answers
+
+    assert asyncio.run(collect()) == list(lbsolver1.solve(3, 5))
+
+
+@pytest.mark.parametrize("board", ["slgatipryhfo", "atiqoeskujyn", "tnmhrvikeaub"])
+def test_solve_optimal(board, dictionary):
+    solver = LBSolver(Gameboard(board), dictionary)
+    answers = solver.solve_optimal(5, 10)
+    assert len(answers) == 10
+    sizes = [len(answer) for answer in answers]
+    assert sizes == sorted(sizes)
+    assert sizes[0] <= min(len(answer) for answer in solver.solve(5, 10))
+    for answer in answers:
+        assert not solver.get_unused_letters("".join(answer))
+        assert all(a[-1] == b[0] for a, b in zip(answer, answer[1:]))
+
+    by_length = solver.solve_optimal(5, 10, by_length=True)
+    keys = [(len(answer), len("".join(answer))) for answer in by_length]
+    assert keys == sorted(keys)
+    assert keys[-1] <= max((len(answer), len("".join(answer))) for answer in answers)
+
+    with pytest.raises(ValueError):
+        solver.solve_optimal(0)
+    with pytest.raises(ValueError):
+        solver.solve_optimal(3, 0)
+
+
+def test_solve_top_k(lbsolver1, tmp_path):
+    counts = tmp_path / "counts.txt"
+    counts.write_text("flytrap 50\nphysiologist 40\nsafari 30\n", encoding="utf-8")
+    answers = lbsolver1.solve_top_k(counts, k=3)
+    assert answers[0] == ("flytrap", "physiologist")
+    assert set(answers) <= set(lbsolver1.enumerate_solutions(3))
+    answers = lbsolver1.solve_top_k(str(counts), k=4, skip="flytrap")
+    assert len(answers) == 4
+    assert all("flytrap" not in answer for answer in answers)
+
+    with pytest.raises(ValueError):
+        lbsolver1.solve_top_k({}, k=0)
+    with pytest.raises(ValueError):
+        lbsolver1.solve_top_k({}, max_num_words=0)
+
+
+def test_solve_top_k_reuses_costs(gameboard1, gameboard2, dictionary, monkeypatch):
+    loads, costs = [], []
+    monkeypatch.setattr(
+        "lbsolver.lbsolver.load_frequencies",
+        lambda path: loads.append(path) or {"flytrap": 50, "physiologist": 40},
+    )
+    monkeypatch.setattr(
+        "lbsolver.lbsolver.word_costs",
+        lambda words, frequencies: costs.append(words)
+        or word_costs(words, frequencies),
+    )
+    solver = LBSolver(gameboard2, dictionary)
+    with pytest.raises(ValueError):
+        solver.solve_top_k(k=3)
+
+    expected = solver.solve_top_k("counts.txt", k=3)
+    assert solver.solve_top_k("counts.txt", k=3) == expected
+    assert solver.solve_top_k(k=3, skip="flytrap")
+    solver.gameboard = Gameboard("hfoslgryptia")
+    assert solver.solve_top_k(k=3) == expected
+    assert (len(loads), len(costs)) == (1, 1)
+
+    solver.gameboard = gameboard1
+    assert solver.solve_top_k(k=3)
+    assert (len(loads), len(costs)) == (1, 2)
+    solver = LBSolver(gameboard2, dictionary, frequencies="counts.txt")
+    assert solver.solve_top_k(k=3) == expected
+    assert solver.frequencies == {"flytrap": 50, "physiologist": 40}
+    with pytest.raises(TypeError):
+        solver.frequencies = None
+
+
+def test_enumerate_and_count_solutions(lbsolver1):
+    answers = list(lbsolver1.enumerate_solutions(3, skip="physiologists"))
+    counts = lbsolver1.count_solutions(3, skip="physiologists")
+    assert len(answers) == len(set(answers)) == sum(counts.values())
+    assert counts[2] == sum(1 for answer in answers if len(answer) == 2)
+    assert all("physiologists" not in answer for answer in answers)
+    assert set(lbsolver1.solve_optimal(3, 10, skip="physiologists")) <= set(answers)
+
+    with pytest.raises(ValueError):
+        lbsolver1.enumerate_solutions(0)
+    with pytest.raises(ValueError):
+        lbsolver1.count_solutions(0)
+
+
+def test_equivalent_boards_share_answers(dictionary):
+    solver = LBSolver(Gameboard("slgatipryhfo"), dictionary)
+    expected = list(solver.solve(3, 5))
+    solver.gameboard = Gameboard("hfoslgryptia")
+    assert list(solver.solve(3, 5)) == expected
+    assert list(solver.solve(3, 5, engine="simple")) == expected
+    solver.gameboard = Gameboard("giyercpolahx")
+    assert list(solver.solve(3, 5)) != expected
+
+
+def test_solve_many_skips_equivalent_boards(dictionary):
+    cache = ResultCache()
+    boards = ["slgatipryhfo", "hfoslgryptia", "slg:ita:pry:ofh"]
+    results = list(LBSolver.solve_many(boards, dictionary, 3, 3, cache=cache))
+    assert [board.board for board, _ in results] == [
+        Gameboard(board).board for board in boards
+    ]
+    assert results[0][1] == results[1][1] == results[2][1]
+    assert (cache.stats.misses, cache.stats.hits) == (1, 2)
+
+
+@pytest.mark.parametrize("engine", ["bitmask", "simple"])
+def test_solve_stats(dictionary, engine):
+    solver = LBSolver(Gameboard("slgatipryhfo"), dictionary)
+    assert solver.stats is None
+    answers = solver.solve(2, 3, skip="safari", engine=engine)
+    assert solver.stats is None
+
+    solver.collect_stats = True
+    assert solver.solve(2, 3, skip="safari", engine=engine) == answers
+    stats = solver.stats
+    assert stats.valid_words == len(set(solver.generate_valid_words()))
+    assert stats.answers == len(answers)
+    assert stats.nodes > 0 and stats.pruned["depth"] > 0
+    assert min(stats.filter_seconds, stats.rank_seconds, stats.search_seconds) >= 0
+
+
+def test_solve_bounded(dictionary):
+    cache = ResultCache()
+    solver = LBSolver(Gameboard("slgatipryhfo"), dictionary, cache=cache)
+    full = list(solver.solve(5, 50))
+    assert solver.complete
+
+    solver.cache = ResultCache()
+    partial = list(solver.solve(5, 50, max_nodes=20))
+    assert not solver.complete
+    assert partial == full[: len(partial)] and len(partial) < len(full)
+    assert len(solver.cache) == 0
+
+    token = CancellationToken()
+    token.cancel()
+    assert list(solver.solve(5, 50, cancel=token)) == []
+    assert not solver.complete
+    assert list(solver.solve(5, 50, timeout=60)) == full
+    assert solver.complete
+
+    with pytest.raises(ValueError):
+        solver.solve(3, 5, engine="simple", timeout=1)
+    with pytest.raises(ValueError):
+        solver.solve(3, 5, workers=2, max_nodes=10)
+
+
+def test_stats_cached_and_streamed(dictionary):
+    solver = LBSolver(
+        Gameboard("slgatipryhfo"), dictionary, cache=ResultCache(), collect_stats=True
+    )
+    solver.solve(3, 2)
+    solver.solve(3, 2)
+    assert solver.stats.cached and solver.stats.nodes == 0
+
+    answers = solver.iter_solutions(3)
+    next(answers)
+    assert solver.stats.answers == 1 and not solver.stats.cached
+    next(answers)
+    assert solver.stats.answers == 2
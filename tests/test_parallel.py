@@ -0,0 +1,92 @@
+import pytest
+from lbsolver import Gameboard, LBSolver, parallel
+from lbsolver.engine import BitmaskEngine
+from lbsolver.parallel import search_parallel
+
+
+@pytest.mark.parametrize(
+    "board,settings",
+    [
+        ("slgatipryhfo", (3, 10, "")),
+        ("giyercpolahx", (3, 30, "lexicography")),
+        ("tnmhrvikeaub", (3, 30, "")),
+    ],
+)
+def test_parallel_solve_matches(board, settings, dictionary):
+    solver = LBSolver(Gameboard(board), dictionary)
+    assert list(solver.solve(*settings, workers=2)) == list(solver.solve(*settings))
+
+
+def test_search_parallel_chunks(dictionary):
+    solver = LBSolver(Gameboard("slgatipryhfo"), dictionary)
+    engine = BitmaskEngine("slgatipryhfo", solver.generate_valid_words())
+    expected = engine.search(3, 15)
+    assert search_parallel(engine, 3, 15, workers=2, chunk_size=1) == expected
+    assert search_parallel(engine, 3, 15, workers=3, chunk_size=50) == expected
+
+
+@pytest.mark.parametrize("max_num_words,minimum_answers", [(2, 10**6), (3, 200)])
+def test_replay_matches_search(dictionary, max_num_words, minimum_answers):
+    solver = LBSolver(Gameboard("giyercpolahx"), dictionary)
+    engine = BitmaskEngine("giyercpolahx", solver.generate_valid_words())
+    skip = ["lexicography"]
+    blocked = engine.blocked(skip)
+    answers = []
+    for root in engine.order:
+        needed = minimum_answers - len(answers)
+        root_answers = list(engine.iter_root_answers(root, max_num_words, skip))
+        if needed > 0 and root_answers:
+            answers.extend(
+                parallel._merge_root(
+                    engine, root, root_answers, blocked, max_num_words, needed
+                )
+            )
+    assert answers == engine.search(max_num_words, minimum_answers, skip)
+
+
+def test_search_parallel_cut_lists(dictionary, monkeypatch):
+    monkeypatch.setattr(parallel, "ROOT_ANSWERS", 2)
+    solver = LBSolver(Gameboard("slgatipryhfo"), dictionary)
+    engine = BitmaskEngine("slgatipryhfo", solver.generate_valid_words())
+    assert search_parallel(engine, 3, 40, workers=2) == engine.search(3, 40)
+
+
+def test_parallel_solve_many(dictionary):
+    boards = ["slgatipryhfo", "giyercpolahx", "tnmhrvikeaub", "atiqoeskujyn"]
+    sequential = list(LBSolver.solve_many(boards, dictionary, 3, 5))
+    parallel = list(LBSolver.solve_many(boards, dictionary, 3, 5, workers=2))
+    assert [board.board for board, _ in parallel] == [
+        board.board for board, _ in sequential
+    ]
+    assert [list(answers) for _, answers in parallel] == [
+        list(answers) for _, answers in sequential
+    ]
+
+
+def test_parallel_errors(dictionary):
+    solver = LBSolver(Gameboard("slgatipryhfo"), dictionary)
+    with pytest.raises(ValueError):
+        solver.solve(workers=0)
+    with pytest.raises(ValueError):
+        solver.solve(workers=2, engine="simple")
+    with pytest.raises(ValueError):
+        list(LBSolver.solve_many(["slgatipryhfo"], dictionary, workers=0))
+
+    results = LBSolver.solve_many(
+        ["slgatipryhfo", "abc", "giyercpolahx"], dictionary, workers=2
+    )
+    assert next(results)[1]
+    with pytest.raises(ValueError):
+        next(results)
+
+    errors = []
+    boards = ["slgatipryhfo", "abc", "giyercpolahx", "xyz", "tnmhrvikeaub"]
+    results = LBSolver.solve_many(
+        boards, dictionary, workers=2, on_error=lambda *error: errors.append(error)
+    )
+    assert [gameboard.board for gameboard, _ in results] == [
+        list("slgatipryhfo"),
+        list("giyercpolahx"),
+        list("tnmhrvikeaub"),
+    ]
+    assert [board for board, _ in errors] == ["abc", "xyz"]
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import socket
+import struct
+import time
+
+import pytest
+from lbsolver import Gameboard, LBSolver, server
+from lbsolver.cache import ResultCache
+from lbsolver.server import (
+    LatencyStats,
+    SolverService,
+    load_dictionaries,
+    parse_request,
+    start_server,
+)
+from lbsolver.wordindex import WordIndex
+
+
+@pytest.fixture
+def service(dictionary):
+    service = SolverService(
+        {"default": WordIndex.from_words(dictionary)}, cache=ResultCache()
+    )
+    yield service
+    service.close()
+
+
+@pytest.mark.parametrize(
+    "request_body",
+    [
+        None,
+        {},
+        {"board": 12},
+        {"board": "slgatipryhfo", "max_num_words": "3"},
+        {"board": "slgatipryhfo", "mode": "fast"},
+        {"board": "slgatipryhfo", "dictionary": "other"},
+        {"board": "slgatipryhfo", "colour": "red"},
+        {"board": "slgatipryhfo", "timeout_ms": "10"},
+        {"board": "slgatipryhfo", "timeout_ms": -1},
+    ],
+)
+def test_parse_request_errors(request_body):
+    with pytest.raises(ValueError):
+        parse_request(request_body, {"default": None})
+
+
+def test_latency_stats():
+    stats = LatencyStats(window=100)
+    assert stats.percentile(50) == 0.0
+    for milliseconds in range(1, 101):
+        stats.record(milliseconds / 1000, error=milliseconds == 100)
+    assert stats.percentile(50) == 0.05
+    assert stats.percentile(99) == 0.099
+    summary = stats.summary()
+    assert summary["requests"] == 100 and summary["errors"] == 1
+    assert summary["latency_ms"]["p90"] == 90.0
+
+
+def test_service_solve(service, dictionary):
+    expected = LBSolver(Gameboard("slgatipryhfo"), dictionary).solve(3, 5)
+    request = {"board": "slgatipryhfo", "minimum_answers": 5}
+    response = asyncio.run(service.solve(request))
+    assert [tuple(answer) for answer in response["answers"]] == expected
+    asyncio.run(service.solve({**request, "board": "hfo:slg:ryp:tia"}))
+    assert service.cache.stats.hits == 1
+
+    counts = asyncio.run(service.solve({**request, "mode": "count"}))
+    assert counts["counts"]["1"] == 0
+    optimal = asyncio.run(service.solve({**request, "mode": "optimal"}))
+    assert len(optimal["answers"]) == 5
+
+
+def test_service_cache_key(service):
+    request = {"board": "slgatipryhfo", "minimum_answers": 3}
+    expected = asyncio.run(service.solve(request))["answers"]
+    for board in (" slgatipryhfo\n", "hfo:slg:ryp:tia"):
+        response = asyncio.run(service.solve({**request, "board": board}))
+        assert response["answers"] == expected
+    assert (service.cache.stats.hits, service.cache.stats.misses) == (2, 1)
+    with pytest.raises(ValueError):
+        asyncio.run(service.solve({**request, "board": "abc"}))
+
+
+def test_service_timeout(service):
+    request = {"board": "giyercpolahx", "max_num_words": 5, "minimum_answers": 5000}
+    response = asyncio.run(service.solve({**request, "timeout_ms": 0}))
+    assert not response["complete"] and len(response["answers"]) < 5000
+    assert len(service.cache) == 0
+    response = asyncio.run(service.solve({**request, "minimum_answers": 2}))
+    assert len(response["answers"]) == 2 and response["complete"]
+
+
+def test_service_handle(service):
+    async def run():
+        assert await service.handle("GET", "/health", b"") == (200, {"status": "ok"})
+        assert (await service.handle("GET", "/nothing", b""))[0] == 404
+        assert (await service.handle("GET", "/solve", b""))[0] == 405
+        status, body = await service.handle("POST", "/solve", b"not json")
+        assert status == 400 and "error" in body
+        status, body = await service.handle(
+            "POST", "/solve", b'{"board": "aaabbbcccddd"}'
+        )
+        assert status == 400
+        status, body = await service.handle(
+            "POST", "/solve", b'{"board": "slgatipryhfo"}'
+        )
+        assert status == 200 and len(body["answers"]) == 1 and "elapsed_ms" in body
+        status, body = await service.handle("GET", "/stats", b"")
+        assert body["requests"] == 3 and body["errors"] == 2
+        assert body["dictionaries"] == {"default": len(service.dictionaries["default"])}
+
+    asyncio.run(run())
+
+
+def test_http_round_trip(service):
+    async def run():
+        server = await start_server(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for board in ("slgatipryhfo", "giyercpolahx"):
+            body = json.dumps({"board": board}).encode()
+            writer.write(
+                b"POST /solve HTTP/1.1\r\nHost: localhost\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            assert status_line.startswith(b"HTTP/1.1 200")
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            assert headers["connection"] == "keep-alive"
+            response = json.loads(
+                await reader.readexactly(int(headers["content-length"]))
+            )
+            assert len(response["answers"]) == 1
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_load_dictionaries(tmp_path):
+    words = tmp_path / "words.txt"
+    words.write_text("safari\nions\n", encoding="utf-8")
+    dictionaries = load_dictionaries([str(words), f"small={words}"])
+    assert set(dictionaries) == {"default", str(words), "small"}
+    assert list(dictionaries["small"]) == ["safari", "ions"]
+    with pytest.raises(OSError):
+        load_dictionaries([str(tmp_path / "missing.txt")])
+
+
+async def _post_solve(port: int, request: dict):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(request).encode()
+    writer.write(
+        b"POST /solve HTTP/1.1\r\nHost: localhost\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    return reader, writer
+
+
+@pytest.fixture
+def tokens(monkeypatch):
+    tokens = []
+    solve = server.solve_request
+
+    def solve_request(dictionaries, request, cancel=None):
+        try:
+            return solve(dictionaries, request, cancel)
+        finally:
+            tokens.append(cancel)
+
+    monkeypatch.setattr("lbsolver.server.solve_request", solve_request)
+    return tokens
+
+
+def test_disconnect_cancels_search(service, tokens):
+    async def run():
+        http_server = await start_server(service, port=0)
+        port = http_server.sockets[0].getsockname()[1]
+        _, writer = await _post_solve(
+            port,
+            {"board": "giyercpolahx", "max_num_words": 7, "minimum_answers": 10**9},
+        )
+        await asyncio.sleep(0.2)
+        writer.get_extra_info("socket").setsockopt(
+            socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+        )
+        writer.transport.abort()
+        start = time.perf_counter()
+        while not tokens and time.perf_counter() - start < 10:
+            await asyncio.sleep(0.05)
+        assert time.perf_counter() - start < 5
+        http_server.close()
+        await http_server.wait_closed()
+
+    asyncio.run(run())
+    assert len(tokens) == 1 and tokens[0].cancelled
+    assert service.stats.errors == 1
+
+
+def test_half_closed_client_is_answered(service, tokens):
+    async def run():
+        http_server = await start_server(service, port=0)
+        port = http_server.sockets[0].getsockname()[1]
+        reader, writer = await _post_solve(
+            port,
+            {
+                "board": "giyercpolahx",
+                "max_num_words": 7,
+                "minimum_answers": 10**9,
+                "timeout_ms": 300,
+            },
+        )
+        writer.write_eof()
+        status_line = await reader.readline()
+        response = await reader.read()
+        writer.close()
+        http_server.close()
+        await http_server.wait_closed()
+        return status_line, json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+    status_line, response = asyncio.run(run())
+    assert status_line.startswith(b"HTTP/1.1 200")
+    assert response["answers"] and not response["complete"]
+    assert len(tokens) == 1 and not tokens[0].cancelled
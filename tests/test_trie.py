@@ -0,0 +1,59 @@
+import pickle
+
+import pytest
+from lbsolver import Gameboard, LBSolver
+from lbsolver.trie import WordTrie, compile_trie
+from lbsolver.wordindex import WordIndex, load_dictionary, open_dictionary
+
+
+@pytest.fixture
+def trie(dictionary):
+    return WordTrie.from_words(dictionary)
+
+
+def test_small_trie():
+    trie = WordTrie(compile_trie(["tea\n", "ten\n", "team\n", "Tea\n", "to\n", "tea"]))
+    assert list(trie) == ["tea", "ten", "team"]
+    assert trie.num_nodes == 6
+    assert trie[-1] == "team" and trie[0:2] == ["tea", "ten"]
+    with pytest.raises(IndexError):
+        trie[3]
+    assert trie.board_words(["tbc", "ejk", "afg", "mnx"]) == ["tea", "ten", "team"]
+    assert trie.board_words(["tbc", "ejk", "afg", "nxy"]) == ["tea", "ten"]
+    assert trie.board_words(["tbc", "aek", "fgh", "mnx"]) == ["ten"]
+
+
+def test_matches_index(trie, dictionary):
+    assert list(trie) == list(WordIndex.from_words(dictionary))
+
+
+@pytest.mark.parametrize(
+    "board", ["slgatipryhfo", "giyercpolahx", "tnmhrvikeaub", "atiqoeskujyn"]
+)
+def test_board_words(trie, dictionary, board):
+    solver = LBSolver(Gameboard(board), dictionary)
+    expected = list(dict.fromkeys(solver.generate_valid_words()))
+    assert trie.board_words(Gameboard(board).sides) == expected
+    assert list(solver.generate_valid_words(trie)) == expected
+    assert LBSolver(Gameboard(board), trie).solve(3, 10) == solver.solve(3, 10)
+
+
+def test_save_load_and_pickle(trie, tmp_path):
+    path = tmp_path / "words.lbt"
+    trie.save(path)
+    for loaded in (load_dictionary(path), open_dictionary(path)):
+        with loaded:
+            assert isinstance(loaded, WordTrie)
+            assert loaded.fingerprint == trie.fingerprint
+            assert loaded.board_words(["slg", "ati", "pry", "hfo"]) == (
+                trie.board_words(["slg", "ati", "pry", "hfo"])
+            )
+    copy = pickle.loads(pickle.dumps(trie))
+    assert copy.fingerprint == trie.fingerprint
+
+
+def test_invalid_buffer():
+    with pytest.raises(ValueError):
+        WordTrie(b"LBTR")
+    with pytest.raises(ValueError):
+        WordTrie(b"LBIX" + bytes(16))
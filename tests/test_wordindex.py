@@ -0,0 +1,146 @@
+import bz2
+import gzip
+import time
+
+import pytest
+from lbsolver import Gameboard, LBSolver
+from lbsolver.wordindex import (
+    WordFile,
+    WordIndex,
+    letter_mask,
+    load_dictionary,
+    normalize_word,
+    open_dictionary,
+    open_words,
+)
+
+
+@pytest.fixture
+def index(dictionary):
+    return WordIndex.from_words(dictionary)
+
+
+@pytest.mark.parametrize(
+    "line,word",
+    [
+        ("physiologists\n", "physiologists"),
+        ("  safari ", "safari"),
+        ("Polish", None),
+        ("ab", None),
+        ("abc's", None),
+        ("balloon", None),
+        ("", None),
+    ],
+)
+def test_normalize_word(line, word):
+    assert normalize_word(line) == word
+
+
+def test_letter_mask():
+    assert letter_mask("abz") == (1 << 25) | 0b11
+    assert letter_mask("") == 0
+
+
+def test_sequence(index):
+    assert len(index) == len(list(index))
+    assert index[0] == "abaci"
+    assert index[-1] == index[len(index) - 1]
+    assert index[0:2] == ["abaci", "aback"]
+    with pytest.raises(IndexError):
+        index[len(index)]
+
+
+def test_candidates(index):
+    words = index.candidates("abcdefghijkl")
+    assert words
+    assert all(set(word) <= set("abcdefghijkl") for word in words)
+    assert index.candidate_ids("abcdefghijkl") == sorted(
+        index.candidate_ids("abcdefghijkl")
+    )
+
+
+@pytest.mark.parametrize(
+    "letters", ["abcdefghijklmnopqrstuvwx", "abcdefghijklmnopqrstuvwxyz"]
+)
+def test_candidates_large_board(index, dictionary, letters):
+    expected = [
+        word_id for word_id, word in enumerate(index) if set(word) <= set(letters)
+    ]
+    start = time.perf_counter()
+    assert index.candidate_ids(letters) == expected
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.parametrize("board", ["slgatipryhfo", "giyercpolahx", "tnmhrvikeaub"])
+def test_matches_words_file(board, dictionary, index):
+    solver = LBSolver(Gameboard(board), dictionary)
+    expected = list(dict.fromkeys(solver.generate_valid_words()))
+    assert list(solver.generate_valid_words(index)) == expected
+    assert LBSolver(Gameboard(board), index).solve(3, 10) == solver.solve(3, 10)
+
+
+def test_save_and_load(index, tmp_path, dictionary):
+    path = tmp_path / "words.lbx"
+    index.save(path)
+    with load_dictionary(path) as loaded:
+        assert isinstance(loaded, WordIndex)
+        assert len(loaded) == len(index)
+        assert loaded.candidates("giyercpolahx") == index.candidates("giyercpolahx")
+
+    words_path = tmp_path / "words.txt"
+    words_path.write_text("".join(dictionary[:10]), encoding="utf-8")
+    assert load_dictionary(words_path) == dictionary[:10]
+
+
+def test_invalid_buffer():
+    with pytest.raises(ValueError):
+        WordIndex(b"not an index at all!!")
+    with pytest.raises(ValueError):
+        WordIndex(b"")
+
+
+@pytest.mark.parametrize("opener", [open, gzip.open, bz2.open])
+def test_open_words(tmp_path, dictionary, opener):
+    path = tmp_path / "words"
+    with opener(path, "wt", encoding="utf-8") as words_file:
+        words_file.write("".join(dictionary[:100]))
+    with open_words(path) as words_file:
+        assert words_file.readlines() == dictionary[:100]
+    words = WordFile(path)
+    assert list(words) == list(words) == dictionary[:100]
+    assert isinstance(open_dictionary(path), WordFile)
+    assert load_dictionary(path) == dictionary[:100]
+
+
+def test_solve_from_path(tmp_path, dictionary):
+    path = tmp_path / "words.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as words_file:
+        words_file.write("".join(dictionary))
+    expected = LBSolver(Gameboard("slgatipryhfo"), dictionary).solve(3, 5)
+    assert LBSolver(Gameboard("slgatipryhfo"), path).solve(3, 5) == expected
+    assert LBSolver(Gameboard("slgatipryhfo"), str(path)).solve(3, 5) == expected
+
+    streamed = LBSolver(Gameboard("slgatipryhfo"), iter(dictionary))
+    assert len(streamed.dictionary) < 1000
+    assert streamed.solve(3, 5) == expected
+    assert [
+        answers for _, answers in LBSolver.solve_many(["slgatipryhfo"], path, 3, 5)
+    ] == [expected]
+
+
+def test_change_board_of_streamed_dictionary(tmp_path, dictionary):
+    path = tmp_path / "words"
+    path.write_text("".join(dictionary), encoding="utf-8")
+    with open(path, encoding="utf-8") as words_file:
+        solver = LBSolver(Gameboard("slgatipryhfo"), words_file)
+    expected = solver.solve(3, 5)
+    solver.gameboard = Gameboard("hfoslgryptia")
+    assert solver.solve(3, 5) == expected
+    with pytest.raises(ValueError):
+        solver.gameboard = Gameboard("giyercpolahx")
+    assert solver.gameboard == Gameboard("slgatipryhfo")
+
+    solver.dictionary = dictionary
+    solver.gameboard = Gameboard("giyercpolahx")
+    assert solver.solve(3, 5) == LBSolver(solver.gameboard, dictionary).solve(3, 5)
+    assert solver.solve(3, 5)
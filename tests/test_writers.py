@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+
+import pytest
+from lbsolver import Gameboard
+from lbsolver import writers
+from lbsolver.lbsolver import board_name
+from lbsolver.writers import (
+    BinaryWriter,
+    CSVWriter,
+    NDJSONWriter,
+    TextWriter,
+    open_writer,
+    read_binary,
+)
+
+BOARDS = [
+    ("slgatipryhfo", [("physiologist", "thrifts"), ("safari", "irks", "spry")]),
+    ("giy:erc:pol:ahx", []),
+    ("slga:tipr:yhfo:encd", [("café", "épée")]),
+]
+
+
+def test_text_writer():
+    stream = io.StringIO()
+    writer = TextWriter(stream)
+    assert writer.write_board(*BOARDS[0]) == 2
+    assert stream.getvalue() == (
+        "Answer  1: physiologist---thrifts\nAnswer  2: safari---irks---spry\n"
+    )
+
+    stream = io.StringIO()
+    TextWriter(stream, board_headers=True).write_board(*BOARDS[1])
+    assert stream.getvalue() == (
+        "Board: giy:erc:pol:ahx\n"
+        "No answers for given board and dictionary for requested answer size\n\n"
+    )
+
+
+def test_ndjson_writer():
+    stream = io.StringIO()
+    writer = NDJSONWriter(stream)
+    for board, answers in BOARDS:
+        writer.write_board(board, iter(answers), seconds=0.5, complete=False)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0] == {
+        "type": "answer",
+        "board": "slgatipryhfo",
+        "index": 1,
+        "words": ["physiologist", "thrifts"],
+    }
+    assert records[-2]["words"] == ["café", "épée"]
+    summaries = [record for record in records if record["type"] == "board"]
+    assert [summary["answers"] for summary in summaries] == [2, 0, 1]
+    assert all(summary["seconds"] >= 0.5 for summary in summaries)
+    assert not any(summary["complete"] for summary in summaries)
+
+
+def test_csv_writer():
+    stream = io.StringIO()
+    writer = CSVWriter(stream)
+    for board, answers in BOARDS:
+        writer.write_board(board, answers)
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert [row["record"] for row in rows] == [
+        "answer",
+        "answer",
+        "board",
+        "board",
+        "answer",
+        "board",
+    ]
+    assert rows[1]["words"].split() == ["safari", "irks", "spry"]
+    assert (rows[2]["answers"], rows[2]["complete"]) == ("2", "true")
+
+
+def test_binary_round_trip(monkeypatch):
+    monkeypatch.setattr(writers, "BUFFER_ANSWERS", 2)
+    stream = io.BytesIO()
+    writer = BinaryWriter(stream)
+    for board, answers in BOARDS:
+        writer.write_board(board, answers, seconds=0.25)
+    data = stream.getvalue()
+    assert data.startswith(writers.MAGIC)
+    assert data.count(b"physiologist") == 1
+
+    results = list(read_binary(io.BytesIO(data)))
+    assert [(board, answers) for board, answers, _ in results] == [
+        (board, list(answers)) for board, answers in BOARDS
+    ]
+    metadata = results[0][2]
+    assert (metadata["answers"], metadata["complete"]) == (2, True)
+    assert metadata["seconds"] == pytest.approx(0.25, abs=0.01)
+
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(b"nope")))
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(data[:-3])))
+
+
+def test_open_writer():
+    stream = io.TextIOWrapper(io.BytesIO())
+    assert isinstance(open_writer("binary", stream), BinaryWriter)
+    assert isinstance(open_writer("text", io.StringIO()), TextWriter)
+    with pytest.raises(ValueError):
+        open_writer("binary", io.StringIO())
+    with pytest.raises(ValueError):
+        open_writer("xml", io.StringIO())
+
+
+def test_incomplete_writer():
+    class NoAnswers(writers.AnswerWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        NoAnswers(io.StringIO())
+
+
+def test_board_name():
+    assert board_name(Gameboard("slg:ati:pry:hfo")) == "slgatipryhfo"
+    assert board_name(Gameboard("slga:tipr:yhfo:encd")) == "slga:tipr:yhfo:encd"